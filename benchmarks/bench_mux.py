@@ -0,0 +1,387 @@
+# benchmarks/bench_mux.py
+# Mux (Stop-latency) regression harness.
+#
+# Runs recorder._mux() - the real stream-copy + AAC mux - over a matrix of
+# segment length x container (MKV / MP4) x video source (in-RAM _VideoBuffer
+# or spill file) x one / two audio inputs, and records wall time, video
+# throughput, peak RSS of this process and of the ffmpeg child, and the
+# "tail": time from ffmpeg's last -progress advance to exit, i.e. container
+# finalisation (MP4 writes its moov index there).  Per configuration it
+# fits wall time against video size, and for MP4 fits the MP4 - MKV
+# difference, so whether finalisation is linear in file size shows as a
+# slope / R^2 rather than by eye.
+#
+# Inputs are synthetic but valid: one short clip is encoded with libx264
+# (lavfi testsrc2 + noise at the requested bitrate) and repeated to each
+# segment length - as in-RAM chunks sharing one copy, or written out as a
+# spill file - and the WAVs are tones of matching length.  Random NAL
+# payloads would not survive ffmpeg's H.264 parser, hence the real clip.
+#
+# Results go to JSON (tagged with the git commit).  With --baseline, every
+# case is compared with the same case of an earlier run and the exit status
+# is 1 when one regressed by more than --tolerance (plus a small absolute
+# slack), so the harness can gate a change.
+#
+# Needs the full runtime environment (ffmpeg, numpy, cv2, pyaudiowpatch;
+# psutil for RSS); run from the repo root:
+#     python -m benchmarks.bench_mux [--seconds 60,300,900] [--out bench_mux.json]
+#     python -m benchmarks.bench_mux --baseline bench_mux.json --tolerance 0.2
+
+import argparse
+import array
+import itertools
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scripts.configure as configure   # noqa: E402
+import scripts.recorder as recorder     # noqa: E402
+
+_CLIP_S          = 10                   # encoded once, repeated to length
+_CHUNK           = 1024 * 1024          # in-RAM chunk size (like stdout_reader views)
+_RATE            = 48000
+_TONE_HZ         = (440.0, 220.0)       # loopback, mic
+_SAMPLE_INTERVAL = 0.05                 # RSS / progress polling (s)
+_SLACK_S         = 0.5                  # absolute slack on wall / tail regressions
+_SLACK_RSS_MB    = 32.0                 # absolute slack on RSS regressions
+_MB              = 1024 * 1024
+
+
+def _csv(kind):
+    return lambda s: [kind(v.strip()) for v in s.split(",") if v.strip()]
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+# ===========================================================================
+# Synthetic inputs
+# ===========================================================================
+def _encode_clip(ffmpeg: str, path: str, w: int, h: int, fps: int, mbps: float) -> bytes:
+    """_CLIP_S seconds of Annex B H.264 shaped like the capture encoder's output."""
+    rate = f"{mbps:g}M"
+    subprocess.run([
+        ffmpeg, "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc2=size={w}x{h}:rate={fps},noise=alls=12:allf=t",
+        "-t", str(_CLIP_S), "-pix_fmt", "yuv420p",
+        "-c:v", "libx264", "-preset", "ultrafast", "-g", str(fps * 2),
+        "-b:v", rate, "-maxrate", rate, "-bufsize", f"{mbps * 2:g}M",
+        "-f", "h264", path,
+    ], check=True)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _write_wav(path: str, seconds: float, channels: int, hz: float) -> None:
+    """A tone of `seconds` (one second of PCM written repeatedly)."""
+    amp   = 32767 * 10 ** (-12 / 20)
+    mono  = [int(amp * math.sin(2 * math.pi * hz * i / _RATE)) for i in range(_RATE)]
+    block = array.array("h", [s for s in mono for _ in range(channels)]).tobytes()
+    whole, frac = divmod(seconds, 1.0)
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(_RATE)
+        for _ in range(int(whole)):
+            wf.writeframesraw(block)
+        wf.writeframesraw(block[:int(frac * _RATE) * channels * 2])
+
+
+# ===========================================================================
+# One measured mux
+# ===========================================================================
+class _Sampler:
+    """Peak RSS of this process and its ffmpeg children; last progress advance."""
+
+    def __init__(self):
+        self.peak_self_mb  = 0.0
+        self.peak_child_mb = 0.0
+        self.last_advance  = None
+        self._out_time     = None
+        self._stop         = threading.Event()
+        self._thread       = threading.Thread(target=self._run, daemon=True,
+                                              name="bench-mux-sampler")
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            import psutil
+            me = psutil.Process()
+        except ImportError:
+            me = None
+        while True:
+            for progress, _duration in list(recorder._mux_progress.values()):
+                t = (progress.latest or {}).get("out_time_s")
+                if t is not None and t != self._out_time:
+                    self._out_time    = t
+                    self.last_advance = time.perf_counter()
+            if me is not None:
+                try:
+                    self.peak_self_mb = max(self.peak_self_mb,
+                                            me.memory_info().rss / _MB)
+                    child = sum(c.memory_info().rss for c in me.children())
+                    self.peak_child_mb = max(self.peak_child_mb, child / _MB)
+                except Exception:
+                    pass      # child exited between listing and reading
+            if self._stop.wait(_SAMPLE_INTERVAL):
+                break
+
+
+def _run_case(clip: memoryview, reps: int, container: str, source: str,
+              wavs: list, work: str, config: dict) -> dict:
+    cfg = dict(config, container_format=container)
+    out = os.path.join(work, f"bench_out.{container.lower()}")
+    if source == "ram":
+        chunks = [clip[i:i + _CHUNK] for i in range(0, len(clip), _CHUNK)]
+        buf    = recorder._VideoBuffer.from_chunks(chunks * reps)
+    else:
+        spill = os.path.join(work, "bench_spill.h264")
+        with open(spill, "wb") as f:
+            for _ in range(reps):
+                f.write(clip)
+        buf = recorder._VideoBuffer.from_file(spill)     # discard() deletes it
+
+    sampler = _Sampler()
+    sampler.start()
+    t0 = time.perf_counter()
+    recorder._mux(buf, wavs[0], wavs[1] if len(wavs) > 1 else None, out, cfg)
+    t1 = time.perf_counter()
+    sampler.stop()
+
+    ok     = os.path.exists(out) and os.path.getsize(out) > 0
+    out_mb = os.path.getsize(out) / _MB if ok else 0.0
+    if os.path.exists(out):
+        os.remove(out)
+    video_mb = len(clip) * reps / _MB
+    return {
+        "wall_s":             round(t1 - t0, 3),
+        "mb_per_s":           round(video_mb / (t1 - t0), 1),
+        "tail_s":             (round(t1 - sampler.last_advance, 3)
+                               if sampler.last_advance is not None else None),
+        "peak_rss_mb":        round(sampler.peak_self_mb, 1),
+        "peak_ffmpeg_rss_mb": round(sampler.peak_child_mb, 1),
+        "output_mb":          round(out_mb, 1),
+        "ok":                 ok,
+    }
+
+
+# ===========================================================================
+# Analysis
+# ===========================================================================
+def _fit(xs: list, ys: list) -> dict | None:
+    """Least-squares y = a + b x: {"slope", "intercept", "r2"}, or None (< 2 points)."""
+    n = len(xs)
+    if n < 2:
+        return None
+    mx, my = sum(xs) / n, sum(ys) / n
+    sxx    = sum((x - mx) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    b      = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx
+    a      = my - b * mx
+    ss_tot = sum((y - my) ** 2 for y in ys)
+    ss_res = sum((y - a - b * x) ** 2 for x, y in zip(xs, ys))
+    return {"slope": b, "intercept": a, "r2": 1 - ss_res / ss_tot if ss_tot else 1.0}
+
+
+def _key(r: dict) -> tuple:
+    return (r["container"], r["source"], r["audio_inputs"], r["seconds"])
+
+
+def _scaling(runs: list) -> list:
+    """Per (container, source, audio): wall s per GB of video, and MP4 - MKV."""
+    out   = []
+    by    = {_key(r): r for r in runs if r["ok"]}
+    confs = sorted({k[:3] for k in by})
+    for conf in confs:
+        pts = sorted((by[k]["video_mb"], by[k]["wall_s"]) for k in by if k[:3] == conf)
+        fit = _fit([p[0] / 1024 for p in pts], [p[1] for p in pts])
+        row = {"container": conf[0], "source": conf[1], "audio_inputs": conf[2],
+               "wall_s_per_gb": round(fit["slope"], 3) if fit else None,
+               "fixed_s":       round(fit["intercept"], 3) if fit else None,
+               "r2":            round(fit["r2"], 4) if fit else None}
+        if conf[0] == "MP4":
+            diff = sorted((by[k]["video_mb"], by[k]["wall_s"] - by[("MKV",) + k[1:]]["wall_s"])
+                          for k in by if k[:3] == conf and ("MKV",) + k[1:] in by)
+            dfit = _fit([d[0] / 1024 for d in diff], [d[1] for d in diff])
+            row["mp4_extra_s"]        = [round(d[1], 3) for d in diff]
+            row["mp4_extra_s_per_gb"] = round(dfit["slope"], 3) if dfit else None
+            row["mp4_extra_r2"]       = round(dfit["r2"], 4) if dfit else None
+        out.append(row)
+    return out
+
+
+def _regressions(runs: list, baseline: list, tol: float) -> list:
+    """Cases slower / bigger than the same case of the baseline beyond tolerance."""
+    base = {_key(r): r for r in baseline}
+    bad  = []
+    for r in runs:
+        b = base.get(_key(r))
+        if b is None:
+            continue
+        name = f"{r['seconds']:g}s {r['container']} {r['source']} {r['audio_inputs']}a"
+        if b["ok"] and not r["ok"]:
+            bad.append(f"{name}: mux failed")
+            continue
+        checks = (("wall_s", _SLACK_S), ("tail_s", _SLACK_S),
+                  ("peak_ffmpeg_rss_mb", _SLACK_RSS_MB), ("peak_rss_mb", _SLACK_RSS_MB))
+        for field, slack in checks:
+            was, now = b.get(field), r.get(field)
+            if was is None or now is None:
+                continue
+            if now > was * (1 + tol) + slack:
+                bad.append(f"{name}: {field} {was} -> {now}")
+    return bad
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    ap = argparse.ArgumentParser(description="Mux wall time / RSS across segment "
+                                             "size, container, source and audio inputs.")
+    ap.add_argument("--seconds",    type=_csv(float), default=[60.0, 300.0, 900.0],
+                    help="segment lengths (rounded up to whole %d s clips)" % _CLIP_S)
+    ap.add_argument("--containers", type=_csv(str.upper),
+                    default=list(configure.container_format_options))
+    ap.add_argument("--sources",    type=_csv(str.lower), default=["ram", "spill"])
+    ap.add_argument("--audio",      type=_csv(int), default=[1, 2],
+                    help="audio inputs (1 = loopback, 2 = loopback + mic)")
+    ap.add_argument("--mbps",       type=float, default=8.0)
+    ap.add_argument("--fps",        type=int,   default=60)
+    ap.add_argument("--resolution", default="1920x1080")
+    ap.add_argument("--repeat",     type=int,   default=1,
+                    help="runs per case; the fastest is kept")
+    ap.add_argument("--baseline",   help="earlier results JSON to compare against")
+    ap.add_argument("--tolerance",  type=float, default=0.25,
+                    help="allowed relative regression vs --baseline")
+    ap.add_argument("--out",        default="bench_mux.json")
+    args = ap.parse_args()
+
+    bad_args = ([c for c in args.containers if c not in configure.container_format_options]
+                + [s for s in args.sources if s not in ("ram", "spill")]
+                + [a for a in args.audio if a not in (1, 2)])
+    if bad_args:
+        ap.error(f"unknown value(s) {bad_args}")
+    w, h = (int(v) for v in args.resolution.lower().split("x"))
+
+    import imageio_ffmpeg
+    ffmpeg = imageio_ffmpeg.get_ffmpeg_exe()
+
+    # Session state _mux() expects (normally set by init_capture_system).
+    config = dict(configure.DEFAULT_CONFIG, fps=args.fps,
+                  resolution={"width": w, "height": h})
+    recorder._thread_cap  = max(1, int((os.cpu_count() or 2) * config["thread_budget"] / 100))
+    recorder._core_layout = recorder._compute_core_layout(
+        recorder._thread_cap, config.get("cpu_affinity", True))
+
+    work = tempfile.mkdtemp(prefix=".d264_bench_mux_")
+    try:
+        print(f"Encoding {_CLIP_S} s source clip ({w}x{h} @ {args.fps}, {args.mbps:g} Mbps) ...")
+        clip = memoryview(_encode_clip(ffmpeg, os.path.join(work, "clip.h264"),
+                                       w, h, args.fps, args.mbps))
+        lengths = sorted({math.ceil(s / _CLIP_S) * _CLIP_S for s in args.seconds})
+        wavs    = {}
+        for s in lengths:
+            wavs[s] = []
+            for i, (label, channels) in enumerate((("lb", 2), ("mic", 1))):
+                path = os.path.join(work, f"{label}_{s:g}.wav")
+                _write_wav(path, s, channels, _TONE_HZ[i])
+                wavs[s].append(path)
+
+        cases = list(itertools.product(lengths, args.containers, args.sources, args.audio))
+        print(f"Mux benchmark: {len(cases)} case(s) x {args.repeat} run(s)")
+        runs = []
+        for seconds, container, source, n_audio in cases:
+            reps = int(seconds // _CLIP_S)
+            best = None
+            for _ in range(max(1, args.repeat)):
+                r = _run_case(clip, reps, container, source, wavs[seconds][:n_audio],
+                              work, config)
+                if best is None or (r["ok"] and r["wall_s"] < best["wall_s"]):
+                    best = r
+            row = {"seconds": seconds, "container": container, "source": source,
+                   "audio_inputs": n_audio, "video_mb": round(len(clip) * reps / _MB, 1),
+                   **best}
+            runs.append(row)
+            tail = f"{row['tail_s']:.2f} s" if row["tail_s"] is not None else "n/a"
+            print(f"  {seconds:>5g} s {container:<3} {source:<5} {n_audio}a: "
+                  f"{row['wall_s']:7.2f} s  {row['mb_per_s']:7.1f} MB/s  tail {tail}  "
+                  f"RSS {row['peak_rss_mb']:.0f} + ffmpeg {row['peak_ffmpeg_rss_mb']:.0f} MB"
+                  f"{'' if row['ok'] else '  FAILED'}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    scaling = _scaling(runs)
+    report  = {
+        "meta": {
+            "commit":        _git_commit(),
+            "timestamp":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "cpu":           recorder.get_cpu_info()["name"],
+            "logical_cores": os.cpu_count(),
+            "platform":      platform.platform(),
+            "python":        platform.python_version(),
+            "resolution":    args.resolution,
+            "fps":           args.fps,
+            "mbps":          args.mbps,
+            "clip_mb":       round(len(clip) / _MB, 2),
+            "repeat":        args.repeat,
+        },
+        "scaling": scaling,
+        "runs":    runs,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = _regressions(runs, json.load(f)["runs"], args.tolerance)
+        report["baseline"]    = {"path": args.baseline, "tolerance": args.tolerance}
+        report["regressions"] = regressions
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'configuration':<22}{'s/GB':>8}{'fixed s':>9}{'R^2':>8}{'MP4 extra s/GB':>16}")
+    for s in scaling:
+        name  = f"{s['container']} {s['source']} {s['audio_inputs']}a"
+        extra = s.get("mp4_extra_s_per_gb")
+        print(f"{name:<22}{s['wall_s_per_gb'] if s['wall_s_per_gb'] is not None else '-':>8}"
+              f"{s['fixed_s'] if s['fixed_s'] is not None else '-':>9}"
+              f"{s['r2'] if s['r2'] is not None else '-':>8}"
+              f"{extra if extra is not None else '':>16}")
+    print(f"Results written to {args.out}")
+
+    failed = [r for r in runs if not r["ok"]]
+    if regressions:
+        print(f"\nREGRESSIONS vs {args.baseline} (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+    if failed:
+        print(f"\n{len(failed)} mux run(s) produced no output.")
+    return 1 if regressions or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# benchmarks/bench_nal_index.py
+# Cost of the incremental NAL / keyframe index at 60 fps.
+#
+# Builds a synthetic Annex B stream shaped like the capture encoder's output
+# (SPS + PPS + SEI ahead of every IDR, several slices per frame from sliced
+# threads, emulation-prevention bytes in the payload) and feeds it to
+# NalIndex in the chunk size stdout_reader uses.  Reports the scan cost per
+# chunk and per frame, and the share of one core it takes at real time.
+#
+# Stdlib only - run from the repo root:
+#     python -m benchmarks.bench_nal_index [--seconds 60] [--mbps 6]
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.h264_index import NalIndex   # noqa: E402
+
+_CHUNK     = 256 * 1024          # stdout_reader read size
+_EPB       = re.compile(b"\x00\x00(?=[\x00-\x03])")
+
+
+def _nal(nal_type: int, payload: bytes, long_code: bool = True) -> bytes:
+    code = b"\x00\x00\x00\x01" if long_code else b"\x00\x00\x01"
+    return code + bytes([0x60 | nal_type]) + _EPB.sub(b"\x00\x00\x03", payload)
+
+
+def synth_stream(seconds: float, fps: int, mbps: float, slices: int,
+                 gop_s: float = 2.0) -> tuple:
+    """(stream bytes, frame count, keyframe count) of a synthetic H.264 stream."""
+    frames   = int(seconds * fps)
+    gop      = max(1, int(gop_s * fps))
+    per_fr   = int(mbps * 1e6 / 8 / fps)
+    noise    = os.urandom(per_fr * 4)      # recycled random payload
+    out      = bytearray()
+    keys     = 0
+    pos      = 0
+    for f in range(frames):
+        idr   = f % gop == 0
+        size  = per_fr * (4 if idr else 1)
+        if idr:
+            keys += 1
+            out += _nal(7, b"\x64\x00\x28\xac\xd9")
+            out += _nal(8, b"\xeb\xe3\xcb\x22\xc0")
+            out += _nal(6, b"\x05\x10" + b"x264" * 4)
+        part = size // slices
+        for s in range(slices):
+            if pos + part > len(noise):
+                pos = 0
+            # First byte of a slice header: first_mb_in_slice as ue(v).
+            head = b"\x88" if s == 0 else b"\x12"
+            out += _nal(5 if idr else 1, head + noise[pos:pos + part], s == 0)
+            pos += part
+    return bytes(out), frames, keys
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--seconds", type=float, default=60.0)
+    ap.add_argument("--fps",     type=int,   default=60)
+    ap.add_argument("--mbps",    type=float, default=6.0)
+    ap.add_argument("--slices",  type=int,   default=4)
+    args = ap.parse_args()
+
+    print(f"Building {args.seconds:.0f} s synthetic stream "
+          f"({args.fps} fps, {args.mbps} Mbps, {args.slices} slices/frame) ...")
+    data, frames, keys = synth_stream(args.seconds, args.fps, args.mbps, args.slices)
+    view   = memoryview(data)
+    chunks = [view[i:i + _CHUNK] for i in range(0, len(data), _CHUNK)]
+
+    idx = NalIndex()
+    t0  = time.perf_counter()
+    for c in chunks:
+        idx.feed(c)
+    dt  = time.perf_counter() - t0
+
+    ok = idx.frame_count == frames and len(idx.keyframes) == keys
+    print(f"  stream        : {len(data) / 1e6:.1f} MB in {len(chunks)} chunks")
+    print(f"  frames / keys : {idx.frame_count} / {len(idx.keyframes)}  "
+          f"(expected {frames} / {keys}) {'ok' if ok else 'MISMATCH'}")
+    print(f"  per chunk     : {dt / len(chunks) * 1e6:.1f} us")
+    print(f"  per frame     : {dt / frames * 1e6:.2f} us")
+    print(f"  throughput    : {len(data) / dt / 1e6:.0f} MB/s")
+    print(f"  CPU at 60 fps : {dt / args.seconds * 100:.3f} % of one core")
+    print(f"  index size    : {idx.nbytes() / 1024:.1f} KB")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+# benchmarks/bench_pipeline.py
+# What this machine sustains through the real capture -> encode -> mux path.
+#
+# Drives recorder._capture_segment() and recorder._mux() with the synthetic
+# screen and audio sources in scripts/synthetic.py and sweeps resolution,
+# fps, VIDEO_COMPRESSION profile and thread budget.  Per run it records the
+# achieved fps, drop rate, encoder CPU, peak _VideoBuffer RAM, stop and mux
+# wall time and the per-stage telemetry; per (resolution, profile, budget)
+# it reports the highest fps that stayed under the drop threshold.  Higher
+# fps are not attempted once one fails.  Results are written as JSON (tagged
+# with the git commit) so runs can be diffed across commits.
+#
+# Needs the full runtime environment (ffmpeg, numpy, cv2, pyaudiowpatch);
+# run from the repo root:
+#     python -m benchmarks.bench_pipeline [--seconds 10] [--out bench_pipeline.json]
+#     python -m benchmarks.bench_pipeline --resolutions 1920x1080 --budgets 50,75
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scripts.configure as configure   # noqa: E402
+import scripts.recorder as recorder     # noqa: E402
+import scripts.synthetic as synthetic   # noqa: E402
+
+
+def _csv(kind):
+    return lambda s: [kind(v.strip()) for v in s.split(",") if v.strip()]
+
+
+def _resolution(s: str) -> dict:
+    w, h = s.lower().split("x")
+    return {"width": int(w), "height": int(h)}
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--seconds",     type=float, default=10.0)
+    ap.add_argument("--resolutions", type=_csv(_resolution),
+                    default=list(configure.resolutions))
+    ap.add_argument("--fps",         type=_csv(int), default=list(configure.fps_options))
+    ap.add_argument("--profiles",    type=_csv(str),
+                    default=list(configure.video_compression_options))
+    ap.add_argument("--budgets",     type=_csv(int),
+                    default=list(configure.thread_budget_options))
+    ap.add_argument("--max-drop",    type=float, default=0.01,
+                    help="drop rate above which an fps is not sustainable")
+    ap.add_argument("--no-mux",      action="store_true")
+    ap.add_argument("--out",         default="bench_pipeline.json")
+    args = ap.parse_args()
+
+    unknown = [p for p in args.profiles if p not in configure.VIDEO_COMPRESSION]
+    if unknown:
+        ap.error(f"unknown profile(s) {unknown}; "
+                 f"choose from {configure.video_compression_options}")
+
+    combos = list(itertools.product(args.resolutions, args.profiles, args.budgets))
+    fps_list = sorted(args.fps)
+    print(f"Pipeline benchmark: {len(combos)} combination(s) x up to {len(fps_list)} fps, "
+          f"{args.seconds:.0f} s each (<= {len(combos) * len(fps_list) * (args.seconds + 5) / 60:.0f} min)")
+
+    runs, summary = [], []
+    for res, profile, budget in combos:
+        label = f"{res['width']}x{res['height']} {profile} {budget}%"
+        best  = 0
+        peak  = 0.0
+        for fps in fps_list:
+            config = {"resolution": res, "fps": fps,
+                      "video_compression": profile, "thread_budget": budget}
+            t0 = time.perf_counter()
+            r  = synthetic.run_pipeline(config, args.seconds, mux=not args.no_mux)
+            if r is None:
+                print(f"  {label} @ {fps}: encoder failed to start")
+                break
+            ok = r["drop_rate"] <= args.max_drop
+            runs.append({"resolution": f"{res['width']}x{res['height']}",
+                         "profile": profile, "thread_budget": budget,
+                         "sustained": ok, **r})
+            peak = max(peak, r["achieved_fps"])
+            print(f"  {label} @ {fps}: {r['achieved_fps']:.1f} fps, "
+                  f"drop {r['drop_rate'] * 100:.1f}%, enc CPU {r['encoder_cpu_pct']:.0f}%, "
+                  f"buffer {r['peak_buffer_mb']:.0f} MB, mux {r['mux_s']:.1f} s "
+                  f"({time.perf_counter() - t0:.0f} s)")
+            if not ok:
+                break
+            best = fps
+        summary.append({"resolution": f"{res['width']}x{res['height']}",
+                        "profile": profile, "thread_budget": budget,
+                        "max_sustainable_fps": best,
+                        "ceiling_fps": round(peak, 2)})
+
+    report = {
+        "meta": {
+            "commit":        _git_commit(),
+            "timestamp":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "cpu":           recorder.get_cpu_info()["name"],
+            "logical_cores": os.cpu_count(),
+            "platform":      platform.platform(),
+            "python":        platform.python_version(),
+            "seconds":       args.seconds,
+            "max_drop":      args.max_drop,
+        },
+        "summary": summary,
+        "runs":    runs,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'combination':<40}{'max fps':>8}{'ceiling':>9}")
+    for s in summary:
+        name = f"{s['resolution']} {s['profile']} {s['thread_budget']}%"
+        print(f"{name:<40}{s['max_sustainable_fps']:>8}{s['ceiling_fps']:>9.1f}")
+    print(f"Results written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -185,10 +185,17 @@ def write_default_config():
         "video_compression": "Optimal Performance",
         "audio_compression": "Optimal Performance",
         "audio_bitrate": 192,
+        "audio_flush_interval": 1.0,
         "container_format": "MKV",
         "video_splits": False,
         "thread_budget": 75,
         "max_ram_usage": 50,
+        "mux_workers": 1,
+        "cpu_affinity": True,
+        "replay_mode": False,
+        "replay_seconds": 300,
+        "proxy_height": 0,
+        "fast_capture": False,
     }
     with open(CFG_PATH, "w") as f:
         json.dump(cfg, f, indent=4)
@@ -271,6 +278,29 @@ def verify_and_summary() -> bool:
     print("=" * 60)
     return all_ok
 
+# -------------------------------------------------------------------------------
+# Optional: hardware calibration
+# -------------------------------------------------------------------------------
+def run_calibration():
+    """
+    Offer the calibration run (scripts.calibrate): short encodes at every
+    resolution / fps / profile.  The recommended fps, profile and thread
+    budget are written into persistent.json only if the user agrees to it.
+    """
+    print("\nCalibration measures what this machine can record without dropping")
+    print("frames and recommends fps, compression profile and thread budget to match.")
+    print("It takes several minutes; it can be re-run later with:")
+    print(f"  {python_in_venv()} -m scripts.calibrate [--apply]")
+    if input("Run calibration now? [y/N]: ").strip().lower() != "y":
+        return
+    cmd = [python_in_venv(), "-m", "scripts.calibrate"]
+    if input("Apply the recommended settings afterwards? [y/N]: ").strip().lower() == "y":
+        cmd.append("--apply")
+    try:
+        run(cmd)
+    except subprocess.CalledProcessError:
+        print("  !   Calibration found no sustainable settings - current settings kept.")
+
 # -------------------------------------------------------------------------------
 # Install paths
 # -------------------------------------------------------------------------------
@@ -334,6 +364,8 @@ def main():
         do_normal_install(state)
 
     ok = verify_and_summary()
+    if ok:
+        run_calibration()
     print()
     if ok:
         print("Install complete - press ENTER to return to menu.")
@@ -9,7 +9,10 @@ import time
 import threading
 import scripts.configure as configure
 import scripts.displays as displays
-from scripts.recorder import init_capture_system, start_capture, stop_capture, cleanup
+import scripts.metrics as metrics
+import scripts.profiling as profiling
+from scripts.recorder import (init_capture_system, start_capture, stop_capture, cleanup,
+                              get_metrics_registry)
 
 # ---------------------------------------------------------------------------
 # Recording control
@@ -24,7 +27,7 @@ def _do_start_recording(config):
     configure.recording_start_time = time.time()
 
 def _do_stop_recording():
-    """Stop the current recording session and wait for mux to finish.
+    """Stop the current recording session (mux jobs finish in the background).
 
     configure.is_recording is intentionally NOT checked here.  displays.py
     flips that flag early (so the polling timer goes quiet) and then calls
@@ -42,7 +45,7 @@ def _do_stop_recording():
 _webview_window = None   # set once the webview window is created
 
 def _do_exit():
-    """Graceful shutdown: stop recording, cleanup, close GUI."""
+    """Graceful shutdown: stop recording, hand off pending mux jobs, close GUI."""
     if configure.is_recording:
         _do_stop_recording()
     cleanup()
@@ -63,6 +66,7 @@ def _do_exit():
 
 _GRADIO_HOST = "127.0.0.1"
 _GRADIO_PORT = 7860
+_METRICS_PORT = 7861    # GET /metrics (Prometheus text format), local only
 
 # Portable icon path - relative to script location for consistency
 _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -213,8 +217,9 @@ def _force_icon_immediate(window, icon_path):
 def main():
     global _webview_window
 
-    # Check for debug flag
+    # Check for debug / profile flags
     debug_mode = "--debug" in sys.argv
+    profile_mode = "--profile" in sys.argv
 
     # Hide console window in normal mode (not debug)
     if not debug_mode:
@@ -238,6 +243,9 @@ def main():
 
     config = configure.load_configuration()
 
+    if profile_mode:
+        print(f"Profiling recorder threads -> {profiling.enable(configure.PROFILE_DIR)}")
+
     if not init_capture_system(config):
         print(
              "\nERROR: Capture system could not initialise.\n "
@@ -265,6 +273,10 @@ def main():
     )
     server_thread.start()
 
+    # Recorder counters / gauges for local monitoring agents.
+    if metrics.serve(get_metrics_registry(), _GRADIO_HOST, _METRICS_PORT) is not None:
+        print(f"Metrics at http://{_GRADIO_HOST}:{_METRICS_PORT}/metrics")
+
     # Wait briefly for the server to be ready
     url = f"http://{_GRADIO_HOST}:{_GRADIO_PORT}"
     print(f"Gradio server starting at {url} ... ")
@@ -0,0 +1,133 @@
+# scripts/calibrate.py
+# Hardware calibration: what this machine sustains, and settings to match.
+#
+# Runs a short encode (synthetic.run_pipeline: the real capture pipeline,
+# fed by real mss grabs of the primary monitor with synthetic motion drawn
+# over them, and synthetic audio) for every resolution, fps and
+# VIDEO_COMPRESSION profile, trying thread budgets from the lowest up until
+# one keeps up.  The resulting table of minimum budgets is saved to
+# .\data\calibration.json, where the Configure tab uses it to flag settings
+# that will drop frames here.  The recommended video_compression, fps and
+# thread_budget for the configured resolution are printed, and written into
+# persistent.json only with --apply.
+#
+# Offered by the installer; can be re-run from the program folder:
+#     .venv\Scripts\python.exe -m scripts.calibrate [--seconds 4] [--apply]
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import scripts.configure as configure
+import scripts.recorder as recorder
+import scripts.synthetic as synthetic
+
+_SECONDS  = 4.0      # synthetic capture per attempt
+_MAX_DROP = 0.01     # drop rate above which an attempt does not keep up
+
+# Profile preference for the recommendation: the recommended default first,
+# then the cheaper one; Good Quality only if nothing else keeps up.
+_PROFILE_PREFERENCE = ("Optimal Performance", "High Compression", "Good Quality")
+
+
+def calibrate(seconds: float = _SECONDS, max_drop: float = _MAX_DROP) -> dict:
+    """
+    Measure every resolution x fps x profile.  Returns
+    {"WxH": {"fps": {profile: minimum thread budget % or None}}}; None means
+    no budget kept up.  Once an fps fails for a profile, higher fps are
+    recorded as None without being run.
+    """
+    budgets = sorted(configure.thread_budget_options)
+    table   = {}
+    for res in configure.resolutions:
+        key = f"{res['width']}x{res['height']}"
+        table[key] = {str(fps): {} for fps in configure.fps_options}
+        for profile in configure.video_compression_options:
+            failed = False
+            for fps in sorted(configure.fps_options):
+                need = None
+                for budget in ([] if failed else budgets):
+                    r = synthetic.run_pipeline(
+                        {"resolution": res, "fps": fps,
+                         "video_compression": profile, "thread_budget": budget},
+                        seconds, mux=False, real_grab=True)
+                    ok = r is not None and r["drop_rate"] <= max_drop
+                    print(f"  {key} @ {fps} fps, {profile}, {budget}% threads: "
+                          + ("encoder failed to start" if r is None else
+                             f"{r['achieved_fps']:.1f} fps, "
+                             f"drop {r['drop_rate'] * 100:.1f}%  "
+                             f"{'ok' if ok else 'too slow'}"))
+                    if ok:
+                        need = budget
+                        break
+                failed = need is None
+                table[key][str(fps)][profile] = need
+    return table
+
+
+def recommend(table: dict, config: dict) -> dict:
+    """
+    Settings for config's resolution: the highest fps any preferred profile
+    sustains, that profile, and the smallest thread budget it needed (the
+    rest of the CPU stays with the game).  {} if nothing kept up.
+    """
+    res  = config.get("resolution", configure.DEFAULT_CONFIG["resolution"])
+    rows = table.get(f"{res['width']}x{res['height']}") or {}
+    for fps in sorted(configure.fps_options, reverse=True):
+        for profile in _PROFILE_PREFERENCE:
+            need = rows.get(str(fps), {}).get(profile)
+            if need is not None:
+                return {"fps": fps, "video_compression": profile, "thread_budget": need}
+    return {}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Measure this machine and tune the config.")
+    ap.add_argument("--seconds",  type=float, default=_SECONDS)
+    ap.add_argument("--max-drop", type=float, default=_MAX_DROP)
+    ap.add_argument("--apply",    action="store_true",
+                    help="also write the recommended settings into persistent.json")
+    args = ap.parse_args()
+
+    runs = (len(configure.resolutions) * len(configure.fps_options)
+            * len(configure.video_compression_options))
+    print(f"Calibrating: {runs} combination(s), {args.seconds:.0f} s each, "
+          f"up to {len(configure.thread_budget_options)} thread budget(s) per combination ...")
+    t0    = time.time()
+    table = calibrate(args.seconds, args.max_drop)
+
+    data = {
+        "version":   1,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cpu":       recorder.get_cpu_info()["name"],
+        "seconds":   args.seconds,
+        "max_drop":  args.max_drop,
+        "table":     table,
+    }
+    os.makedirs(os.path.dirname(configure.CALIBRATION_PATH), exist_ok=True)
+    with open(configure.CALIBRATION_PATH, "w") as f:
+        json.dump(data, f, indent=4)
+    print(f"  wrote    {configure.CALIBRATION_PATH}  ({time.time() - t0:.0f} s)")
+
+    config = configure.load_configuration()
+    rec    = recommend(table, config)
+    if not rec:
+        res = config["resolution"]
+        print(f"  !   nothing kept up at {res['width']}x{res['height']}; settings unchanged "
+              f"(try a lower resolution)")
+        return 1
+    if not args.apply:
+        print(f"  suggest  fps {rec['fps']}, {rec['video_compression']}, "
+              f"{rec['thread_budget']}% thread budget  (re-run with --apply to set)")
+        return 0
+    config.update(rec)
+    configure.save_configuration(config)
+    print(f"  set      fps {rec['fps']}, {rec['video_compression']}, "
+          f"{rec['thread_budget']}% thread budget  ->  {configure.PERSISTENT_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -60,6 +60,16 @@ VIDEO_COMPRESSION = {
     },
 }
 
+# Fast capture: cheapest possible real-time encode (lossless, ultrafast) so
+# weak machines never drop frames.  Segments recorded this way are re-encoded
+# to the selected profile above in the background while the machine is idle.
+FAST_CAPTURE = {
+    "preset":  "ultrafast",
+    "qp":      "0",
+    "tune":    "zerolatency",
+    "pix_fmt": "yuv420p",
+}
+
 # ---------------------------------------------------------------------------
 # Audio compression profiles
 # ---------------------------------------------------------------------------
@@ -88,6 +98,11 @@ AUDIO_COMPRESSION = {
 # ---------------------------------------------------------------------------
 audio_bitrate_options = [96, 128, 160, 192, 256]
 
+# ---------------------------------------------------------------------------
+# Audio flush interval options (seconds of PCM buffered per disk write)
+# ---------------------------------------------------------------------------
+audio_flush_options = [0.25, 0.5, 1.0, 2.0, 5.0]
+
 # ---------------------------------------------------------------------------
 # Container / output format options
 # ---------------------------------------------------------------------------
@@ -98,6 +113,31 @@ container_format_options = ["MKV", "MP4"]
 # ---------------------------------------------------------------------------
 thread_budget_options = [25, 50, 75]   # percent
 
+# ---------------------------------------------------------------------------
+# Mux workers  (segments muxed in parallel; they share the thread budget)
+# ---------------------------------------------------------------------------
+mux_workers_options = [1, 2, 3]
+
+# ---------------------------------------------------------------------------
+# Instant replay  (seconds kept in the replay ring)
+# ---------------------------------------------------------------------------
+replay_seconds_options = [30, 60, 120, 300, 600]
+
+# ---------------------------------------------------------------------------
+# Editing proxy  (height of the low-res second rendition; 0 = off)
+# ---------------------------------------------------------------------------
+proxy_height_options = [0, 360, 540, 720]
+
+# ---------------------------------------------------------------------------
+# Per-segment performance sidecar  (written next to each output file)
+# ---------------------------------------------------------------------------
+PERF_SIDECAR_SUFFIX = ".perf.json"
+
+# ---------------------------------------------------------------------------
+# Profiling output  (launcher.py --profile; one sub-folder per launch)
+# ---------------------------------------------------------------------------
+PROFILE_DIR = os.path.join("data", "profiles")
+
 # ===========================================================================
 # Live Monitoring
 # ===========================================================================
@@ -133,6 +173,21 @@ def get_video_params(config: dict) -> list:
         "-pix_fmt", vp["pix_fmt"],
     ]
 
+
+def get_capture_video_params(config: dict) -> list:
+    """
+    ffmpeg output args for the live capture encoder: the FAST_CAPTURE
+    settings when "fast_capture" is on, else the selected profile.
+    """
+    if not config.get("fast_capture", False):
+        return get_video_params(config)
+    return [
+        "-preset",  FAST_CAPTURE["preset"],
+        "-qp",      FAST_CAPTURE["qp"],
+        "-tune",    FAST_CAPTURE["tune"],
+        "-pix_fmt", FAST_CAPTURE["pix_fmt"],
+    ]
+
 # ---------------------------------------------------------------------------
 # Persistent configuration  (.\data\persistent.json)
 # ---------------------------------------------------------------------------
@@ -146,10 +201,17 @@ DEFAULT_CONFIG = {
     "video_compression": "Optimal Performance",
     "audio_compression": "Optimal Performance",
     "audio_bitrate":     192,
+    "audio_flush_interval": 1.0,
     "container_format":  "MKV",
     "video_splits":      False,
     "thread_budget":     75,
     "max_ram_usage":     50,
+    "mux_workers":       1,
+    "cpu_affinity":      True,
+    "replay_mode":       False,
+    "replay_seconds":    300,
+    "proxy_height":      0,
+    "fast_capture":      False,
 }
 
 
@@ -183,4 +245,42 @@ def save_configuration(config: dict):
     """Write the configuration dictionary back to persistent.json."""
     os.makedirs(os.path.dirname(PERSISTENT_PATH), exist_ok=True)
     with open(PERSISTENT_PATH, "w") as f:
-        json.dump(config, f, indent=4)
\ No newline at end of file
+        json.dump(config, f, indent=4)
+
+# ---------------------------------------------------------------------------
+# Hardware calibration  (.\data\calibration.json, written by scripts.calibrate)
+# ---------------------------------------------------------------------------
+CALIBRATION_PATH = os.path.join("data", "calibration.json")
+
+
+def load_calibration() -> dict | None:
+    """Return the saved calibration results, or None if never calibrated."""
+    try:
+        with open(CALIBRATION_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def calibration_warning(config: dict) -> str:
+    """
+    Check resolution / fps / video_compression / thread_budget against the
+    calibration table.  Returns a warning if this machine dropped frames with
+    that combination, "" if it kept up or there is no calibration data.
+    """
+    data = load_calibration()
+    if not data:
+        return ""
+    res  = config["resolution"]
+    key  = f"{res['width']}x{res['height']}"
+    row  = data.get("table", {}).get(key, {}).get(str(config["fps"]), {})
+    if config["video_compression"] not in row:
+        return ""
+    need = row[config["video_compression"]]
+    if need is None:
+        return (f"WARNING: {key} @ {config['fps']} fps with {config['video_compression']} "
+                f"dropped frames at every thread budget during calibration.")
+    if config["thread_budget"] < need:
+        return (f"WARNING: {key} @ {config['fps']} fps with {config['video_compression']} "
+                f"needs a {need}% thread budget here (set: {config['thread_budget']}%).")
+    return ""
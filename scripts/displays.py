@@ -283,6 +283,181 @@ def _build_file_table(config: dict):
         folder_str,
     )
 
+# ===========================================================================
+# Helper: audio level text
+# ===========================================================================
+_LEVEL_STALE_S = 2.0   # a device silent for this long shows as idle
+
+def _fmt_audio_levels(levels: dict) -> str:
+    """One-line peak/RMS summary per device (loudest channel), in dBFS."""
+    def _db(v):
+        return "-inf" if v == float("-inf") else f"{v:.0f}"
+
+    parts = []
+    for key, name in (("lb", "SYS"), ("mic", "MIC")):
+        lv = levels.get(key)
+        if lv is None:
+            parts.append(f"{name} --")
+        elif lv["age"] > _LEVEL_STALE_S:
+            parts.append(f"{name} idle")
+        else:
+            parts.append(f"{name} {_db(max(lv['peak_db']))}/{_db(max(lv['rms_db']))}")
+    return "   ".join(parts)
+
+# ===========================================================================
+# Helper: mux scheduler text
+# ===========================================================================
+def _fmt_mux_stats(ms: dict) -> str:
+    """Queue / run summary for the mux scheduler, or "" when it has nothing to show."""
+    if not ms or not (ms["queued"] or ms["running"] or ms["completed"]):
+        return ""
+    text = f"{ms['running']}/{ms['workers']} running, {ms['queued']} queued"
+    if ms["completed"]:
+        text += (f", last wait {ms['wait_s_last']:.1f} s / run {ms['run_s_last']:.1f} s"
+                 f" (avg {ms['wait_s_avg']:.1f} / {ms['run_s_avg']:.1f} s)")
+    return text
+
+# ===========================================================================
+# Helper: editing proxy text
+# ===========================================================================
+def _fmt_proxy_stats(ps: dict) -> str:
+    """Size / CPU / repeat summary for the proxy encoder, or "" when none runs."""
+    if not ps:
+        return ""
+    text = f"{ps['size'][0]}x{ps['size'][1]}, {ps['threads']} thr"
+    if ps["cpu_pct"] >= 0:
+        text += f", {ps['cpu_pct']:.0f}% CPU"
+    if ps["repeated"]:
+        text += f", {ps['repeated']} repeated"
+    return text
+
+# ===========================================================================
+# Helper: ffmpeg progress text
+# ===========================================================================
+def _fmt_encoder_progress(ep: dict) -> str:
+    """Live capture-encoder throughput from its -progress reports, or ""."""
+    if not ep or ep.get("fps") is None:
+        return ""
+    text = f"{ep['fps']:.1f} fps"
+    if ep.get("speed") is not None:
+        text += f" {ep['speed']:.2f}x"
+    if ep.get("bitrate_kbps") is not None:
+        text += f", {ep['bitrate_kbps'] / 1000:.1f} Mbps"
+    if ep.get("drop_frames"):
+        text += f", {ep['drop_frames']} dropped"
+    return text
+
+
+def _fmt_mux_progress(mp: list) -> str:
+    """Percent complete (or muxed time) per running mux, or ""."""
+    parts = []
+    for m in mp:
+        done = (f"{m['pct']:.0f}%" if m["pct"] is not None
+                else utilities.fmt_time(m["out_time_s"]))
+        if m["speed"]:
+            done += f" @ {m['speed']:.0f}x"
+        parts.append(f"{m['name']} {done}")
+    return ", ".join(parts)
+
+# ===========================================================================
+# Helper: pipeline telemetry text
+# ===========================================================================
+def _fmt_telemetry(stages: dict, reader: dict) -> str:
+    """Per-stage p50/p95/p99 table (ms); the slowest p95 is flagged."""
+    live = {k: v for k, v in stages.items() if v["count"]}
+    if not live:
+        return "No capture telemetry yet - start a recording, then Refresh."
+    # encoder_read / audio_read block on their source by design, so they
+    # are shown but never flagged as the bottleneck.
+    work  = [k for k in live if k != "encoder_read" and not k.startswith("audio_read")]
+    worst = max(work, key=lambda k: live[k]["p95_ms"]) if work else None
+    lines = [f"{'stage':<22}{'count':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+    for name, st in live.items():
+        lines.append(f"{name:<22}{st['count']:>9}{st['p50_ms']:>9.2f}{st['p95_ms']:>9.2f}"
+                     f"{st['p99_ms']:>9.2f}{st['max_ms']:>9.1f}"
+                     + ("  <- slowest" if name == worst else ""))
+    if reader:
+        lines.append(f"encoder output: {reader['bytes_per_s'] * 8 / 1e6:.1f} Mbps, "
+                     f"reader blocked {reader['blocked_pct']:.0f}%")
+    return "\n".join(lines)
+
+# ===========================================================================
+# Helper: segment performance sidecar viewer
+# ===========================================================================
+_SPARK     = " \u2581\u2582\u2583\u2584\u2585\u2586\u2587\u2588"
+_PERF_COLS = 60        # timeline width in characters
+_PERF_LIST = 20        # drop / event times listed under the plot
+
+def _spark(cols: list, top: float) -> str:
+    """One block character per column value, scaled to top."""
+    if top <= 0:
+        return " " * len(cols)
+    n = len(_SPARK) - 1
+    return "".join(_SPARK[min(n, int(round(v / top * n)))] if v > 0 else " " for v in cols)
+
+
+def _fmt_media_time(t: float) -> str:
+    return f"{utilities.fmt_time(t)}.{int(t % 1 * 1000):03d}"
+
+
+def _fmt_perf_timeline(perf: dict | None) -> str:
+    """Text plot of one .perf.json sidecar: drops, queue, pacing, bitrate over time."""
+    if not perf:
+        return "No performance data - pick a recording and press View."
+    ps    = perf["per_second"]
+    secs  = max(len(ps["grabs"]), 1)
+    span  = max(1, -(-secs // _PERF_COLS))               # seconds per column
+    ncols = -(-secs // span)
+
+    def _cols(values, agg):
+        return [agg(values[c * span:(c + 1) * span] or [0]) for c in range(ncols)]
+
+    drops = [0] * ncols
+    for t in perf["drops"]:
+        drops[min(int(t // span), ncols - 1)] += 1
+    rows = [
+        ("drops",       drops,                               "",    "{:.0f}"),
+        ("queue max",   _cols(ps["queue_max"], max),         "",    "{:.0f}"),
+        ("late max",    _cols(ps["late_max_ms"], max),       " ms", "{:.1f}"),
+        ("Mbps",        [v / 1000 for v in _cols(ps["kbps"], lambda c: sum(c) / len(c))],
+                                                             "",    "{:.1f}"),
+        ("grabs/s min", _cols(ps["grabs"], min),             "",    "{:.0f}"),
+    ]
+
+    w, h   = perf.get("resolution", ["?", "?"])
+    frames = perf["frames"] or 1
+    lines  = [f"{perf.get('file', '?')}   {w}x{h} @ {perf['fps']} fps, "
+              f"{utilities.fmt_time(perf['duration_s'])}, {perf['frames']} frames, "
+              f"{perf['dropped']} dropped ({perf['dropped'] / frames * 100:.2f}%)"]
+    enc = perf.get("encoder") or {}
+    if enc.get("fps") is not None:
+        lines.append(f"encoder {enc['fps']:.1f} fps, speed {enc.get('speed') or 0:.2f}x, "
+                     f"{enc.get('dup_frames') or 0} dup / {enc.get('drop_frames') or 0} drop")
+    left, right = utilities.fmt_time(0), utilities.fmt_time(ncols * span)
+    axis = (f"{left}{right:>{ncols - len(left)}}"
+            if ncols > len(left) + len(right) else "")
+    lines.append(f"{'':<13}|{axis:<{ncols}}|   (to {right}, {span} s per column)")
+    for name, cols, unit, fmt in rows:
+        top = max(cols) if cols else 0
+        lines.append(f"{name:<13}|{_spark(cols, top)}|   max {fmt.format(top)}{unit}")
+
+    events = []
+    if perf.get("spill_t") is not None:
+        events.append((perf["spill_t"], "video buffer spilled to disk"))
+    for label, a in (perf.get("audio") or {}).items():
+        for t, d in a["gaps"]:
+            events.append((t, f"audio gap ({label}) {d:.2f} s"))
+    if events:
+        lines.append("events:")
+        for t, what in sorted(events)[:_PERF_LIST]:
+            lines.append(f"  {_fmt_media_time(t)}  {what}")
+    if perf["drops"]:
+        shown = perf["drops"][:_PERF_LIST]
+        lines.append(f"drop times (first {len(shown)} of {perf['dropped']}):")
+        for i in range(0, len(shown), 5):
+            lines.append("  " + "  ".join(_fmt_media_time(t) for t in shown[i:i + 5]))
+    return "\n".join(lines)
+
 # ===========================================================================
 # Helper: build recording monitor values
 # ===========================================================================
@@ -299,6 +474,10 @@ def _build_rec_values(config: dict) -> dict:
         "audio_prof":      "--",
         "cpu_usage":       configure._cached_cpu_usage,
         "ram_assignment":  configure._cached_ram_assignment,
+        "audio_levels":    "--",
+        "mux_status":      "",
+        "proxy_status":    "",
+        "encoder_status":  "",
         "seg_progress":    0.0,
         "seg_label":       "Segment: --",
     }
@@ -318,6 +497,9 @@ def _build_rec_values(config: dict) -> dict:
     d["fps"]        = str(config["fps"])
     d["audio_prof"] = f"{ab} kbps"
 
+    # Audio meters are cheap lock-free snapshots, so refresh every tick.
+    d["audio_levels"] = _fmt_audio_levels(recorder.get_audio_levels())
+
     # Update CPU/RAM on an accelerating schedule:
     # immediate on start → 5 s → 10 s → every 15 s after that.
     now = time.time()
@@ -330,9 +512,10 @@ def _build_rec_values(config: dict) -> dict:
             configure._cached_cpu_usage = "N/A"
 
         # RAM Assignment - update cache
-        assigned, used, free_assigned, pct_used = utilities.get_ram_assignment_info(config)
+        assigned, used, free_assigned, pct_used, rss_peak = utilities.get_ram_assignment_info(config)
         if assigned >= 0:
-            configure._cached_ram_assignment = f"{used:.0f}/{free_assigned:.0f} MB "
+            configure._cached_ram_assignment = (f"{used:.0f}/{assigned:.0f} MB "
+                                                f"(RSS pk {rss_peak:.0f}) ")
         else:
             configure._cached_ram_assignment = "N/A "
 
@@ -357,11 +540,23 @@ def _build_rec_values(config: dict) -> dict:
     d["seg_progress"] = seg_pct
     d["seg_label"]    = f"Segment {seg_num}:  {seg_pct * 100:.0f}%"
 
+    # Replay mode: the bar shows how full the replay ring is instead.
+    rs = recorder.get_replay_status()
+    if rs is not None:
+        d["seg_progress"] = rs["window_s"] / rs["seconds"] if rs["seconds"] else 0.0
+        d["seg_label"]    = (f"Replay buffer:  {rs['window_s']:.0f}/{rs['seconds']:.0f} s"
+                             f"  ({rs['ram_mb']:.0f} MB)")
+
     # Encode log
     log = []
     mux_pending = recorder.pending_mux_count
     if mux_pending > 0:
         log.append(f"[MUX] {mux_pending} segment(s) encoding  (stream-copy + AAC)...")
+    d["mux_status"]   = _fmt_mux_stats(recorder.get_mux_stats())
+    d["proxy_status"] = _fmt_proxy_stats(recorder.get_proxy_stats())
+    d["encoder_status"] = _fmt_encoder_progress(recorder.get_encoder_progress())
+    if d["mux_status"]:
+        log.append(f"[MUX] {d['mux_status']}")
     last = recorder.last_output_file
     if last:
         log.append(f"[DONE] {os.path.basename(last)}")
@@ -470,7 +665,7 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                             elem_classes=["rec-info-box"],
                         )
 
-                    # Row 2: CPU Usage | RAM Assignment Free (NEW)
+                    # Row 2: CPU Usage | RAM Assignment Free | Audio Levels
                     with gr.Row():
                         rec_cpu_box = gr.Textbox(
                             value="--",
@@ -481,7 +676,14 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                         )
                         rec_ram_box = gr.Textbox(
                             value="--",
-                            label="RAM Assignment Used/Free ",
+                            label="RAM Used/Budget ",
+                            interactive=False,
+                            max_lines=1,
+                            elem_classes=["rec-info-box"],
+                        )
+                        rec_levels_box = gr.Textbox(
+                            value="--",
+                            label="Audio Peak/RMS (dBFS)",
                             interactive=False,
                             max_lines=1,
                             elem_classes=["rec-info-box"],
@@ -496,6 +698,12 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                         interactive=False,
                     )
 
+                    # Row 4: Instant replay (only acts in replay mode)
+                    rec_replay_btn = gr.Button(
+                        "\U0001F3AC  Save Replay",
+                        variant="secondary",
+                    )
+
 
                 # --- Control buttons --------------------------------------
                 # Visibility rules:
@@ -557,10 +765,10 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                 # ----------------------------------------------------------
 
                 # All recording-panel output components in canonical order:
-                # (7 components: res, fps, audio, cpu, ram, seg_progress, encode_log)
+                # (7 components: res, fps, audio, cpu, ram, levels, seg_progress)
                 _rec_panel_outputs = [
                     rec_res_box, rec_fps_box, rec_aprof_box,
-                    rec_cpu_box, rec_ram_box,
+                    rec_cpu_box, rec_ram_box, rec_levels_box,
                     seg_progress,
                 ]
 
@@ -572,6 +780,7 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                         gr.update(value=rv["audio_prof"]),
                         gr.update(value=rv["cpu_usage"]),
                         gr.update(value=rv["ram_assignment"]),
+                        gr.update(value=rv["audio_levels"]),
                         gr.update(value=rv["seg_progress"], label=rv["seg_label"]),
                     ]
 
@@ -606,7 +815,7 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                 def on_start_recording():
                     global _next_cpu_ram_update
                     if configure.is_recording:
-                        noop = [gr.update()] * 6
+                        noop = [gr.update()] * 7
                         return (
                             [gr.update(), gr.update()]   # panels
                             + noop                       # rec boxes
@@ -641,7 +850,7 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
 
                 def on_stop_recording():
                     """
-                    Generator callback so the UI stays responsive while the mux drains.
+                    Generator callback so the UI stays responsive while the encoder flushes.
 
                     Phase 1 (immediate): flip configure flags, hide all buttons,
                                DISABLE timer (prevents race with this generator),
@@ -652,7 +861,7 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                                listing and idle button bar.
                     """
                     if not configure.is_recording and not recorder.is_capturing:
-                        yield [gr.update()] * 18
+                        yield [gr.update()] * 19
                         return
 
                     # --- Phase 1: immediate UI response ----------------------
@@ -673,7 +882,7 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                         gr.update(visible=False),                       # stop_btn
                         gr.update(active=False),                        # DISABLE timer (no race)
                         gr.update(), gr.update(), gr.update(),          # res, fps, audio (no change)
-                        gr.update(), gr.update(),                       # cpu, ram (no change)
+                        gr.update(), gr.update(), gr.update(),          # cpu, ram, levels (no change)
                         gr.update(value=0, label=f"Segment {seg_n}"),   # seg_progress
                         f"[MUX] Encoding {seg_n} segment(s)... please wait.",  # status bar
                     ]
@@ -682,7 +891,7 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                     _done = threading.Event()
 
                     def _run_stop():
-                        stop_cb()      # blocks until capture thread exits + mux drains
+                        stop_cb()      # blocks until the encoder flushes; mux continues in background
                         _done.set()
 
                     threading.Thread(
@@ -693,8 +902,14 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                         time.sleep(0.5)
                         mux_n = recorder.pending_mux_count
 
+                        mux_pct = _fmt_mux_progress(recorder.get_mux_progress())
                         if mux_n > 0:
                             status = f"[MUX] {mux_n} segment(s) encoding (stream-copy + AAC)..."
+                            mux_txt = mux_pct or _fmt_mux_stats(recorder.get_mux_stats())
+                            if mux_txt:
+                                status += f"  [{mux_txt}]"
+                        elif mux_pct:
+                            status = f"[MUX] {mux_pct}"
                         else:
                             status = "[MUX] Finalising..."
 
@@ -708,7 +923,7 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                             gr.update(visible=False),                       # stop_btn
                             gr.update(active=False),                        # timer stays OFF
                             gr.update(), gr.update(), gr.update(),          # res, fps, audio
-                            gr.update(), gr.update(),                       # cpu, ram
+                            gr.update(), gr.update(), gr.update(),          # cpu, ram, levels
                             gr.update(value=0, label=f"Segment {seg_n}"),   # seg_progress
                             status,                                         # status bar
                         ]
@@ -718,7 +933,12 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
 
                     last = recorder.last_output_file
                     segs = recorder.last_segment_count
-                    if last and os.path.exists(last):
+                    if recorder.pending_mux_count:
+                        msg = (
+                            f"Stopped. {recorder.pending_mux_count} segment(s) "
+                            f"finishing in the background (safe to exit)."
+                        )
+                    elif last and os.path.exists(last):
                         sz = utilities.fmt_bytes(os.path.getsize(last))
                         if segs > 1:
                             msg = (
@@ -729,6 +949,9 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                             msg = f"Saved: {os.path.basename(last)} ({sz})"
                     else:
                         msg = "Stopped. Check output folder."
+                    sr = recorder.get_last_stop_report()
+                    if sr is not None and sr["slowest"]:
+                        msg += f"    [stop {sr['total_s']:.1f} s, slowest: {sr['slowest']}]"
 
                     refreshed = configure.load_configuration()
                     config.update(refreshed)
@@ -745,6 +968,7 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                         gr.update(active=False),                      # timer stays OFF
                         gr.update(), gr.update(), gr.update(),        # res, fps, audio
                         gr.update(), gr.update(),                     # cpu, ram
+                        gr.update(value="--"),                        # levels
                         gr.update(value=0, label="Segment Progress"), # seg_progress
                         msg,                                          # status bar
                     ]
@@ -757,20 +981,17 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                         rec_start_btn, rec_pause_btn, rec_resume_btn, rec_stop_btn,
                         rec_timer,
                         rec_res_box, rec_fps_box, rec_aprof_box,
-                        rec_cpu_box, rec_ram_box,
+                        rec_cpu_box, rec_ram_box, rec_levels_box,
                         seg_progress,
                         rec_status,
                     ],
                 )
 
                 def on_pause_recording():
-                    """Pause: best-effort call to recorder, switch to paused UI."""
+                    """Pause: idle the capture pipeline, switch to paused UI."""
                     if not configure.is_recording:
                         return [gr.update()] * 5
-                    try:
-                        recorder.pause_capture()
-                    except AttributeError:
-                        pass   # recorder may not implement pause yet
+                    recorder.pause_capture()
                     configure.is_paused = True
                     return list(_btn_paused()) + ["Paused."]
 
@@ -783,11 +1004,8 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                 )
 
                 def on_resume_recording():
-                    """Resume: best-effort call to recorder, switch to recording UI."""
-                    try:
-                        recorder.resume_capture()
-                    except AttributeError:
-                        pass
+                    """Resume: restart the capture pipeline, switch to recording UI."""
+                    recorder.resume_capture()
                     configure.is_paused = False
                     return list(_btn_recording()) + ["Recording..."]
 
@@ -799,6 +1017,21 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                     ],
                 )
 
+                def on_save_replay():
+                    """Write the replay ring's current window without stopping capture."""
+                    if not configure.is_recording:
+                        return "Not recording."
+                    if not config.get("replay_mode", False):
+                        return "Replay mode is off (enable it on the Configure tab)."
+                    if recorder.replay_save_pending():
+                        return "Previous replay is still saving - try again shortly."
+                    path = recorder.save_replay()
+                    if path is None:
+                        return "Replay buffer is still filling - try again shortly."
+                    return f"Saving replay: {os.path.basename(path)}"
+
+                rec_replay_btn.click(fn=on_save_replay, outputs=[rec_status])
+
                 def on_purge():
                     if configure.is_recording:
                         return [gr.update()] * 4 + ["Cannot purge while recording."]
@@ -834,20 +1067,25 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                     # During the stopping/mux phase the timer is OFF; the
                     # on_stop_recording generator owns all UI updates.
                     if configure.is_stopping:
-                        return [gr.update()] * 7
+                        return [gr.update()] * 8
 
                     if not configure.is_recording:
-                        return [gr.update()] * 7
+                        return [gr.update()] * 8
 
                     rv = _build_rec_values(config)
-                    elapsed = 0
-                    if configure.recording_start_time:
-                        elapsed = time.time() - configure.recording_start_time
+                    # Recorded time, not wall time: pauses are excluded.
+                    elapsed = recorder.capture_elapsed()
 
                     if configure.is_paused:
                         status_text = f"Paused. [{utilities.fmt_time(elapsed)}]"
                     else:
                         status_text = f"Recording... [{utilities.fmt_time(elapsed)}]"
+                    if rv["encoder_status"] and not configure.is_paused:
+                        status_text += f"    ENC: {rv['encoder_status']}"
+                    if rv["proxy_status"]:
+                        status_text += f"    PROXY: {rv['proxy_status']}"
+                    if recorder.pending_mux_count and rv["mux_status"]:
+                        status_text += f"    MUX: {rv['mux_status']}"
 
                     return [
                         gr.update(value=rv["resolution"]),
@@ -855,6 +1093,7 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                         gr.update(value=rv["audio_prof"]),
                         gr.update(value=rv["cpu_usage"]),
                         gr.update(value=rv["ram_assignment"]),
+                        gr.update(value=rv["audio_levels"]),
                         gr.update(
                             value=rv["seg_progress"],
                             label=rv["seg_label"],
@@ -866,7 +1105,7 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                     fn=on_timer_tick,
                     outputs=[
                         rec_res_box, rec_fps_box, rec_aprof_box,
-                        rec_cpu_box, rec_ram_box,
+                        rec_cpu_box, rec_ram_box, rec_levels_box,
                         seg_progress,
                         rec_status,
                     ],
@@ -879,7 +1118,7 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
             # =======================================================================
             with gr.Tab("Configure", id="tab_cfg"):
 
-                # ---- Row 1: Video  (Resolution | FPS | Video Compression)
+                # ---- Row 1: Video  (Resolution | FPS | Video Compression | Fast Capture)
                 gr.Markdown("Video", elem_classes=["cfg-section-label"])
                 with gr.Row():
                     res = config["resolution"]
@@ -908,6 +1147,14 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                         ),
                         label="Video Compression",
                     )
+                    cfg_fast = gr.Dropdown(
+                        choices=["Off", "On"],
+                        value=(
+                            "On" if config.get("fast_capture", False)
+                            else "Off"
+                        ),
+                        label="Fast Capture (recompress when idle)",
+                    )
 
                 # ---- Row 2: Audio  (Audio Bitrate | Audio Compression)
                 gr.Markdown("Audio", elem_classes=["cfg-section-label"])
@@ -927,8 +1174,35 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                         ),
                         label="Audio Compression",
                     )
+                    cfg_audio_flush = gr.Dropdown(
+                        choices=[
+                            f"{f:g} s"
+                            for f in configure.audio_flush_options
+                        ],
+                        value=f"{config.get('audio_flush_interval', 1.0):g} s",
+                        label="Audio Write Interval",
+                    )
+
+                # ---- Row 2b: Instant replay  (Replay Mode | Replay Length)
+                gr.Markdown("Instant Replay", elem_classes=["cfg-section-label"])
+                with gr.Row():
+                    cfg_replay = gr.Dropdown(
+                        choices=["Off", "On"],
+                        value=(
+                            "On" if config.get("replay_mode", False)
+                            else "Off"
+                        ),
+                        label="Replay Mode (keep last N only)",
+                    )
+                    cfg_replay_len = gr.Dropdown(
+                        choices=[
+                            f"{r} s" for r in configure.replay_seconds_options
+                        ],
+                        value=f"{config.get('replay_seconds', 300)} s",
+                        label="Replay Length",
+                    )
 
-                # ---- Row 3: Output  (Container | Output Dir)
+                # ---- Row 3: Output  (Container | Output Dir | Splits | Proxy)
                 gr.Markdown("Output", elem_classes=["cfg-section-label"])
                 with gr.Row():
                     cfg_container = gr.Dropdown(
@@ -950,9 +1224,20 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                         ),
                         label="1-Hour Video Splits",
                     )
+                    cfg_proxy = gr.Dropdown(
+                        choices=[
+                            f"{p}p" if p else "Off"
+                            for p in configure.proxy_height_options
+                        ],
+                        value=(
+                            f"{config.get('proxy_height', 0)}p"
+                            if config.get("proxy_height", 0) else "Off"
+                        ),
+                        label="Editing Proxy",
+                    )
 
                 # ---- Row 4: Resources
-                #      (1Hr Splits | Max Threads | Max RAM)
+                #      (Max Threads | Max RAM | Mux Workers | Pin Cores)
                 gr.Markdown(
                     "RESOURCES",
                     elem_classes=["cfg-section-label"],
@@ -972,11 +1257,29 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                         value=f"{config.get('max_ram_usage', 50)}%",
                         label="Max RAM Usage",
                     )
+                    cfg_mux_workers = gr.Dropdown(
+                        choices=[
+                            str(m) for m in configure.mux_workers_options
+                        ],
+                        value=str(config.get("mux_workers", 1)),
+                        label="Mux Workers",
+                    )
+                    cfg_affinity = gr.Dropdown(
+                        choices=["Off", "On"],
+                        value=(
+                            "On" if config.get("cpu_affinity", True)
+                            else "Off"
+                        ),
+                        label="Pin Recorder Cores",
+                    )
 
                 # --- Status bar -------------------------------------------
                 with gr.Row():
                     cfg_status = gr.Textbox(
-                        value="Configuration tab loaded.",
+                        value=(
+                            configure.calibration_warning(config)
+                            or "Configuration tab loaded."
+                        ),
                         label="Status",
                         interactive=False,
                         max_lines=1,
@@ -998,8 +1301,10 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                 # --- Configure callbacks ----------------------------------
 
                 def on_save_config(
-                    res_str, fps_str, v_comp, a_br_str, a_comp,
+                    res_str, fps_str, v_comp, a_br_str, a_comp, a_flush_str,
                     container, out_dir, splits_str, threads_str, ram_str,
+                    mux_workers_str, affinity_str, replay_str, replay_len_str,
+                    proxy_str, fast_str,
                 ):
                     if configure.is_recording:
                         return (
@@ -1033,6 +1338,13 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                     if a_comp in configure.audio_compression_options:
                         config["audio_compression"] = a_comp
 
+                    try:
+                        config["audio_flush_interval"] = float(
+                            a_flush_str.replace("s", "").strip()
+                        )
+                    except (ValueError, AttributeError):
+                        pass
+
                     if container in configure.container_format_options:
                         config["container_format"] = container
 
@@ -1066,14 +1378,40 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                     except (ValueError, AttributeError):
                         pass
 
+                    try:
+                        config["mux_workers"] = int(mux_workers_str)
+                    except (ValueError, TypeError):
+                        pass
+
+                    config["cpu_affinity"] = (affinity_str == "On")
+
+                    config["replay_mode"] = (replay_str == "On")
+                    try:
+                        config["replay_seconds"] = int(
+                            replay_len_str.replace("s", "").strip()
+                        )
+                    except (ValueError, AttributeError):
+                        pass
+
+                    try:
+                        config["proxy_height"] = (
+                            0 if proxy_str == "Off"
+                            else int(proxy_str.replace("p", "").strip())
+                        )
+                    except (ValueError, AttributeError):
+                        pass
+
+                    config["fast_capture"] = (fast_str == "On")
+
                     configure.save_configuration(config)
 
                     # Refresh the Manage/Record file panel immediately so the
                     # new output folder (and its file listing) is visible as
                     # soon as the user switches back to that tab.
                     rows, cnt, sz_str, fld = _build_file_table(config)
+                    warning = configure.calibration_warning(config)
                     return (
-                        "Configuration saved.",
+                        "Configuration saved." + (f"  {warning}" if warning else ""),
                         gr.update(value=fld),
                         gr.update(value=rows),
                         gr.update(value=cnt),
@@ -1084,9 +1422,12 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                     fn=on_save_config,
                     inputs=[
                         cfg_resolution, cfg_fps, cfg_video_comp,
-                        cfg_audio_br, cfg_audio_comp,
+                        cfg_audio_br, cfg_audio_comp, cfg_audio_flush,
                         cfg_container, cfg_output_dir,
                         cfg_splits, cfg_threads, cfg_ram,
+                        cfg_mux_workers, cfg_affinity,
+                        cfg_replay, cfg_replay_len,
+                        cfg_proxy, cfg_fast,
                     ],
                     outputs=[
                         cfg_status,
@@ -1095,12 +1436,36 @@ def build_interface(config: dict, start_cb, stop_cb, exit_cb):
                     ],
                 )
 
+                def on_calibration_check(res_str, fps_str, v_comp, threads_str):
+                    """Flag a combination that dropped frames during calibration."""
+                    try:
+                        w, h = res_str.split("x")
+                        combo = {
+                            "resolution":        {"width": int(w), "height": int(h)},
+                            "fps":               int(fps_str),
+                            "video_compression": v_comp,
+                            "thread_budget":     int(threads_str.replace("%", "").strip()),
+                        }
+                    except (ValueError, AttributeError, TypeError):
+                        return gr.update()
+                    return (
+                        configure.calibration_warning(combo)
+                        or "Settings changed - not saved yet."
+                    )
+
+                for _dd in (cfg_resolution, cfg_fps, cfg_video_comp, cfg_threads):
+                    _dd.change(
+                        fn=on_calibration_check,
+                        inputs=[cfg_resolution, cfg_fps, cfg_video_comp, cfg_threads],
+                        outputs=[cfg_status],
+                    )
+
                 exit_cfg.click(fn=lambda: exit_cb())
 
             # =======================================================================
             # TAB 3 - ABOUT / DEBUG
             # =======================================================================
-            with gr.Tab("About / Debug", id="tab_about"):
+            with gr.Tab("About / Debug", id="tab_about") as about_tab:
 
                 gr.Markdown(
                     """
@@ -1126,7 +1491,7 @@ A x264vfw screen recording tool for Windows ~8.1-10 by [WiseMan-TimeLord](https:
                         elem_classes=["info-box"],
                         scale=3,
                     )
-                    gr.Textbox(
+                    about_cores_used = gr.Textbox(
                         value=f"{sinfo.get('thread_cap', '?')}/{sinfo.get('logical_cores', '?')}",
                         label="Cores Used / Total",
                         interactive=False,
@@ -1143,6 +1508,15 @@ A x264vfw screen recording tool for Windows ~8.1-10 by [WiseMan-TimeLord](https:
                         scale=2,
                     )
 
+                with gr.Row():
+                    about_core_layout = gr.Textbox(
+                        value=sinfo.get("core_layout", "unknown"),
+                        label="CPU Affinity (cores)",
+                        interactive=False,
+                        max_lines=1,
+                        elem_classes=["info-box"],
+                    )
+
                 with gr.Row():
                     gr.Textbox(
                         value=sinfo.get("python_version", "?"),
@@ -1175,6 +1549,94 @@ A x264vfw screen recording tool for Windows ~8.1-10 by [WiseMan-TimeLord](https:
                         elem_classes=["info-box"],
                     )
 
+                # --- Pipeline telemetry ----------------------------------
+                gr.Markdown("Pipeline Telemetry (ms)", elem_classes=["cfg-section-label"])
+
+                with gr.Row():
+                    about_telemetry = gr.Textbox(
+                        value=_fmt_telemetry(recorder.get_pipeline_telemetry(),
+                                             recorder.get_reader_stats()),
+                        label="Stage latency p50 / p95 / p99 (current or last recording)",
+                        interactive=False,
+                        lines=9,
+                        max_lines=12,
+                        elem_classes=["info-box"],
+                    )
+
+                with gr.Row():
+                    about_tel_btn = gr.Button(
+                        "\U0001F504  Refresh Telemetry",
+                        variant="secondary",
+                    )
+
+                about_tel_btn.click(
+                    fn=lambda: _fmt_telemetry(recorder.get_pipeline_telemetry(),
+                                              recorder.get_reader_stats()),
+                    outputs=[about_telemetry],
+                )
+
+                # Thread budget and core layout change at every Start; re-read
+                # them whenever the tab is opened or refreshed.
+                def _refresh_cores():
+                    si = utilities.get_system_info()
+                    return (f"{si.get('thread_cap', '?')}/{si.get('logical_cores', '?')}",
+                            si.get("core_layout", "unknown"))
+
+                about_tab.select(
+                    fn=_refresh_cores,
+                    outputs=[about_cores_used, about_core_layout],
+                )
+                about_tel_btn.click(
+                    fn=_refresh_cores,
+                    outputs=[about_cores_used, about_core_layout],
+                )
+
+                # --- Segment performance sidecars --------------------------
+                gr.Markdown("Segment Performance", elem_classes=["cfg-section-label"])
+
+                def _perf_choices():
+                    out = config.get("output_path", utilities.DEFAULT_OUTPUT)
+                    return [(p["name"], p["path"])
+                            for p in utilities.list_perf_sidecars(out)]
+
+                with gr.Row():
+                    about_perf_pick = gr.Dropdown(
+                        choices=_perf_choices(),
+                        label="Recording",
+                        scale=4,
+                    )
+                    about_perf_list_btn = gr.Button(
+                        "\U0001F504  Refresh List",
+                        variant="secondary",
+                        scale=1,
+                    )
+                    about_perf_view_btn = gr.Button(
+                        "View",
+                        variant="secondary",
+                        scale=1,
+                    )
+
+                with gr.Row():
+                    about_perf = gr.Textbox(
+                        value=_fmt_perf_timeline(None),
+                        label="Drops / queue / pacing / bitrate over time",
+                        interactive=False,
+                        lines=12,
+                        max_lines=40,
+                        elem_classes=["info-box"],
+                    )
+
+                about_perf_list_btn.click(
+                    fn=lambda: gr.update(choices=_perf_choices()),
+                    outputs=[about_perf_pick],
+                )
+                about_perf_view_btn.click(
+                    fn=lambda path: _fmt_perf_timeline(
+                        utilities.load_perf_sidecar(path) if path else None),
+                    inputs=[about_perf_pick],
+                    outputs=[about_perf],
+                )
+
                 # --- About tab status / exit bar --------------------------
                 with gr.Row():
                     about_status = gr.Textbox(
@@ -0,0 +1,170 @@
+# scripts/ffmpeg_log.py
+# Incremental consumers for an ffmpeg process's stderr.
+#
+# The recorder's ffmpeg processes run with `-nostats -progress pipe:2`, so
+# their stderr carries machine-readable key=value progress blocks mixed in
+# with ordinary log lines.  The stderr drainer threads feed each chunk they
+# read to a Progress, which keeps the latest parsed report and hands the log
+# text on to a LogRing: constant memory however long the process runs, with
+# the tail and any warning / error lines kept for error reporting.
+# Stdlib only.
+
+import re
+import time
+
+# Keys ffmpeg writes in a -progress block (plus per-stream stream_N_M_q).
+_PROGRESS_KEYS = frozenset((
+    b"frame", b"fps", b"bitrate", b"total_size", b"out_time_us", b"out_time_ms",
+    b"out_time", b"dup_frames", b"drop_frames", b"speed", b"progress",
+))
+_MAX_PARTIAL   = 64 * 1024    # an unterminated "line" longer than this is log text
+
+# Log lines worth keeping beyond the tail (matched per complete line).
+_DIAG_RE       = re.compile(rb"^.*\b(?:error|warning|invalid|failed|corrupt\w*|"
+                            rb"non-existing|missing|overflow|underflow)\b.*$",
+                            re.IGNORECASE | re.MULTILINE)
+_DIAG_LINE_MAX = 300          # bytes kept per diagnostic line
+
+
+def _number(text: str, suffix: str = "", kind=float):
+    """ffmpeg progress value -> number; None for "N/A" or anything unparsable."""
+    text = text.strip()
+    if suffix and text.endswith(suffix):
+        text = text[:-len(suffix)]
+    try:
+        return kind(text)
+    except ValueError:
+        return None
+
+
+class Progress:
+    """
+    Parses -progress output out of an ffmpeg stderr stream, chunk by chunk.
+
+    feed() splits on newlines (a partial line is carried to the next chunk),
+    collects progress keys into the current block and, on the block's final
+    `progress=` line, publishes it as `latest`:
+
+        {"frame", "fps", "bitrate_kbps", "size_bytes", "out_time_s",
+         "dup_frames", "drop_frames", "speed", "ended", "t"}
+
+    Values ffmpeg reports as N/A are None; "t" is the perf_counter() time
+    of the report.  `latest` is replaced as a whole dict, so other threads
+    can read it without a lock.  Every other line is returned by feed() as
+    log text.
+    """
+
+    def __init__(self):
+        self.latest   = None
+        self.reports  = 0
+        self._block   = {}
+        self._partial = b""
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Consume one stderr chunk; returns its non-progress (log) bytes."""
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        if len(self._partial) > _MAX_PARTIAL:
+            lines.append(self._partial)
+            self._partial = b""
+        log = []
+        for line in lines:
+            key, sep, value = line.rstrip(b"\r").partition(b"=")
+            if sep and (key in _PROGRESS_KEYS or key.startswith(b"stream_")):
+                self._block[key] = value.decode("ascii", "replace")
+                if key == b"progress":
+                    self._publish()
+            else:
+                log.append(line + b"\n")
+        return b"".join(log)
+
+    def flush(self) -> bytes:
+        """At EOF: the unterminated last line, if any, as log bytes."""
+        tail, self._partial = self._partial, b""
+        return tail
+
+    def _publish(self) -> None:
+        b = self._block
+        self._block = {}
+        us = _number(b.get(b"out_time_us", ""), kind=int)
+        self.latest = {
+            "frame":        _number(b.get(b"frame", ""), kind=int),
+            "fps":          _number(b.get(b"fps", "")),
+            "bitrate_kbps": _number(b.get(b"bitrate", ""), "kbits/s"),
+            "size_bytes":   _number(b.get(b"total_size", ""), kind=int),
+            "out_time_s":   us / 1e6 if us is not None and us >= 0 else None,
+            "dup_frames":   _number(b.get(b"dup_frames", ""), kind=int),
+            "drop_frames":  _number(b.get(b"drop_frames", ""), kind=int),
+            "speed":        _number(b.get(b"speed", ""), "x"),
+            "ended":        b.get(b"progress") == "end",
+            "t":            time.perf_counter(),
+        }
+        self.reports += 1
+
+
+class LogRing:
+    """
+    Fixed-size keeper for an ffmpeg log stream.
+
+    write() copies each chunk into a preallocated `size`-byte ring, so only
+    the most recent bytes are held, and matches complete lines against
+    _DIAG_RE as they go past; the first `max_lines` matches are kept (the
+    first error is usually the cause, the tail shows the end).  Memory is
+    bounded by size + max_lines * _DIAG_LINE_MAX whatever the run length.
+    One writer thread; text() is called after it has finished.
+    """
+
+    def __init__(self, size: int = 8192, max_lines: int = 32):
+        self._buf       = bytearray(size)
+        self._pos       = 0
+        self._full      = False
+        self._carry     = b""        # unterminated line (for matching only)
+        self._max_lines = max_lines
+        self.lines      = []         # matched diagnostic lines (bytes)
+        self.matched    = 0          # all matches, including ones not kept
+        self.total      = 0          # bytes written
+
+    def write(self, data: bytes) -> None:
+        n = len(data)
+        if not n:
+            return
+        self.total += n
+        buf, size, pos = self._buf, len(self._buf), self._pos
+        if n >= size:
+            buf[:] = data[-size:]
+            self._pos, self._full = 0, True
+        else:
+            end = pos + n
+            if end <= size:
+                buf[pos:end] = data
+            else:
+                k = size - pos
+                buf[pos:] = data[:k]
+                buf[:n - k] = data[k:]
+            self._pos   = end % size
+            self._full |= end >= size
+
+        text = self._carry + data
+        cut  = text.rfind(b"\n") + 1
+        self._carry = text[cut:][-_DIAG_LINE_MAX:]
+        if cut:
+            for m in _DIAG_RE.finditer(text, 0, cut):
+                self.matched += 1
+                if len(self.lines) < self._max_lines:
+                    self.lines.append(m.group().rstrip(b"\r")[:_DIAG_LINE_MAX])
+
+    def tail(self) -> bytes:
+        """The most recent bytes (up to the ring size), oldest first."""
+        if not self._full:
+            return bytes(self._buf[:self._pos])
+        return bytes(self._buf[self._pos:] + self._buf[:self._pos])
+
+    def text(self, limit: int = 2000) -> str:
+        """Kept diagnostic lines, then the last `limit` bytes, as text."""
+        out = b""
+        if self.lines:
+            more = self.matched - len(self.lines)
+            out  = (b"\n".join(self.lines)
+                    + (f"\n... {more} more warning/error line(s)".encode() if more else b"")
+                    + b"\n--- log tail ---\n")
+        return (out + self.tail()[-limit:]).decode(errors="replace")
@@ -0,0 +1,160 @@
+# scripts/h264_index.py
+# Incremental Annex B (raw H.264) scanner: frame offsets + keyframe index.
+#
+# The capture encoder writes a raw H.264 elementary stream (-f h264) that is
+# buffered as opaque chunks.  NalIndex is fed the same chunks as they arrive
+# and records, per access unit (frame), the stream offset at which it begins
+# and whether it is an IDR.  Offsets are absolute stream positions, so they
+# stay valid whether the bytes live in RAM, in a spill file or in a ring.
+#
+# Pure Python / stdlib only (no capture dependencies) so it can be
+# benchmarked on its own: see benchmarks/bench_nal_index.py.
+
+import re
+from array import array
+
+# NAL unit types (ITU-T H.264 Table 7-1) used for frame boundaries.
+NAL_SLICE     = 1    # non-IDR coded slice
+NAL_IDR       = 5    # IDR coded slice
+NAL_SEI       = 6
+NAL_SPS       = 7
+NAL_PPS       = 8
+NAL_AUD       = 9    # access unit delimiter
+
+_START_RE     = re.compile(b"\x00\x00\x01")   # works on any buffer, no copy
+_PREFIX_NALS  = (NAL_SEI, NAL_SPS, NAL_PPS, NAL_AUD)   # may precede a frame's first slice
+
+
+class NalIndex:
+    """
+    Compact, array-backed index of frame start offsets and keyframes.
+
+    feed() scans each chunk for 00 00 01 start codes with a compiled
+    pattern, which searches memoryviews in place; only the 1-2 header bytes
+    after each start code are inspected, so the cost is one C-level pass
+    plus a few Python operations per NAL.  A frame starts at its first
+    slice with first_mb_in_slice == 0 (the leading ue(v) bit is 1), or at
+    the SEI/SPS/PPS/AUD run directly in front of it, so sliced-thread
+    output (several slices per frame) is counted once per frame.
+
+    Storage is two array.array columns: 8 bytes per frame for the offset,
+    4 bytes per keyframe.  trim_before() drops entries older than a frame
+    so a ring can keep the index as bounded as its data.
+    """
+
+    def __init__(self):
+        self.offsets   = array("Q")   # stream offset of each frame
+        self.keyframes = array("I")   # absolute frame numbers of IDR frames
+        self.base      = 0            # absolute frame number of offsets[0]
+        self.size      = 0            # stream bytes fed so far
+        self._carry    = b""          # tail of the last chunk (split start codes)
+        self._before   = b""          # the byte in front of _carry
+        self._pending  = None         # offset of a prefix-NAL run before a slice
+
+    # ---- feeding -----------------------------------------------------------
+    def feed(self, data) -> int:
+        """
+        Index one chunk (bytes, bytearray or memoryview; it is not copied);
+        returns the number of new frames found in it.
+        """
+        n     = len(data)
+        found = 0
+        carry = self._carry
+        if n < 8:
+            # Tiny chunk: just fold it into the carry and rescan that.
+            scan   = carry + bytes(data)
+            found  = self._scan(scan, self.size - len(carry), 0, len(scan) - 4,
+                                self._before)
+            tail   = self._before + scan
+            self._before, self._carry = tail[-5:-4], scan[-4:]
+            self.size += n
+            return found
+
+        if carry:
+            # Start codes straddling the boundary begin inside the carry.
+            head   = carry + bytes(data[:4])
+            found += self._scan(head, self.size - len(carry), 0, len(carry),
+                                self._before)
+        found += self._scan(data, self.size, 0, n - 4, carry[-1:])
+
+        # Keep the last 4 bytes: enough to re-see a start code whose header
+        # bytes have not arrived yet, too few to re-see one already handled.
+        # The byte before them tells whether such a code has a 4-byte prefix.
+        self._before = bytes(data[-5:-4])
+        self._carry  = bytes(data[-4:])
+        self.size   += n
+        return found
+
+    def _scan(self, buf, base: int, lo: int, hi: int, before: bytes) -> int:
+        """Handle start codes beginning at buf[lo:hi]; `before` is the byte preceding buf."""
+        found = 0
+        for m in _START_RE.finditer(buf, lo):
+            i = m.start()
+            if i >= hi:
+                break
+            nal_type = buf[i + 3] & 0x1F
+            zero     = (buf[i - 1] == 0) if i else (before == b"\x00")
+            start    = base + i - (1 if zero else 0)
+            if nal_type == NAL_SLICE or nal_type == NAL_IDR:
+                if buf[i + 4] & 0x80:            # first_mb_in_slice == 0
+                    pending = self._pending
+                    self.offsets.append(start if pending is None else pending)
+                    if nal_type == NAL_IDR:
+                        self.keyframes.append(self.base + len(self.offsets) - 1)
+                    found += 1
+                self._pending = None
+            elif nal_type in _PREFIX_NALS:
+                if self._pending is None:
+                    self._pending = start
+        return found
+
+    # ---- queries -------------------------------------------------------------
+    @property
+    def frame_count(self) -> int:
+        """Frames indexed so far (absolute, including trimmed ones)."""
+        return self.base + len(self.offsets)
+
+    def offset_of(self, frame: int) -> int:
+        """Stream offset at which absolute frame number `frame` begins."""
+        return self.offsets[frame - self.base]
+
+    def keyframe_at_or_before(self, frame: int) -> int | None:
+        """Nearest IDR frame number <= frame (None if there is none indexed)."""
+        kf = self.keyframes
+        lo, hi = 0, len(kf)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if kf[mid] <= frame:
+                lo = mid + 1
+            else:
+                hi = mid
+        return kf[lo - 1] if lo else None
+
+    def frame_at_time(self, t: float, fps: float) -> int:
+        """Frame number shown at t seconds into the stream (frame-counted timeline)."""
+        return min(max(int(t * fps), 0), max(self.frame_count - 1, 0))
+
+    def keyframe_offset_for_time(self, t: float, fps: float) -> tuple | None:
+        """(frame, offset) of the last IDR at or before t seconds, or None."""
+        kf = self.keyframe_at_or_before(self.frame_at_time(t, fps))
+        if kf is None or kf < self.base:
+            return None
+        return kf, self.offset_of(kf)
+
+    # ---- bounding --------------------------------------------------------------
+    def trim_before(self, frame: int) -> None:
+        """Forget frames (and keyframes) older than absolute frame number `frame`."""
+        drop = min(max(frame - self.base, 0), len(self.offsets))
+        if drop:
+            del self.offsets[:drop]
+            self.base += drop
+        k = 0
+        while k < len(self.keyframes) and self.keyframes[k] < self.base:
+            k += 1
+        if k:
+            del self.keyframes[:k]
+
+    def nbytes(self) -> int:
+        """Memory held by the index arrays."""
+        return (len(self.offsets) * self.offsets.itemsize
+                + len(self.keyframes) * self.keyframes.itemsize)
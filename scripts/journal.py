@@ -0,0 +1,88 @@
+# scripts/journal.py
+# Small persistent job journal (a JSON file under .\data\) that survives
+# restarts.  Used for work that is queued now and finished later, possibly
+# by the next run of the program.
+
+import json
+import os
+import threading
+import time
+
+
+class Journal:
+    """
+    Ordered list of job dicts persisted to one JSON file.
+
+    Every change rewrites the file through a temp file + os.replace(), so a
+    crash or power cut leaves either the previous or the new list on disk,
+    never a torn one.  Jobs are plain dicts; add() assigns the "id" key and
+    callers own every other field.  All methods are thread-safe.
+    """
+
+    def __init__(self, path: str):
+        self.path  = path
+        self._lock = threading.Lock()
+        self._jobs = self._load()
+
+    # ---- persistence -------------------------------------------------------
+    def _load(self) -> list:
+        try:
+            with open(self.path, "r") as f:
+                jobs = json.load(f)
+            if isinstance(jobs, list):
+                return [j for j in jobs if isinstance(j, dict) and "id" in j]
+            raise ValueError("not a job list")
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            # Keep the unreadable file for inspection and start empty.
+            print(f"WARNING: job journal {self.path} unreadable ({e}); starting empty.")
+            try:
+                os.replace(self.path, self.path + ".bad")
+            except OSError:
+                pass
+            return []
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._jobs, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    # ---- jobs ----------------------------------------------------------------
+    def add(self, job: dict) -> str:
+        """Append a job and persist it; returns its id."""
+        with self._lock:
+            job = dict(job)
+            job["id"] = f"{time.time():.6f}-{len(self._jobs)}"
+            self._jobs.append(job)
+            self._save()
+            return job["id"]
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            for job in self._jobs:
+                if job["id"] == job_id:
+                    job.update(fields)
+                    self._save()
+                    return
+
+    def remove(self, job_id: str) -> None:
+        with self._lock:
+            kept = [j for j in self._jobs if j["id"] != job_id]
+            if len(kept) != len(self._jobs):
+                self._jobs = kept
+                self._save()
+
+    def jobs(self, **match) -> list:
+        """Copies of the jobs (oldest first) whose fields equal `match`."""
+        with self._lock:
+            return [dict(j) for j in self._jobs
+                    if all(j.get(k) == v for k, v in match.items())]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
@@ -0,0 +1,174 @@
+# scripts/metrics.py
+# Counters and gauges for external monitoring, served as Prometheus text.
+#
+# The recorder owns one Registry.  Counters are bumped from the thread that
+# owns the event (the grab loop, an audio capture thread, a mux worker) with
+# a plain attribute add, and gauges are either set the same way or computed
+# by a callback when scraped; nothing here takes a lock that the capture
+# threads also take.  serve() exposes the registry on a local-only HTTP
+# route (GET /metrics, text exposition format 0.0.4).
+# Stdlib only.
+
+import http.server
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _fmt_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    def esc(v) -> str:
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels) + "}"
+
+
+def _fmt_value(v) -> str:
+    if isinstance(v, bool):
+        return "1" if v else "0"
+    if isinstance(v, int):
+        return str(v)
+    return repr(float(v))
+
+
+class Counter:
+    """
+    Monotonic count.  inc() is a plain attribute add: call it from one
+    thread per counter (per label set), as the GIL makes the read safe
+    but not concurrent increments.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, n=1) -> None:
+        self.value += n
+
+
+class Gauge:
+    """Current value, either set() by its owner or read from `fn` at scrape."""
+
+    __slots__ = ("value", "fn")
+
+    def __init__(self, fn=None):
+        self.value = 0
+        self.fn    = fn
+
+    def set(self, v) -> None:
+        self.value = v
+
+    def read(self):
+        if self.fn is None:
+            return self.value
+        try:
+            return self.fn()
+        except Exception:
+            return None           # source gone mid-scrape: omit the sample
+
+
+class Summary:
+    """
+    Count and sum of observed durations.  Several threads may
+    observe(); they serialise on a private lock, never on a scrape.
+    """
+
+    __slots__ = ("count", "sum", "_lock")
+
+    def __init__(self):
+        self.count = 0
+        self.sum   = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, v: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum   += v
+
+
+class Registry:
+    """
+    Named metric families.  counter() / gauge() / summary() return the
+    metric for a (name, labels) pair, creating it on first use (hold on to
+    it in hot loops).  render() produces the text exposition of all of them.
+    """
+
+    def __init__(self, prefix: str = ""):
+        self.prefix    = prefix
+        self._lock     = threading.Lock()    # registration only
+        self._families = {}                  # name -> [type, help, {labels: metric}]
+
+    def _get(self, kind: str, cls, name: str, help_text: str, labels: dict, *args):
+        key = tuple(sorted(labels.items()))
+        fam = self._families.get(name)
+        if fam is not None:
+            metric = fam[2].get(key)
+            if metric is not None:
+                return metric
+        with self._lock:
+            fam = self._families.setdefault(name, [kind, help_text, {}])
+            return fam[2].setdefault(key, cls(*args))
+
+    def counter(self, name: str, help_text: str, **labels) -> Counter:
+        return self._get("counter", Counter, name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str, fn=None, **labels) -> Gauge:
+        return self._get("gauge", Gauge, name, help_text, labels, fn)
+
+    def summary(self, name: str, help_text: str, **labels) -> Summary:
+        return self._get("summary", Summary, name, help_text, labels)
+
+    def render(self) -> str:
+        with self._lock:
+            families = [(n, f[0], f[1], list(f[2].items()))
+                        for n, f in self._families.items()]
+        out = []
+        for name, kind, help_text, metrics in families:
+            full = self.prefix + name
+            out.append(f"# HELP {full} {help_text}")
+            out.append(f"# TYPE {full} {kind}")
+            for labels, m in metrics:
+                lbl = _fmt_labels(labels)
+                if kind == "summary":
+                    out.append(f"{full}_count{lbl} {m.count}")
+                    out.append(f"{full}_sum{lbl} {_fmt_value(m.sum)}")
+                    continue
+                v = m.read() if kind == "gauge" else m.value
+                if v is not None:
+                    out.append(f"{full}{lbl} {_fmt_value(v)}")
+        out.append("")
+        return "\n".join(out)
+
+
+def serve(registry: Registry, host: str, port: int):
+    """
+    Serve GET /metrics for `registry` on host:port from a daemon thread.
+    Returns the server (call shutdown() to stop), or None if the port
+    could not be bound.
+    """
+
+    class _Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            pass                     # scrapes every few seconds: keep the console quiet
+
+    try:
+        server = http.server.ThreadingHTTPServer((host, port), _Handler)
+    except OSError as e:
+        print(f"WARNING: metrics endpoint not started on {host}:{port} ({e})")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True,
+                     name="metrics-http").start()
+    return server
@@ -0,0 +1,320 @@
+# scripts/profiling.py
+# Opt-in profiling of the recorder threads (launcher.py --profile).
+#
+# Two recordings, both written under PROFILE_DIR\<launch time>\:
+#   - A sampling profile, per thread.  Every recorder thread target is
+#     wrapped by recorder._pinned(), which goes through profiled(); threads
+#     whose name starts with one of THREADS register themselves, and one
+#     sampler thread reads their stacks (sys._current_frames()) every
+#     SAMPLE_INTERVAL_S, keyed by thread ident.  When a registered thread
+#     exits it writes <thread>.txt (functions by share of samples, total and
+#     self) and <thread>.folded (collapsed stacks for flamegraph.pl /
+#     speedscope).  Samples are wall-clock: time blocked in a queue or a
+#     pipe write shows up where the thread waits.  cProfile is not used: on
+#     Python 3.12 it sits on the process-wide sys.monitoring, so only one
+#     thread could have a profile and that profile mixed every thread.
+#   - A Chrome trace-event timeline, trace.json (chrome://tracing or
+#     ui.perfetto.dev).  The telemetry histograms of the pipeline stages
+#     (grab, convert, queue_wait, pipe_write, encoder_read, buffer_write,
+#     audio_read) add one span per sample through a TraceLog channel, and
+#     mux jobs add one span each.  At every Stop (on a background thread)
+#     and at exit only the spans added since the last write are appended;
+#     the file uses the JSON array format, whose closing ']' is optional,
+#     so it is valid after every append.
+#
+# Overhead: each sample walks the stacks of the registered threads (a few
+# microseconds per thread) while holding the GIL, so at 200 Hz with the
+# half-dozen pipeline threads the sampler costs well under 1% of one core
+# and does not add per-call cost to the profiled code.  A trace span costs
+# about 1 us.  Trace memory is bounded by TRACE_MAX_EVENTS per stage (~24
+# bytes per event, ~2.3 h per stage at 60 fps); later spans are counted,
+# not kept.  The encoders are separate ffmpeg processes and are not
+# profiled.  Stdlib only.
+
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+
+THREADS           = ("capture-loop", "pipe-s", "stdout-s", "audio-", "mux")
+SAMPLE_INTERVAL_S = 0.005         # stack sampling period (200 Hz)
+TRACE_MAX_EVENTS  = 500_000       # per trace channel
+_TOP_FUNCTIONS    = 40            # rows in each <thread>.txt summary
+
+_out_dir     = None               # session output folder; None = profiling off
+_trace       = None               # TraceLog of this launch
+_names       = {}                 # thread ident -> name (for the trace)
+_names_lock  = threading.Lock()
+_profiles    = {}                 # thread ident -> _ThreadProfile being sampled
+_prof_lock   = threading.Lock()
+_write_lock  = threading.Lock()   # one trace.json append at a time
+
+
+# ===========================================================================
+# Trace timeline
+# ===========================================================================
+class _TraceChannel:
+    """Spans of one stage; one writer thread at a time, no lock."""
+
+    __slots__ = ("name", "t0", "t1", "tid", "lost")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.t0   = array("d")
+        self.t1   = array("d")
+        self.tid  = array("q")
+        self.lost = 0
+
+    def add(self, t0: float, t1: float) -> None:
+        if len(self.t0) >= TRACE_MAX_EVENTS:
+            self.lost += 1
+            return
+        self.t0.append(t0)
+        self.t1.append(t1)
+        self.tid.append(threading.get_ident())
+
+
+class TraceLog:
+    """
+    Named channels of (start, end, thread) spans in perf_counter seconds.
+    channel(name) returns the same channel for the same name for the whole
+    launch, so sessions accumulate; span() may be called from any thread.
+    append_to() writes the spans not yet written; call it under _write_lock.
+    """
+
+    def __init__(self):
+        self.t0        = time.perf_counter()
+        self._lock     = threading.Lock()
+        self._channels = {}
+        self._done     = {}          # channel name -> spans already written
+        self._named    = set()       # tids with a thread_name event written
+        self._out      = 0           # events written; 0 = file not started
+
+    def channel(self, name: str) -> _TraceChannel:
+        ch = self._channels.get(name)
+        if ch is None:
+            with self._lock:
+                ch = self._channels.setdefault(name, _TraceChannel(name))
+        return ch
+
+    def span(self, name: str, t0: float, t1: float) -> None:
+        ch = self.channel(name)
+        with self._lock:
+            ch.add(t0, t1)
+
+    def append_to(self, path: str) -> int:
+        """
+        Append the spans added since the last call (plus thread-name
+        metadata for new threads and a spans_not_kept counter) to path as
+        Chrome trace events, formatted and written one at a time.  Returns
+        the number of spans written.
+        """
+        with self._lock:
+            channels = list(self._channels.values())
+            lost     = {ch.name: ch.lost for ch in channels if ch.lost}
+        base, pid = self.t0, os.getpid()
+        names     = None
+        written   = 0
+        with open(path, "a" if self._out else "w") as f:
+            if not self._out:
+                f.write("[")
+
+            def _put(event: str) -> None:
+                f.write(",\n" if self._out else "\n")
+                f.write(event)
+                self._out += 1
+
+            for ch in channels:
+                start = self._done.get(ch.name, 0)
+                n     = min(len(ch.t0), len(ch.t1), len(ch.tid))
+                label = json.dumps(ch.name)
+                for i in range(start, n):
+                    tid = ch.tid[i]
+                    if tid not in self._named:
+                        if names is None:
+                            names = {t.ident: t.name for t in threading.enumerate()}
+                            with _names_lock:
+                                names.update(_names)
+                        self._named.add(tid)
+                        _put(f'{{"name":"thread_name","ph":"M","pid":{pid},"tid":{tid},'
+                             f'"args":{{"name":{json.dumps(names.get(tid, f"thread-{tid}"))}}}}}')
+                    t0 = ch.t0[i]
+                    _put(f'{{"name":{label},"ph":"X","pid":{pid},"tid":{tid},'
+                         f'"ts":{(t0 - base) * 1e6:.1f},"dur":{(ch.t1[i] - t0) * 1e6:.1f}}}')
+                self._done[ch.name] = n
+                written += n - start
+            if lost:
+                _put(f'{{"name":"spans_not_kept","ph":"C","pid":{pid},"tid":0,'
+                     f'"ts":{(time.perf_counter() - base) * 1e6:.1f},'
+                     f'"args":{json.dumps(lost)}}}')
+        return written
+
+    def lost(self) -> dict:
+        with self._lock:
+            return {ch.name: ch.lost for ch in self._channels.values() if ch.lost}
+
+
+# ===========================================================================
+# Session control
+# ===========================================================================
+def enable(root: str) -> str:
+    """Turn profiling on for this launch; returns the output folder."""
+    global _out_dir, _trace
+    _out_dir = os.path.join(root, time.strftime("%Y%m%d_%H%M%S"))
+    os.makedirs(_out_dir, exist_ok=True)
+    _trace = TraceLog()
+    threading.Thread(target=_sample_loop, daemon=True, name="profile-sampler").start()
+    return _out_dir
+
+
+def enabled() -> bool:
+    return _out_dir is not None
+
+
+def trace_log() -> TraceLog | None:
+    """The launch's TraceLog (attach to telemetry.Telemetry), or None."""
+    return _trace
+
+
+def span(name: str, t0: float, t1: float) -> None:
+    """Add a timeline span from any thread (no-op when profiling is off)."""
+    if _trace is not None:
+        _trace.span(name, t0, t1)
+
+
+def _append_trace(path: str) -> None:
+    with _write_lock:
+        try:
+            _trace.append_to(path)
+        except OSError as e:
+            print(f"WARNING: could not write profile trace {path}: {e}")
+
+
+def write_trace(background: bool = False) -> str | None:
+    """
+    Append the spans recorded since the last call to trace.json; returns
+    its path.  background=True (used at Stop) does the writing on its own
+    thread; calls are serialised, so a later foreground call (at exit)
+    waits for it.
+    """
+    if _trace is None:
+        return None
+    path = os.path.join(_out_dir, "trace.json")
+    if background:
+        threading.Thread(target=_append_trace, args=(path,), daemon=True,
+                         name="profile-trace").start()
+    else:
+        _append_trace(path)
+    return path
+
+
+# ===========================================================================
+# Per-thread stack sampling
+# ===========================================================================
+class _ThreadProfile:
+    """Stack samples of one thread: {stack (innermost code first): count}."""
+
+    __slots__ = ("name", "stacks", "samples", "t0", "t1")
+
+    def __init__(self, name: str):
+        self.name    = name
+        self.stacks  = {}
+        self.samples = 0
+        self.t0      = time.perf_counter()
+        self.t1      = None
+
+    def summary(self) -> str:
+        """Top functions by share of samples on the stack (total) and on top (self)."""
+        total, own = {}, {}
+        for stack, n in self.stacks.items():
+            own[stack[0]] = own.get(stack[0], 0) + n
+            for code in set(stack):
+                total[code] = total.get(code, 0) + n
+        wall  = (self.t1 or time.perf_counter()) - self.t0
+        n     = max(1, self.samples)
+        lines = [f"{self.name}: {self.samples} samples over {wall:.1f} s "
+                 f"(every {SAMPLE_INTERVAL_S * 1000:.0f} ms, wall clock)",
+                 "",
+                 f"{'total %':>8} {'self %':>8}  function"]
+        for code in sorted(total, key=lambda c: (-total[c], -own.get(c, 0)))[:_TOP_FUNCTIONS]:
+            lines.append(f"{total[code] * 100 / n:8.1f} {own.get(code, 0) * 100 / n:8.1f}  "
+                         f"{_label(code)}")
+        return "\n".join(lines) + "\n"
+
+    def folded(self) -> str:
+        """Collapsed stacks, root first: "a;b;c <count>" per line."""
+        return "".join(";".join(_label(c) for c in reversed(stack)) + f" {n}\n"
+                       for stack, n in sorted(self.stacks.items(), key=lambda kv: -kv[1]))
+
+
+def _label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _sample_loop() -> None:
+    """Sampler thread: every SAMPLE_INTERVAL_S, record each registered thread's stack."""
+    while True:
+        time.sleep(SAMPLE_INTERVAL_S)
+        frames = sys._current_frames()
+        with _prof_lock:
+            for ident, prof in _profiles.items():
+                f = frames.get(ident)
+                if f is None:
+                    continue
+                stack = []
+                while f is not None:
+                    stack.append(f.f_code)
+                    f = f.f_back
+                key = tuple(stack)
+                prof.stacks[key] = prof.stacks.get(key, 0) + 1
+                prof.samples += 1
+        del frames
+
+
+def _unique_path(stem: str) -> str:
+    path, n = stem, 1
+    while os.path.exists(path + ".txt"):
+        n   += 1
+        path = f"{stem}-{n}"
+    return path
+
+
+def _dump(prof: _ThreadProfile) -> None:
+    stem = _unique_path(os.path.join(_out_dir, prof.name))
+    try:
+        with open(stem + ".txt", "w") as f:
+            f.write(prof.summary())
+        with open(stem + ".folded", "w") as f:
+            f.write(prof.folded())
+    except OSError as e:
+        print(f"WARNING: could not write profile for {prof.name}: {e}")
+
+
+def profiled(fn):
+    """
+    Wrap a thread target: when profiling is on and the running thread's
+    name starts with one of THREADS, register it with the sampler and save
+    its profile when it returns.  Otherwise calls fn directly.
+    """
+    def _run(*args, **kwargs):
+        if _out_dir is None:
+            return fn(*args, **kwargs)
+        me    = threading.current_thread()
+        ident = threading.get_ident()
+        with _names_lock:
+            _names[ident] = me.name
+        if not me.name.startswith(THREADS):
+            return fn(*args, **kwargs)
+        prof = _ThreadProfile(me.name)
+        with _prof_lock:
+            _profiles[ident] = prof
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with _prof_lock:
+                del _profiles[ident]
+            prof.t1 = time.perf_counter()
+            _dump(prof)
+    return _run
@@ -1,14 +1,15 @@
 # scripts/recorder.py
 # Video : mss (DXGI Desktop Duplication) -> ffmpeg libx264 (H.264) via stdin pipe
 # Audio : pyaudiowpatch WASAPI loopback (system out) + mic (system in)
-#         both captured in parallel threads -> WAV written incrementally (streaming)
+#         both captured in parallel threads -> WAV written incrementally (streaming);
+#         streams stay open for the session and are cut per segment by sample count
 # Final : ffmpeg stream-copies the in-RAM H.264 + AAC audio -> .mkv / .mp4
 #
 # ============================================================================
 # PIPELINE OVERVIEW
 # ============================================================================
 #
-#  CAPTURE THREAD                        MUX THREAD  (ThreadPoolExecutor)
+#  CAPTURE THREAD                        MUX WORKERS (_MuxScheduler)
 #  ─────────────────────────────────     ──────────────────────────────────────
 #  mss grab → BGR24 bytes                (previous segment RAM buffer / spill)
 #      │                                     │
@@ -61,20 +62,30 @@
 # ============================================================================
 #
 # _thread_cap (25/50/75 % of logical cores from config) is applied to:
-#   - The real-time libx264 capture encoder
-#   - The mux-step AAC audio encoder / filter graph
+#   - The real-time libx264 capture encoder (less the editing proxy's share
+#     when a proxy rendition is enabled)
+#   - The mux-step AAC audio encoder / filter graph (on the mux share of the
+#     pinned cores, split across mux workers)
 # The remaining percentage is reserved for the OS and the game being recorded.
+# Mux ffmpeg processes also run at below-normal CPU and low I/O priority so
+# they yield to the live encoder of the next segment.
 
+import collections
 import concurrent.futures
 import ctypes
+import json
+import math
 import os
 import queue as _queue
+import re
 import shutil
 import subprocess
+import sys
 import tempfile
 import threading
 import time
 import wave
+from array import array
 
 import cv2
 import mss
@@ -82,6 +93,12 @@ import numpy as np
 import pyaudiowpatch as pyaudio
 
 import scripts.configure as configure
+import scripts.ffmpeg_log as ffmpeg_log
+import scripts.h264_index as h264_index
+import scripts.journal as journal
+import scripts.metrics as metrics
+import scripts.profiling as profiling
+import scripts.telemetry as telemetry
 
 # ===========================================================================
 # Module-level state
@@ -92,10 +109,42 @@ _pa                 = None       # PyAudio instance – kept alive for the sessi
 last_output_file    = None       # path of most-recently completed segment
 last_segment_count  = 0          # segments saved in the last session
 capture_start_time  = None       # time.time() when current capture started
+_capture_media_t0   = None       # media time (see _PauseClock) when capture started
 current_temp_video  = None       # "RAM" normally; spill path if buffer exceeded
 current_segment_num = 1          # 1-based segment counter (live)
-_segment_start_time = None       # time.time() when current segment started
+_segment_start_time = None       # media time (see _PauseClock) when current segment started
 _current_video_buf  = None       # Reference to current segment's video buffer (for RAM monitoring)
+_current_proxy      = None       # Live _ProxyEncoder of the current segment (for monitoring)
+_audio_session      = None       # Reference to the live _AudioSession (for monitoring)
+_replay_ring        = None       # Live _ReplayRing in replay mode (for save_replay)
+_replay_config      = None       # Config of the running replay session
+_replay_saving      = False      # a save_replay() mux is queued or running
+_last_stop_report   = None       # _StopCoordinator.run() result of the last segment
+_current_reader     = None       # _SlabReader of the live capture encoder (for metrics)
+_current_progress   = None       # ffmpeg_log.Progress of the live capture encoder
+_frame_bytes        = 0          # size of one queued raw frame (for memory accounting)
+_ram_budget         = 0          # current segment's max_ram_usage budget, bytes
+_mem_watch          = None       # _MemoryWatch of the running session
+_mux_progress: dict = {}         # mux output path -> (ffmpeg_log.Progress, duration s or None)
+_recompressor       = None       # _Recompressor (idle-time re-encode of fast captures)
+_telemetry          = telemetry.Telemetry()   # per-stage latency histograms (this session)
+_TELEMETRY_STAGES   = ("grab", "convert", "queue_wait", "pipe_write",
+                       "encoder_read", "buffer_write")   # display order; audio_read (<device>) follow
+
+# Process-lifetime counters for the local /metrics endpoint (see the
+# "Metrics endpoint" section).  Each counter has one writer thread.
+_metrics            = metrics.Registry("d264_")
+_m_frames           = _metrics.counter("frames_captured_total",
+                                       "Frames queued for the capture encoder.")
+_m_dropped          = _metrics.counter("frames_dropped_total",
+                                       "Frames dropped because the encoder queue was full.")
+_m_queue_depth      = _metrics.gauge("frame_queue_depth",
+                                     "Frames waiting for the capture encoder's stdin.")
+_m_segments         = _metrics.counter("segments_total", "Segments captured.")
+_m_mux_s            = _metrics.summary("mux_duration_seconds",
+                                       "Wall time of completed segment mux jobs.")
+_m_mux_failed       = _metrics.counter("mux_failures_total",
+                                       "Mux jobs that produced no output file.")
 
 # ---------------------------------------------------------------------------
 # Audio format
@@ -105,6 +154,102 @@ AUDIO_FORMAT = pyaudio.paInt16
 # AUDIO_CHUNK is set during init based on available RAM.
 AUDIO_CHUNK = 4096  # overridden by _detect_audio_chunk() at init
 
+# ---------------------------------------------------------------------------
+# Audio clock sync
+# ---------------------------------------------------------------------------
+# Each device runs on its own hardware clock; the video timeline is frame
+# count / fps paced by time.perf_counter().  Audio chunks are stamped with
+# the same clock so the true device rate can be measured and corrected at mux.
+_AUDIO_GAP_FILL_S   = 0.25   # device stall longer than this is filled with silence
+_AUDIO_SYNC_MIN_S   = 5.0    # need this much audio before trusting a rate estimate
+_AUDIO_DRIFT_MIN_PPM = 10.0  # below this the drift is inaudible over an hour
+_AUDIO_OFFSET_MIN_S = 0.010  # start offsets below 10 ms are left alone
+
+# ---------------------------------------------------------------------------
+# Audio write batching
+# ---------------------------------------------------------------------------
+# PCM is accumulated in RAM and written in blocks of this many seconds
+# (config "audio_flush_interval").  Longer = fewer writes competing with the
+# spill file on the temp disk; shorter = less audio lost if the app crashes.
+_AUDIO_FLUSH_DEFAULT = 1.0
+
+# ---------------------------------------------------------------------------
+# Audio level meters
+# ---------------------------------------------------------------------------
+# Peak / RMS are accumulated over every chunk but only published this often;
+# the GUI polls once a second, so a few updates per second is plenty.
+_LEVEL_UPDATE_INTERVAL = 0.25   # seconds
+_LEVEL_FULL_SCALE      = 32768.0  # paInt16
+
+# ---------------------------------------------------------------------------
+# Silence detection
+# ---------------------------------------------------------------------------
+# A chunk whose samples all stay within +/-_SILENCE_PEAK_MAX counts as
+# digitally silent: exact zeros, or the 1 LSB dither some drivers add.  Any
+# real signal, however quiet (room tone, a faint mic), is above it.  Each
+# WAV gets a sidecar map of its silent ranges; at mux a track that is silent
+# throughout is dropped, and if every track is, one is kept at a token
+# bitrate so the container still carries an audio stream.
+_SILENCE_PEAK_MAX    = 1       # LSB at 16-bit
+_SILENCE_MIN_RANGE_S = 1.0     # shorter silent runs are counted but not listed
+_SILENT_TRACK_KBPS   = 32
+
+# ---------------------------------------------------------------------------
+# Audio devices
+# ---------------------------------------------------------------------------
+# Probed device info is cached for the session.  Staleness is tracked per
+# device label: a stream error marks only its own device, an explicit
+# notify_audio_device_change() marks all of them, and the next segment
+# boundary re-probes (and re-opens) just the stale ones.  Labels double as
+# capture thread names (audio-lb, audio-mic).
+_audio_devices: dict | None = None
+_audio_devices_stale: set   = set()
+_AUDIO_FILE_PREFIX          = {"lb": "loopback", "mic": "mic"}
+
+# ---------------------------------------------------------------------------
+# Instant replay
+# ---------------------------------------------------------------------------
+# In replay mode (config "replay_mode") nothing is written while capturing:
+# the encoded stream lives in a keyframe-indexed RAM ring (_ReplayRing) and
+# each audio device in a PCM ring (_PcmRing), both holding the newest
+# "replay_seconds".  save_replay() muxes the current window to a file.
+# The encoder uses a fixed keyframe interval (eviction granularity) and a
+# VBV-capped bitrate so the ring's RAM is bounded by duration x bitrate.
+# A save shares the ring's finished GOPs instead of copying them, and only
+# one save runs at a time, so replay RAM peaks at two windows plus a GOP.
+_REPLAY_SECONDS_DEFAULT = 300
+_REPLAY_GOP_S           = 2      # seconds per GOP
+_REPLAY_BITS_PER_PIXEL  = 0.10   # maxrate = width x height x fps x this
+
+# ---------------------------------------------------------------------------
+# Editing proxy (config "proxy_height", 0 = off): a second, low-resolution
+# rendition encoded from the same grabbed frames by a low-priority libx264.
+# Frames are scaled once (INTER_AREA) in the proxy's writer thread.  Short
+# GOPs and no B-frames keep it cheap to seek and decode in an editor.  The
+# proxy's threads come out of the thread budget, not on top of it.
+_PROXY_GOP_S        = 0.5
+_PROXY_CRF          = "23"
+_PROXY_PRESET       = "veryfast"
+_PROXY_THREAD_SHARE = 4      # proxy encoder gets 1/N of _thread_cap
+_PROXY_QUEUE_DEPTH  = 8      # frames; a full queue drops proxy frames only
+_PROXY_RAM_SHARE    = 8      # proxy buffer cap = master buffer cap / N
+_PROXY_SUFFIX       = "_proxy"
+
+# ---------------------------------------------------------------------------
+# Fast capture (config "fast_capture") records lossless ultrafast segments;
+# each is then queued in a persistent journal for re-encoding to the selected
+# video profile.  Jobs run one at a time, only while nothing is being
+# recorded or muxed and system CPU has stayed low for a while; starting a
+# recording kills the running job, which restarts from scratch later.
+# The original is replaced only after the re-encode's duration matches it.
+_RECOMPRESS_JOURNAL     = os.path.join("data", "recompress_jobs.json")
+_RECOMPRESS_POLL_S      = 5.0
+_RECOMPRESS_IDLE_CPU    = 25.0   # system CPU % below which the machine is idle
+_RECOMPRESS_IDLE_S      = 60.0   # ... for this long before a job starts
+_RECOMPRESS_MAX_TRIES   = 3
+_RECOMPRESS_DURATION_TOL = 0.5   # seconds
+_RECOMPRESS_TMP_PREFIX  = ".d264_recompress_"   # not matched by list_videos()
+
 # ---------------------------------------------------------------------------
 # Segment duration
 # ---------------------------------------------------------------------------
@@ -119,6 +264,69 @@ SPLIT_DURATION = 3600.0  # seconds per segment (1 hour)
 # frames are dropped (with a warning) rather than RAM growing unbounded.
 _PIPE_QUEUE_DEPTH = 30  # frames
 
+# ---------------------------------------------------------------------------
+# Memory accounting
+# ---------------------------------------------------------------------------
+# Every large buffer the recorder owns is counted (see get_memory_accounting)
+# and sampled with the process RSS every _MEM_SAMPLE_S to give per-segment
+# high-water marks.  The RSS peak also uses the OS's own high-water mark
+# (peak_wset on Windows), so spikes shorter than a sample still count; the
+# GUI reads the last sample rather than sampling itself.  Object overheads:
+# a queued frame is one bytes object; each _VideoBuffer chunk is a
+# memoryview (or bytes) plus its list slot.
+_MEM_SAMPLE_S     = 1.0
+_FRAME_OBJ_BYTES  = sys.getsizeof(b"")
+_CHUNK_OBJ_BYTES  = sys.getsizeof(memoryview(b"")) + 8
+
+# ---------------------------------------------------------------------------
+# Encoder output reader
+# ---------------------------------------------------------------------------
+# ffmpeg's stdout is read with readinto1() straight into large preallocated
+# slabs (_SlabReader); the video buffer keeps memoryviews of them, so the
+# reader thread allocates one slab per _STDOUT_SLAB_SIZE of stream instead
+# of a new bytes object per read.  Views are handed on in chunks of about
+# _STDOUT_CHUNK_S of stream, sized from the measured bitrate.
+_STDOUT_SLAB_SIZE = 8 * 1024 * 1024
+_STDOUT_CHUNK_S   = 0.25
+_STDOUT_CHUNK_MIN = 64 * 1024
+_STDOUT_CHUNK_MAX = 1024 * 1024
+
+# ---------------------------------------------------------------------------
+# ffmpeg progress reports
+# ---------------------------------------------------------------------------
+# Capture and mux ffmpeg processes write key=value progress blocks to
+# stderr every _PROGRESS_PERIOD_S (instead of the human stats line); the
+# stderr drainers parse them with ffmpeg_log.Progress.
+_PROGRESS_PERIOD_S = 0.5
+_PROGRESS_ARGS     = ["-nostats", "-progress", "pipe:2",
+                      "-stats_period", str(_PROGRESS_PERIOD_S)]
+
+# Each ffmpeg's stderr log is kept in a fixed ffmpeg_log.LogRing of this
+# many bytes (its tail) plus its warning / error lines, printed on failure.
+_STDERR_RING_BYTES = 8 * 1024
+
+# ---------------------------------------------------------------------------
+# Per-segment performance sidecar  (<output>.perf.json, see _PerfTimeline)
+# ---------------------------------------------------------------------------
+# Drop timestamps and audio gap events are kept up to these counts per
+# segment (the totals are always exact).
+_PERF_MAX_DROPS     = 100_000
+_AUDIO_GAP_LOG_MAX  = 1000
+
+# ---------------------------------------------------------------------------
+# Segment stop deadline
+# ---------------------------------------------------------------------------
+# At the end of a segment every pipeline stage (pipe writer, encoder,
+# stdout / stderr readers, proxy, audio) is signalled at once and awaited in
+# parallel, each against its own deadline from that moment; a stage still
+# running at its deadline is killed, with a short grace period to unwind.
+# The encoder stages get the long budget: a slow preset with a deep
+# lookahead / frame-thread queue can take well over 30 s to flush, and
+# killing it loses the segment's tail.
+_STOP_DEADLINE_S         = 30.0     # audio and anything without its own
+_STOP_ENCODER_DEADLINE_S = 120.0    # master / proxy encoder and its readers
+_STOP_GRACE_S            = 5.0
+
 # ---------------------------------------------------------------------------
 # RAM buffer limits
 # ---------------------------------------------------------------------------
@@ -137,25 +345,66 @@ _thread_cap: int = max(1, int((os.cpu_count() or 2) * _THREAD_BUDGET_DEFAULT / 1
 # Mux pipeline ---------------------------------------------------------------
 pending_mux_count  = 0
 _pending_mux_lock  = threading.Lock()
-_mux_executor: concurrent.futures.ThreadPoolExecutor | None = None
+_mux_executor: "_MuxScheduler | None" = None
 _mux_futures: list[concurrent.futures.Future] = []
+_mux_scheduler: "_MuxScheduler | None" = None   # latest scheduler; kept for stats after shutdown
+
+# Every segment mux job is also recorded in a persistent journal, so Stop
+# returns as soon as the encoder has flushed (jobs finish in the background)
+# and Exit hands unfinished jobs to the next launch instead of waiting for
+# them or losing the in-RAM video: at handoff each job's buffer is written
+# to a .h264 file (or its spill file kept) and the journal entry updated.
+# A job's progress is tracked in a _MuxJob under _pending_mux_lock, so the
+# handoff persists only work that has not finished and a finished part is
+# never redone by the next launch.
+_MUX_JOURNAL   = os.path.join("data", "mux_jobs.json")
+_mux_journal: "journal.Journal | None" = None
+_mux_inflight: set = set()            # _MuxJob of every submitted, unfinished job
+_mux_procs: dict = {}                 # output path -> running mux ffmpeg process
+_mux_handoff   = threading.Event()    # set at exit: keep journal entries and files
+_HANDOFF_WAIT_S = 10.0                # exit waits this long for killed jobs to settle
+
+# Mux workers run at lower OS priority so they never compete at full weight
+# with the live encoder.  POSIX nice value / Windows priority class are
+# applied to each mux ffmpeg process, plus the lowest best-effort I/O class.
+_MUX_WORKERS_DEFAULT = 1
+_MUX_NICE_POSIX      = 10
 
 # CPU info cache -------------------------------------------------------------
 _cpu_info: dict | None = None
 
+# CPU affinity ---------------------------------------------------------------
+# The thread budget is also enforced as a core set: capture / mux ffmpeg and
+# the recorder's own threads are pinned to the highest-numbered `_thread_cap`
+# cores, leaving the low cores (where the OS and most games schedule first)
+# free.  Within that set the lowest 1/_MUX_CORE_SHARE (at least one core,
+# given a budget of two or more) belongs to the mux - its ffmpeg and threads
+# - and the rest to the live capture, so a mux never time-slices with the
+# encoder.  ffmpeg children get their mask at spawn (_popen_pinned), so
+# every thread they create inherits it.  Config "cpu_affinity" turns
+# pinning off.
+_core_layout: dict | None = None
+_MUX_CORE_SHARE = 4
+_MUX_THREADS    = ("mux",)            # thread-name prefixes pinned to the mux cores
+
 
 # ===========================================================================
 # Adaptive in-RAM video buffer with transparent disk spill
 # ===========================================================================
 class _VideoBuffer:
     """
-    Buffers encoded H.264 bytes from ffmpeg's stdout in a list of byte chunks.
+    Buffers encoded H.264 bytes from ffmpeg's stdout in a list of chunks
+    (memoryviews into the reader's slabs, or bytes).
 
     As long as total size stays under `max_bytes`, all data lives in RAM.
     If the budget would be exceeded the buffer spills transparently to
     `spill_path` on disk for the remainder of the segment.  Recording is
     never interrupted during a spill transition.
 
+    Every chunk is also fed to an h264_index.NalIndex, so frame and
+    keyframe offsets are known as the stream arrives (both paths) and
+    later stages can address the buffer by time without re-parsing it.
+
     After the mux step reads the buffer it should call `discard()` to free
     RAM (in-RAM path) or delete the spill file (disk path).
     """
@@ -163,13 +412,18 @@ class _VideoBuffer:
     def __init__(self, max_bytes: int, spill_path: str):
         self._max         = max_bytes
         self._spill_path  = spill_path
-        self._chunks: list[bytes] = []
+        self._chunks: list = []
         self._size        = 0
         self._spill_file  = None
         self._spilled     = False
+        self._detached    = False     # persisted for a handed-off mux job; keep files
+        self._discarded   = False
+        self._life_lock   = threading.Lock()   # persist() vs discard()
+        self.index        = h264_index.NalIndex()
 
     # ---- write (called from stdout_reader thread) -------------------------
     def write(self, data: bytes) -> None:
+        self.index.feed(data)
         if self._spilled:
             self._spill_file.write(data)
             return
@@ -212,28 +466,552 @@ class _VideoBuffer:
     def ram_size_mb(self) -> float:
         return self._size / (1024 * 1024)
 
+    @property
+    def ram_bytes(self) -> int:
+        return self._size
+
+    @property
+    def held_bytes(self) -> int:
+        """
+        RAM this buffer keeps alive: a memoryview chunk pins its whole
+        reader slab, so each backing object is counted once at full size,
+        plus the per-chunk object overhead.  Callable from any thread.
+        """
+        chunks = list(self._chunks)
+        seen   = set()
+        total  = 0
+        for c in chunks:
+            base = c.obj if isinstance(c, memoryview) else c
+            if id(base) not in seen:
+                seen.add(id(base))
+                total += len(base)
+        return total + len(chunks) * _CHUNK_OBJ_BYTES
+
+    @property
+    def retains_input(self) -> bool:
+        """True while write() keeps references to the data it is given."""
+        return not self._spilled
+
+    def keyframe_at(self, t: float, fps: float) -> tuple | None:
+        """(frame, stream offset) of the last keyframe at or before t seconds."""
+        return self.index.keyframe_offset_for_time(t, fps)
+
     # ---- iteration (in-RAM path only) ------------------------------------
     def iter_chunks(self):
         """Yield in-RAM bytes chunks.  Only valid when spilled is False."""
         yield from self._chunks
 
+    @classmethod
+    def from_chunks(cls, chunks: list) -> "_VideoBuffer":
+        """A closed, in-RAM buffer holding `chunks` (e.g. a replay snapshot)."""
+        size        = sum(len(c) for c in chunks)
+        buf         = _VideoBuffer(max_bytes=size, spill_path="")
+        buf._chunks = list(chunks)
+        buf._size   = size
+        return buf
+
+    @classmethod
+    def from_file(cls, path: str) -> "_VideoBuffer":
+        """A closed buffer backed by an existing .h264 file (a resumed mux job)."""
+        buf          = _VideoBuffer(max_bytes=0, spill_path=path)
+        buf._spilled = True
+        return buf
+
+    def persist(self, path: str) -> str | None:
+        """
+        Make the stream durable for a mux job handed off at exit: in-RAM
+        chunks are written to `path`, a spill file stays where it is.  The
+        file is detached, so discard() will no longer delete it.  Returns
+        the file's path, or None if the buffer was already discarded (its
+        mux has read it all).  Serialised with discard(), so a concurrent
+        discard waits for the file to be complete.
+        """
+        with self._life_lock:
+            if self._discarded:
+                return None
+            self._detached = True
+            if self._spilled:
+                return self._spill_path
+            with open(path, "wb") as f:
+                for chunk in list(self._chunks):
+                    f.write(chunk)
+            return path
+
     # ---- cleanup ---------------------------------------------------------
     def discard(self) -> None:
         """Free RAM / delete spill file.  Safe to call multiple times."""
-        self._chunks = []
-        self._size   = 0
-        if self._spill_file is not None:
-            try:
-                self._spill_file.close()
-            except OSError:
-                pass
-            self._spill_file = None
-        if self._spilled and os.path.exists(self._spill_path):
+        with self._life_lock:
+            self._discarded = True
+            self._chunks    = []
+            self._size      = 0
+            if self._spill_file is not None:
+                try:
+                    self._spill_file.close()
+                except OSError:
+                    pass
+                self._spill_file = None
+            if self._spilled and not self._detached and os.path.exists(self._spill_path):
+                try:
+                    os.remove(self._spill_path)
+                except OSError:
+                    pass
+            self._spilled = False
+
+
+class _ReplayRing(_VideoBuffer):
+    """
+    Instant-replay variant of _VideoBuffer that keeps only the newest GOPs.
+
+    Bytes are grouped into GOPs using the buffer's NAL index: each new IDR
+    frame opens a GOP at the offset the index recorded for it (including
+    any SPS / PPS / SEI run in front).  The encoder runs with a fixed
+    keyframe interval and scene-cut keyframes off, so eviction granularity
+    is one GOP.  Stream headers ahead of the first IDR are kept and
+    prepended to every snapshot.  A GOP is never modified once the next one
+    has opened, so snapshots hand those out as read-only views.
+
+    The media time of every frame sent to the encoder is noted by the pipe
+    writer (note_frame), so each GOP carries the time of its first frame -
+    frames dropped before the encoder do not skew the audio window.
+
+    The oldest GOP is evicted once the remaining ones still cover `seconds`,
+    or whenever the ring exceeds `max_bytes` - a hard cap, so RAM never
+    grows past duration x the encoder's VBV-capped bitrate.  The index is
+    trimmed along with the data.
+    """
+
+    def __init__(self, seconds: float, fps: int, max_bytes: int):
+        super().__init__(max_bytes=max_bytes, spill_path="")
+        self.seconds    = seconds
+        self.fps        = fps
+        self.video_t0   = None          # media time of frame 0 (set by the grab loop)
+        self._header    = bytearray()
+        self._gops      = collections.deque()   # (first frame, media time, bytearray)
+        self._seen_kf   = 0             # keyframes of the index already turned into GOPs
+        self._frame_t   = array("d")    # media time of each encoded frame ...
+        self._frame_0   = 0             # ... counted from this frame number
+        self._lock      = threading.Lock()
+
+    # ---- frame times (called from the pipe writer thread) -----------------
+    def note_frame(self, t_media: float) -> None:
+        """Record the media time of the next frame handed to the encoder."""
+        with self._lock:
+            self._frame_t.append(t_media)
+
+    def _frame_time(self, frame: int) -> float:
+        i = frame - self._frame_0
+        if 0 <= i < len(self._frame_t):
+            return self._frame_t[i]
+        return (self.video_t0 or 0.0) + frame / self.fps    # not noted (no pipe writer)
+
+    # ---- write (called from stdout_reader thread) -------------------------
+    def write(self, data: bytes) -> None:
+        with self._lock:
+            idx = self.index
+            cur = self._gops[-1][2] if self._gops else self._header
+            cur += data
+            self._size += len(data)
+            if idx.feed(data) and len(idx.keyframes) > self._seen_kf:
+                for kf in idx.keyframes[self._seen_kf:]:
+                    self._open_gop(kf, idx.offset_of(kf))
+                self._seen_kf = len(idx.keyframes)
+            self._evict()
+
+    def _open_gop(self, frame: int, start: int) -> None:
+        """Move the bytes from stream offset `start` on into a new GOP."""
+        cur  = self._gops[-1][2] if self._gops else self._header
+        move = min(self.index.size - start, len(cur))
+        self._gops.append((frame, self._frame_time(frame),
+                           bytearray(cur[len(cur) - move:])))
+        del cur[len(cur) - move:]
+
+    def _evict(self) -> None:
+        total = self.index.frame_count
+        while len(self._gops) > 1 and (
+                (total - self._gops[1][0]) / self.fps >= self.seconds
+                or self._size > self._max):
+            frame, _t, old = self._gops.popleft()
+            if frame == 0:
+                # Keep the very first GOP's parameter sets for later snapshots.
+                self._header += old[:self._slice_start(old)]
+            self._size -= len(old)
+            first = self._gops[0][0]
+            self.index.trim_before(first)
+            self._seen_kf = len(self.index.keyframes)
+            drop = min(max(0, first - self._frame_0), len(self._frame_t))
+            del self._frame_t[:drop]
+            self._frame_0 += drop
+
+    @staticmethod
+    def _slice_start(gop: bytearray) -> int:
+        """Offset of the first coded-slice NAL in a GOP (its SPS/PPS/SEI precede it)."""
+        i = gop.find(b"\x00\x00\x01")
+        while 0 <= i < len(gop) - 3:
+            if gop[i + 3] & 0x1F in (h264_index.NAL_SLICE, h264_index.NAL_IDR):
+                return i - 1 if i and gop[i - 1] == 0 else i
+            i = gop.find(b"\x00\x00\x01", i + 3)
+        return 0
+
+    # ---- snapshot (any thread) -----------------------------------------------
+    def snapshot(self) -> tuple | None:
+        """
+        The current window: (in-RAM _VideoBuffer, media time of its first
+        frame), or None before the first keyframe has arrived.  Finished
+        GOPs are shared as read-only views (no copy; an evicted GOP lives
+        on until the snapshot is discarded); only the header and the GOP
+        still being written are copied.
+        """
+        with self._lock:
+            if not self._gops or self.video_t0 is None:
+                return None
+            *done, (_f, _t, last) = self._gops
+            chunks = ([bytes(self._header)]
+                      + [memoryview(g).toreadonly() for _f, _t, g in done]
+                      + [bytes(last)])
+            t_first = self._gops[0][1]
+        return (_VideoBuffer.from_chunks(chunks), t_first)
+
+    @property
+    def retains_input(self) -> bool:
+        return False            # write() copies into the GOP bytearrays
+
+    @property
+    def held_bytes(self) -> int:
+        with self._lock:
+            return (sys.getsizeof(self._header) + sys.getsizeof(self._frame_t)
+                    + sum(sys.getsizeof(g) for _f, _t, g in self._gops))
+
+    @property
+    def window_s(self) -> float:
+        """Seconds of video currently held."""
+        gops = self._gops
+        return (self.index.frame_count - gops[0][0]) / self.fps if gops else 0.0
+
+    def discard(self) -> None:
+        with self._lock:
+            self._gops.clear()
+            self._header  = bytearray()
+            self._size    = 0
+            self._seen_kf = 0
+            self._frame_t = array("d")
+            self._frame_0 = 0
+            self.index    = h264_index.NalIndex()
+
+
+# ===========================================================================
+# Encoder output reader  —  readinto1 into reusable slabs
+# ===========================================================================
+class _SlabReader:
+    """
+    Reads an encoder's stdout into preallocated slabs and feeds a sink.
+
+    readinto1() fills the free tail of the current slab with whatever the
+    pipe holds (one system call, no copy through the BufferedReader); once
+    about `chunk` bytes have gathered, that view is passed to sink.write().
+    `chunk` tracks the measured bitrate so each is ~_STDOUT_CHUNK_S of
+    stream.  When a slab is full it is left to the sink if the sink keeps
+    what it is given (sink.retains_input), else it is reused from the start.
+
+    Counters (bytes, reads, time blocked in readinto1) are plain attributes
+    updated by the reader thread; stats() derives the rates.  Optional
+    telemetry histograms get each readinto1 wait and each sink.write().
+    """
+
+    def __init__(self, stream, sink, slab_size: int = _STDOUT_SLAB_SIZE,
+                 read_hist=None, write_hist=None):
+        self._stream     = stream
+        self._sink       = sink
+        self._slab_size  = slab_size
+        self._read_hist  = read_hist
+        self._write_hist = write_hist
+        self.chunk      = _STDOUT_CHUNK_MIN
+        self.bytes      = 0
+        self.reads      = 0
+        self.slabs      = 0
+        self.blocked_s  = 0.0
+        self._t0        = None
+        self._t_end     = None
+
+    def run(self) -> None:
+        """Read to EOF (call on the reader thread)."""
+        stream, sink = self._stream, self._sink
+        read_hist    = self._read_hist
+        write_hist   = self._write_hist
+        perf         = time.perf_counter
+        slab         = memoryview(bytearray(self._slab_size))
+        self.slabs   = 1
+        pos = emit   = 0
+        self._t0     = perf()
+        try:
+            while True:
+                if self._slab_size - pos < 4096:
+                    # Slab (nearly) full: hand on the rest, then move on.
+                    if pos > emit:
+                        sink.write(slab[emit:pos])
+                    if sink.retains_input:
+                        slab        = memoryview(bytearray(self._slab_size))
+                        self.slabs += 1
+                    pos = emit = 0
+                want = min(self._slab_size - pos, self.chunk)
+                t    = perf()
+                n    = stream.readinto1(slab[pos:pos + want])
+                t1   = perf()
+                self.blocked_s += t1 - t
+                if not n:
+                    break
+                if read_hist is not None:
+                    read_hist.span(t, t1)
+                pos        += n
+                self.bytes += n
+                self.reads += 1
+                if pos - emit >= self.chunk:
+                    t = perf()
+                    sink.write(slab[emit:pos])
+                    if write_hist is not None:
+                        write_hist.span(t, perf())
+                    emit = pos
+                    self._adapt(perf())
+        except (OSError, ValueError):
+            pass
+        finally:
             try:
-                os.remove(self._spill_path)
+                if pos > emit:
+                    sink.write(slab[emit:pos])
             except OSError:
                 pass
-        self._spilled = False
+            self._t_end = perf()
+
+    def _adapt(self, now: float) -> None:
+        elapsed = now - self._t0
+        if elapsed >= 1.0:
+            target     = int(self.bytes / elapsed * _STDOUT_CHUNK_S)
+            self.chunk = min(max(target, _STDOUT_CHUNK_MIN), _STDOUT_CHUNK_MAX)
+
+    def stats(self) -> dict:
+        """{"bytes_per_s", "blocked_pct", "reads", "chunk_kb", "slabs", "mb"}."""
+        if self._t0 is None:
+            return {}
+        elapsed = max((self._t_end or time.perf_counter()) - self._t0, 1e-6)
+        return {
+            "bytes_per_s": self.bytes / elapsed,
+            "blocked_pct": min(100.0, self.blocked_s / elapsed * 100),
+            "reads":       self.reads,
+            "chunk_kb":    self.chunk // 1024,
+            "slabs":       self.slabs,
+            "mb":          self.bytes / (1024 * 1024),
+        }
+
+
+def get_reader_stats() -> dict:
+    """Capture-encoder output reader metrics (see _SlabReader.stats), or {}."""
+    reader = _current_reader
+    return reader.stats() if reader is not None else {}
+
+
+def get_encoder_progress() -> dict:
+    """
+    Latest -progress report of the live capture encoder (see
+    ffmpeg_log.Progress: fps, speed, bitrate_kbps, size_bytes, dup/drop
+    frames ...), or {} when no encoder is running or none has arrived.
+    """
+    progress = _current_progress
+    return dict(progress.latest) if progress is not None and progress.latest else {}
+
+
+def get_mux_progress() -> list:
+    """
+    One {"name", "pct", "out_time_s", "speed"} per running mux; pct is None
+    when the segment's duration is unknown (a mux resumed from the journal).
+    """
+    out = []
+    for path, (progress, duration) in list(_mux_progress.items()):
+        rep = progress.latest or {}
+        t   = rep.get("out_time_s") or 0.0
+        out.append({
+            "name":       os.path.basename(path),
+            "pct":        min(t / duration * 100, 100.0) if duration else None,
+            "out_time_s": t,
+            "speed":      rep.get("speed"),
+        })
+    return out
+
+
+def get_pipeline_telemetry() -> dict:
+    """
+    Per-stage latency percentiles of the current / last capture session:
+    {stage: {"count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"}}.
+    Stages: grab (sct.grab), convert (cvtColor / resize), queue_wait (frame
+    queue), pipe_write (encoder stdin), encoder_read (wait for encoder
+    output), buffer_write (_VideoBuffer.write), audio_read (<device>).
+    """
+    return _telemetry.snapshot()
+
+
+# ---------------------------------------------------------------------------
+# Metrics endpoint
+# ---------------------------------------------------------------------------
+# Gauges below are computed when scraped, from plain attribute reads of the
+# live objects; the capture threads never wait on a scrape.
+def _progress_value(key: str):
+    progress = _current_progress
+    rep      = progress.latest if progress is not None else None
+    return rep.get(key) if rep else None
+
+
+def _buffer_value(fn):
+    buf = _current_video_buf
+    return fn(buf) if buf is not None else 0
+
+
+_metrics.gauge("capturing", "1 while a capture session is running.",
+               fn=lambda: is_capturing)
+_metrics.gauge("video_buffer_bytes", "Encoded video held in RAM for the current segment.",
+               fn=lambda: _buffer_value(lambda b: b.ram_bytes))
+_metrics.gauge("video_buffer_spilled", "1 if the current segment's buffer spilled to disk.",
+               fn=lambda: _buffer_value(lambda b: b.spilled))
+_metrics.gauge("mux_pending", "Segment mux jobs queued or running.",
+               fn=lambda: pending_mux_count)
+_metrics.gauge("encoder_fps", "Capture encoder throughput (ffmpeg -progress).",
+               fn=lambda: _progress_value("fps"))
+_metrics.gauge("encoder_speed", "Capture encoder speed relative to real time.",
+               fn=lambda: _progress_value("speed"))
+
+
+def get_metrics_registry() -> metrics.Registry:
+    """The recorder's metrics.Registry (served by metrics.serve at /metrics)."""
+    return _metrics
+
+
+# ---------------------------------------------------------------------------
+# Memory accounting
+# ---------------------------------------------------------------------------
+def _process_memory() -> tuple:
+    """
+    (RSS, OS high-water mark of the RSS) of this process in bytes; (0, 0)
+    without psutil.  The high-water mark is the peak working set on Windows,
+    kept by the kernel, so it catches spikes between samples; elsewhere
+    psutil has none and it is the current RSS.
+    """
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return info.rss, getattr(info, "peak_wset", info.rss)
+    except Exception:
+        return 0, 0
+
+
+def _memory_accounting() -> dict:
+    """Bytes held by each kind of recorder buffer right now (any thread)."""
+    frames = _m_queue_depth.value * (_frame_bytes + _FRAME_OBJ_BYTES)
+    live   = 0
+    seen   = set()
+    buf    = _current_video_buf
+    if buf is not None:
+        live += buf.held_bytes
+        seen.add(id(buf))
+    proxy = _current_proxy
+    if proxy is not None:
+        frames += proxy.queued_bytes
+        live   += proxy.video_buf.held_bytes
+        seen.add(id(proxy.video_buf))
+    with _pending_mux_lock:
+        inflight = [(j.video_buf, j.proxy_buf) for j in _mux_inflight]
+    pending = 0
+    for bufs in inflight:
+        for b in bufs:
+            if b is not None and id(b) not in seen:
+                seen.add(id(b))
+                pending += b.held_bytes
+    session = _audio_session
+    audio   = session.held_bytes() if session is not None else 0
+    return {
+        "frame_queue": frames,
+        "live_buffer": live,
+        "pending_mux": pending,
+        "audio":       audio,
+        "total":       frames + live + pending + audio,
+    }
+
+
+class _MemoryWatch:
+    """
+    Samples _memory_accounting() and the process RSS every _MEM_SAMPLE_S
+    on its own thread for one capture session, keeping the high-water
+    marks since the last take_peaks() (i.e. per segment).  The OS
+    high-water mark is process-wide and never resets, so it counts for a
+    segment only once it has risen above its value at the segment start:
+    the new process peak was then reached during that segment.
+    """
+
+    def __init__(self):
+        self._lock      = threading.Lock()
+        self.peak_total = 0
+        self.peak_rss   = 0
+        self._os_peak0  = _process_memory()[1]   # OS RSS high-water mark at segment start
+        self._os_peak   = self._os_peak0         # ... at the last sample
+        self._latest    = None                   # last sample (dict)
+        self.sample()
+        self._stop      = threading.Event()
+        self._thread    = threading.Thread(target=self._run, daemon=True, name="mem-watch")
+        self._thread.start()
+
+    def sample(self) -> dict:
+        acc                 = _memory_accounting()
+        acc["rss"], os_peak = _process_memory()
+        with self._lock:
+            self.peak_total = max(self.peak_total, acc["total"])
+            self.peak_rss   = max(self.peak_rss, acc["rss"])
+            if os_peak > self._os_peak0:
+                self.peak_rss = max(self.peak_rss, os_peak)
+            self._os_peak = os_peak
+            self._latest  = acc
+        return acc
+
+    def latest(self) -> tuple:
+        """(copy of the last sample, (peak buffer bytes, peak RSS) so far); any thread."""
+        with self._lock:
+            return dict(self._latest), (self.peak_total, self.peak_rss)
+
+    def take_peaks(self) -> tuple:
+        """(peak buffer bytes, peak RSS) since the last call, including now."""
+        self.sample()
+        with self._lock:
+            peaks = (self.peak_total, self.peak_rss)
+            self.peak_total = self.peak_rss = 0
+            self._os_peak0  = self._os_peak
+        return peaks
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.wait(_MEM_SAMPLE_S):
+            self.sample()
+
+
+def get_memory_accounting() -> dict:
+    """
+    Recorder memory, in bytes: {"frame_queue" (raw frames queued for the
+    capture and proxy encoders), "live_buffer" (current segment's encoded
+    video incl. whole reader slabs, and its proxy), "pending_mux" (buffers
+    of segments waiting for or in mux), "audio" (write-behind blocks /
+    replay rings), "total", "budget" (this segment's max_ram_usage budget,
+    0 when idle), "rss", "total_peak", "rss_peak" (this segment)}.  While
+    recording these are the session watcher's last sample (at most
+    _MEM_SAMPLE_S old); it is not re-sampled here.
+    """
+    watch = _mem_watch
+    if watch is not None:
+        acc, (total_peak, rss_peak) = watch.latest()
+    else:
+        acc                  = _memory_accounting()
+        acc["rss"]           = _process_memory()[0]
+        total_peak, rss_peak = acc["total"], acc["rss"]
+    acc["budget"]     = _ram_budget if is_capturing else 0
+    acc["total_peak"] = total_peak
+    acc["rss_peak"]   = rss_peak
+    return acc
 
 
 # ===========================================================================
@@ -384,14 +1162,192 @@ def get_cpu_info() -> dict:
     return info
 
 
+# ===========================================================================
+# CPU affinity  —  pin the recorder to its share of the cores
+# ===========================================================================
+def _available_cores() -> list[int]:
+    """Cores this process may run on (honours an affinity set by the user)."""
+    try:
+        if hasattr(os, "sched_getaffinity"):
+            return sorted(os.sched_getaffinity(0))
+        import psutil
+        return sorted(psutil.Process().cpu_affinity())
+    except Exception:
+        return list(range(os.cpu_count() or 1))
+
+
+def _fmt_cores(cores) -> str:
+    """[0, 1, 2, 5, 7, 8] -> "0-2,5,7-8"."""
+    parts = []
+    for c in sorted(cores):
+        if parts and c == parts[-1][1] + 1:
+            parts[-1][1] = c
+        else:
+            parts.append([c, c])
+    return ",".join(f"{a}" if a == b else f"{a}-{b}" for a, b in parts)
+
+
+def _compute_core_layout(thread_cap: int, enabled: bool = True) -> dict:
+    """
+    Split the available cores into the recorder's set (highest-numbered
+    thread_cap cores) and the reserved set left to the OS / game, and the
+    recorder's set into capture and mux cores.  A one-core budget cannot be
+    split; capture and mux then share it (the mux still runs at low priority).
+    """
+    avail    = _available_cores()
+    n        = min(max(1, thread_cap), len(avail))
+    recorder = avail[-n:]
+    reserved = avail[:-n]
+    n_mux    = max(1, n // _MUX_CORE_SHARE) if n >= 2 else 0
+    mux      = recorder[:n_mux] or recorder
+    capture  = recorder[n_mux:]
+    pinned   = enabled and bool(reserved)
+    return {
+        "enabled":  pinned,
+        "recorder": recorder,
+        "capture":  capture,
+        "mux":      mux,
+        "reserved": reserved,
+        "text":     (f"capture {_fmt_cores(capture)}  |  mux {_fmt_cores(mux)}"
+                     f"{' (shared)' if mux == capture else ''}  |  "
+                     f"reserved {_fmt_cores(reserved) or '-'}"
+                     if pinned else "not pinned (all cores)"),
+    }
+
+
+def get_core_layout() -> dict:
+    """
+    The active core layout ({"enabled", "recorder", "capture", "mux",
+    "reserved", "text"}); recomputed by start_capture, so read it per use.
+    """
+    global _core_layout
+    if _core_layout is None:
+        _core_layout = _compute_core_layout(_thread_cap)
+    return _core_layout
+
+
+def _core_mask(cores) -> int:
+    """Windows affinity bitmask (first 64-core processor group only)."""
+    return sum(1 << c for c in cores if c < 64)
+
+
+def _popen_pinned(cmd: list, group: str, **kwargs) -> subprocess.Popen:
+    """
+    subprocess.Popen with the child already restricted to the layout's
+    `group` cores ("capture", "mux" or "recorder"), so every thread ffmpeg
+    creates inherits the mask - pinning a running process misses threads
+    it has already started.  POSIX: set in the child before exec.  Windows:
+    created suspended, masked, then resumed (NtResumeProcess, as the
+    thread handle is not kept by Popen).  Unpinned when affinity is off.
+    """
+    layout = get_core_layout()
+    if not layout["enabled"]:
+        return subprocess.Popen(cmd, **kwargs)
+    cores = list(layout[group])
+    if hasattr(os, "sched_setaffinity"):
+        return subprocess.Popen(cmd, preexec_fn=lambda: os.sched_setaffinity(0, cores),
+                                **kwargs)
+    if os.name != "nt":
+        return subprocess.Popen(cmd, **kwargs)
+
+    create_suspended = 0x00000004
+    kwargs["creationflags"] = kwargs.get("creationflags", 0) | create_suspended
+    proc   = subprocess.Popen(cmd, **kwargs)
+    handle = int(proc._handle)
+    try:
+        k32 = ctypes.windll.kernel32
+        k32.SetProcessAffinityMask.argtypes = (ctypes.c_void_p, ctypes.c_size_t)
+        if not k32.SetProcessAffinityMask(handle, _core_mask(cores)):
+            print(f"WARNING: could not set ffmpeg CPU affinity "
+                  f"(error {ctypes.GetLastError()})")
+    finally:
+        ntdll = ctypes.windll.ntdll
+        ntdll.NtResumeProcess.argtypes = (ctypes.c_void_p,)
+        if ntdll.NtResumeProcess(handle) != 0:
+            proc.kill()
+            raise OSError("could not resume ffmpeg after setting its CPU affinity")
+    return proc
+
+
+def _pin_current_thread() -> None:
+    """
+    Restrict the calling thread to its share of the recorder's cores: the
+    mux cores for threads named with a _MUX_THREADS prefix, the capture
+    cores otherwise.  Linux affinity is per thread (pid 0 = caller); on
+    Windows SetThreadAffinityMask is used, which only covers the first
+    64-core processor group.
+    """
+    layout = get_core_layout()
+    if not layout["enabled"]:
+        return
+    name  = threading.current_thread().name
+    cores = layout["mux" if name.startswith(_MUX_THREADS) else "capture"]
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cores)
+        elif os.name == "nt":
+            k32  = ctypes.windll.kernel32
+            k32.SetThreadAffinityMask.argtypes = (ctypes.c_void_p, ctypes.c_size_t)
+            k32.SetThreadAffinityMask(k32.GetCurrentThread(), _core_mask(cores))
+    except Exception:
+        pass
+
+
+def _pinned(fn):
+    """
+    Wrap a thread target so it pins itself before running (and, under
+    --profile, is stack-sampled: see profiling.profiled).
+    """
+    fn = profiling.profiled(fn)
+
+    def _run(*args, **kwargs):
+        _pin_current_thread()
+        return fn(*args, **kwargs)
+    return _run
+
+
 # ---------------------------------------------------------------------------
 # Segment elapsed helper  (called by displays.recording_monitor)
 # ---------------------------------------------------------------------------
 def current_segment_elapsed() -> float:
-    """Seconds elapsed in the current recording segment (0.0 if not recording)."""
+    """Seconds recorded in the current segment, paused time excluded (0.0 if not recording)."""
     if _segment_start_time is None:
         return 0.0
-    return time.time() - _segment_start_time
+    return _pause_clock.to_media(time.perf_counter()) - _segment_start_time
+
+
+def capture_elapsed() -> float:
+    """Seconds recorded this session, paused time excluded (0.0 if not recording)."""
+    if _capture_media_t0 is None:
+        return 0.0
+    return _pause_clock.to_media(time.perf_counter()) - _capture_media_t0
+
+
+def get_audio_writer_stats() -> dict:
+    """
+    {"lb"/"mic": {"bytes_per_s", "writes", "write_ms_avg", "write_ms_max",
+    "queued"}} for the live recording session; empty when not recording.
+    """
+    session = _audio_session
+    return session.writer_stats() if session is not None else {}
+
+
+def get_audio_levels() -> dict:
+    """
+    Live meter readings for the recording session:
+        {"lb"/"mic": {"peak_db": [per channel], "rms_db": [per channel],
+                      "age": seconds since the reading}}
+    Levels are dBFS (0 = full scale, -inf = digital silence).  Reads only
+    the snapshot tuples published by the capture threads - no locks.
+    """
+    session = _audio_session
+    if session is None:
+        return {}
+    now = time.perf_counter()
+    return {
+        label: {"peak_db": list(peak), "rms_db": list(rms), "age": now - ts}
+        for label, (ts, peak, rms) in session.levels().items()
+    }
 
 
 # ===========================================================================
@@ -399,7 +1355,7 @@ def current_segment_elapsed() -> float:
 # ===========================================================================
 def init_capture_system(config: dict | None = None) -> bool:
     """Verify all runtime deps, choose buffer sizes, open PyAudio. Returns True on success."""
-    global _pa, AUDIO_CHUNK, _thread_cap
+    global _pa, AUDIO_CHUNK, _thread_cap, _core_layout, _recompressor, _mux_journal
 
     missing = []
     for mod in ("cv2", "mss", "numpy", "pyaudiowpatch", "imageio_ffmpeg"):
@@ -422,6 +1378,8 @@ def init_capture_system(config: dict | None = None) -> bool:
 
     AUDIO_CHUNK = _detect_audio_chunk()
     cv2.setNumThreads(_thread_cap)
+    _core_layout = _compute_core_layout(
+        _thread_cap, (config or {}).get("cpu_affinity", True))
 
     ci     = get_cpu_info()
     _pa    = pyaudio.PyAudio()
@@ -441,10 +1399,21 @@ def init_capture_system(config: dict | None = None) -> bool:
     print(f"  CPU          : {ci['name']}")
     print(f"  Logical CPUs : {ci['logical_cores']}   SIMD: {simd_str}")
     print(f"  Thread cap   : {_thread_cap} core(s)  ({config.get('thread_budget', _THREAD_BUDGET_DEFAULT)}% budget)")
+    print(f"  CPU affinity : {_core_layout['text']}")
     print(f"  Free RAM     : {ram_gb:.1f} GB   "
           f"Video buffer cap: {buf_limit / (1024**3):.1f} GB  "
           f"({ram_pct}% of free, max {_RAM_BUFFER_HARD_CAP_GB:.0f} GB)")
     print(f"  Audio chunk  : {AUDIO_CHUNK} frames")
+
+    # Mux jobs handed off by the previous run (Exit mid-mux) finish now.
+    if _mux_journal is None:
+        _mux_journal = journal.Journal(_MUX_JOURNAL)
+        _resume_mux_jobs()
+
+    # Fast-capture segments queued in earlier runs resume once idle.
+    if _recompressor is None:
+        _recompressor = _Recompressor(_RECOMPRESS_JOURNAL)
+        _recompressor.start()
     return True
 
 
@@ -485,63 +1454,1083 @@ def _get_default_mic(pa: pyaudio.PyAudio):
     return info if info["maxInputChannels"] > 0 else None
 
 
+def _get_audio_devices() -> dict:
+    """
+    Return the cached {"lb": info | None, "mic": info | None} device map,
+    probing only on first use and, after that, only the devices marked
+    stale.  Walking the loopback generator is slow, so it never runs per
+    segment.
+    """
+    global _audio_devices
+    if _audio_devices is None:
+        _audio_devices_stale.update(_AUDIO_FILE_PREFIX)
+        _audio_devices = {}
+    if not _audio_devices_stale:
+        return _audio_devices
+
+    stale = set(_audio_devices_stale)
+    _audio_devices_stale.difference_update(stale)
+    if "lb" in stale:
+        lb = _audio_devices["lb"] = _get_loopback_device(_pa)
+        print(f"  System audio : {lb['name'] if lb else 'unavailable'}")
+    if "mic" in stale:
+        mic = _audio_devices["mic"] = _get_default_mic(_pa)
+        print(f"  Microphone   : {mic['name'] if mic else 'unavailable'}")
+    return _audio_devices
+
+
+def notify_audio_device_change() -> None:
+    """
+    Mark the cached audio devices stale (e.g. on a Windows device-change
+    message).  Open streams keep recording until the next segment boundary,
+    where they are re-opened on the newly probed devices.
+    """
+    _audio_devices_stale.update(_AUDIO_FILE_PREFIX)
+
+
 # ===========================================================================
-# Audio capture thread  —  STREAMING WAV WRITE (O(1) RAM)
+# Audio clock tracking  —  device sample clock vs the grab-loop clock
 # ===========================================================================
-def _audio_capture_thread(pa: pyaudio.PyAudio, device_info: dict,
-                          wav_path: str, stop_event: threading.Event):
+class _AudioClock:
+    """
+    Measures one audio device's real sample rate against time.perf_counter().
+
+    Every chunk returned by stream.read() is stamped on arrival.  A running
+    least-squares fit of (arrival time -> samples received so far) gives:
+      - rate      : the device's true rate as seen by the video clock
+      - start_ts  : the perf_counter time of the first sample (fit intercept)
+    Running sums keep each update O(1), so the estimate is continuous for the
+    whole segment without storing any per-chunk history.
+    """
+
+    def __init__(self, nominal_rate: int):
+        self.nominal_rate = nominal_rate
+        self.frames       = 0        # samples received, including gap fill
+        self.gap_frames   = 0        # silence inserted for device stalls
+        self.gaps         = []       # (media ts, seconds) of each gap fill
+        self._t0          = None     # arrival time of the first chunk
+        self._last_ts     = None
+        self._n = self._sx = self._sy = self._sxx = self._sxy = 0.0
+
+    def add(self, ts: float, n_frames: int) -> None:
+        """Record a chunk of n_frames that finished arriving at ts."""
+        self.frames += n_frames
+        if self._t0 is None:
+            self._t0 = ts - n_frames / self.nominal_rate
+        x = ts - self._t0
+        y = float(self.frames)
+        self._n   += 1
+        self._sx  += x
+        self._sy  += y
+        self._sxx += x * x
+        self._sxy += x * y
+        self._last_ts = ts
+
+    def gap_frames_for(self, ts: float, n_frames: int) -> int:
+        """
+        Samples missing before a chunk of n_frames arriving at ts.
+        WASAPI loopback delivers nothing while the output is idle, and an
+        overflowed read loses data; either way the file would fall behind
+        the video, so the caller pads the gap with silence.
+        """
+        if self._last_ts is None:
+            return 0
+        late = (ts - self._last_ts) - n_frames / self.nominal_rate
+        if late < _AUDIO_GAP_FILL_S:
+            return 0
+        return int(late * self.nominal_rate)
+
+    @property
+    def span(self) -> float:
+        return 0.0 if self._last_ts is None else self._last_ts - self._t0
+
+    @property
+    def rate(self) -> float:
+        """Measured samples / second (nominal until enough audio is seen)."""
+        denom = self._n * self._sxx - self._sx * self._sx
+        if self.span < _AUDIO_SYNC_MIN_S or denom <= 0:
+            return float(self.nominal_rate)
+        return (self._n * self._sxy - self._sx * self._sy) / denom
+
+    @property
+    def drift_ppm(self) -> float:
+        return (self.rate / self.nominal_rate - 1.0) * 1e6
+
+    @property
+    def start_ts(self) -> float | None:
+        """perf_counter time at which the first recorded sample was captured."""
+        if self._t0 is None:
+            return None
+        if self.span < _AUDIO_SYNC_MIN_S:
+            return self._t0
+        rate      = self.rate
+        intercept = (self._sy - rate * self._sx) / self._n
+        return self._t0 - intercept / rate
+
+    def sync_info(self, video_t0: float) -> dict:
+        """Correction parameters for _mux(), relative to the segment's video start."""
+        start = self.start_ts
+        return {
+            "nominal_rate": self.nominal_rate,
+            "rate":         self.rate,
+            "drift_ppm":    self.drift_ppm,
+            "offset":       0.0 if start is None else start - video_t0,
+            "gap_frames":   self.gap_frames,
+        }
+
+
+def _audio_sync_filter(sync: dict | None) -> str | None:
     """
-    Stream audio from device_info directly into a WAV file one chunk at a time.
-    Peak in-memory usage per device is a single AUDIO_CHUNK (8-16 KB).
+    Return an ffmpeg audio filter chain that re-times one WAV input onto the
+    video clock, or None when the measured error is too small to matter.
+
+    asetpts rebuilds each frame's timestamp from its sample index and the
+    *measured* rate, shifted by the start offset; aresample=async then
+    stretches / pads / trims the audio to follow those timestamps, starting
+    from pts 0 so a late start becomes leading silence and an early start is
+    cut.
     """
-    is_loopback = device_info.get("isLoopbackDevice", False)
-    channels    = int(device_info["maxOutputChannels"] if is_loopback
-                      else device_info["maxInputChannels"]) or (2 if is_loopback else 1)
-    rate        = int(device_info["defaultSampleRate"])
+    if not sync:
+        return None
+    rate   = sync["rate"]
+    offset = sync["offset"]
+    if (abs(sync["drift_ppm"]) < _AUDIO_DRIFT_MIN_PPM
+            and abs(offset) < _AUDIO_OFFSET_MIN_S):
+        return None
+    return (f"asetpts=N/({rate:.4f}*TB){offset:+.6f}/TB,"
+            f"aresample=async=1000:first_pts=0")
 
+
+# ===========================================================================
+# Pause / resume  —  media clock with paused time removed
+# ===========================================================================
+class _PauseClock:
+    """
+    Pause state for one recording session.
+
+    While paused the grab loop sleeps on an Event and the audio threads
+    drop what they read, so nothing reaches the encoder or the WAVs.  All
+    segment timing runs on "media time": perf_counter with every paused
+    interval removed.  Video frames are counted, not timestamped, so the
+    frames either side of a pause simply sit next to each other in the
+    stream; audio chunks are re-stamped in media time so the _AudioClock
+    fit sees one continuous device clock and no gap is padded.
+    """
+
+    def __init__(self):
+        self._lock    = threading.Lock()
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._spans: list[list] = []      # [start, end | None] in perf_counter time
+
+    @property
+    def paused(self) -> bool:
+        return not self._resumed.is_set()
+
+    @property
+    def ever_paused(self) -> bool:
+        return bool(self._spans)
+
+    def pause(self, t: float) -> bool:
+        with self._lock:
+            if self.paused:
+                return False
+            self._spans.append([t, None])
+            self._resumed.clear()
+            return True
+
+    def resume(self, t: float) -> float | None:
+        """End the current pause; returns its length in seconds (None if not paused)."""
+        with self._lock:
+            if not self.paused:
+                return None
+            span    = self._spans[-1]
+            span[1] = max(t, span[0])
+            self._resumed.set()
+            return span[1] - span[0]
+
+    def wait(self, timeout: float) -> bool:
+        """Block while paused (up to timeout); True once running."""
+        return self._resumed.wait(timeout)
+
+    def to_media(self, t: float) -> float:
+        """perf_counter time t minus all paused time before it."""
+        paused = 0.0
+        for start, end in list(self._spans):
+            if start >= t:
+                break
+            paused += min(t if end is None else end, t) - start
+        return t - paused
+
+    def live_pieces(self, ts: float, n_frames: int, rate: int) -> list:
+        """
+        Split an audio chunk of n_frames that finished at perf_counter ts
+        into its unpaused parts: [(first_frame, end_frame, media_ts_of_end)].
+        """
+        t0     = ts - n_frames / rate
+        pieces = []
+        cur    = t0
+        for start, end in list(self._spans):
+            end = ts if end is None else end
+            if end <= cur or start >= ts:
+                continue
+            if start > cur:
+                pieces.append((cur, start))
+            cur = max(cur, end)
+        if cur < ts:
+            pieces.append((cur, ts))
+        out = []
+        for a, b in pieces:
+            i0 = min(max(int(round((a - t0) * rate)), 0), n_frames)
+            i1 = min(max(int(round((b - t0) * rate)), 0), n_frames)
+            if i1 > i0:
+                out.append((i0, i1, self.to_media(b)))
+        return out
+
+
+_pause_clock = _PauseClock()
+
+
+# ===========================================================================
+# Audio capture  —  STREAMING WAV WRITE (O(1) RAM), streams persist across splits
+# ===========================================================================
+def _audio_wav_path(label: str, segment_num: int) -> str:
+    """Temp WAV path for one device's share of a segment."""
+    prefix = _AUDIO_FILE_PREFIX.get(label, label)
+    return os.path.join(tempfile.gettempdir(),
+                        f"d264_{prefix}_{int(time.time())}_s{segment_num:03d}.wav")
+
+
+def _silence_sidecar_path(wav_path: str) -> str:
+    return wav_path + ".silence.json"
+
+
+def _load_silence_map(wav_path: str) -> dict | None:
+    """The sidecar written by _SilenceMap.save() for wav_path, or None."""
     try:
-        stream = pa.open(
-            format             = AUDIO_FORMAT,
-            channels           = channels,
-            rate               = rate,
-            input              = True,
-            input_device_index = device_info["index"],
-            frames_per_buffer  = AUDIO_CHUNK,
-        )
-    except OSError as e:
-        print(f"WARNING: could not open audio stream for '{device_info['name']}': {e}")
-        return
+        with open(_silence_sidecar_path(wav_path), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _remove_audio_files(wav_path: str) -> None:
+    """Delete a segment WAV and its silence sidecar, ignoring missing files."""
+    for p in (wav_path, _silence_sidecar_path(wav_path)):
+        try:
+            if os.path.exists(p):
+                os.remove(p)
+        except OSError:
+            pass
+
 
-    wrote_any = False
+def _repair_wav_header(wav_path: str) -> None:
+    """
+    Make a WAV's RIFF and data chunk sizes match the file's length.  A WAV
+    left by a crash or power cut carries the sizes of its last flush (or
+    none); ffmpeg would stop reading at the stale size.  Whole sample frames
+    only are counted.  No-op when the sizes already match or the file is
+    not a PCM WAV with a data chunk.
+    """
     try:
-        with wave.open(wav_path, "wb") as wf:
-            wf.setnchannels(channels)
-            wf.setsampwidth(pa.get_sample_size(AUDIO_FORMAT))
-            wf.setframerate(rate)
+        with open(wav_path, "r+b") as f:
+            head = f.read(12)
+            if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+                return
+            size  = os.fstat(f.fileno()).st_size
+            pos   = 12
+            frame = 1
+            while pos + 8 <= size:
+                f.seek(pos)
+                hdr  = f.read(8)
+                cid  = hdr[:4]
+                clen = int.from_bytes(hdr[4:], "little")
+                if cid == b"fmt ":
+                    fmt   = f.read(16)
+                    frame = max(1, int.from_bytes(fmt[12:14], "little"))   # block align
+                elif cid == b"data":
+                    data = size - pos - 8
+                    data -= data % frame
+                    if data == clen and int.from_bytes(head[4:8], "little") == pos + data:
+                        return
+                    f.seek(4)
+                    f.write((pos + data).to_bytes(4, "little"))
+                    f.seek(pos + 4)
+                    f.write(data.to_bytes(4, "little"))
+                    print(f"  Repaired WAV header: {os.path.basename(wav_path)} "
+                          f"({data} data bytes)")
+                    return
+                pos += 8 + clen + (clen & 1)
+    except OSError as e:
+        print(f"WARNING: could not check WAV header of {wav_path}: {e}")
 
-            while not stop_event.is_set():
+
+def _pcm_silent(data) -> bool:
+    """True if every int16 sample in data is within +/-_SILENCE_PEAK_MAX."""
+    a = np.frombuffer(data, dtype=np.int16)
+    return a.size == 0 or (int(a.max()) <= _SILENCE_PEAK_MAX
+                           and int(a.min()) >= -_SILENCE_PEAK_MAX)
+
+
+class _SilenceMap:
+    """
+    Silent ranges of one segment's WAV, in sample frames.
+
+    Fed one chunk at a time from the capture thread with the chunk peak the
+    level meter has already computed, so detection costs one comparison per
+    chunk.  Gap-fill padding is recorded as silent.  Runs shorter than
+    _SILENCE_MIN_RANGE_S still count towards silent_frames but are not
+    listed, which keeps the sidecar small for speech-like signals.
+    """
+
+    def __init__(self, rate: int):
+        self.rate          = rate
+        self.frames        = 0
+        self.silent_frames = 0
+        self.ranges: list[tuple[int, int]] = []
+        self._run_start: int | None = None
+
+    def add(self, n_frames: int, silent: bool) -> None:
+        if silent:
+            if self._run_start is None:
+                self._run_start = self.frames
+            self.silent_frames += n_frames
+        elif self._run_start is not None:
+            self._end_run()
+        self.frames += n_frames
+
+    def _end_run(self) -> None:
+        if self.frames - self._run_start >= _SILENCE_MIN_RANGE_S * self.rate:
+            self.ranges.append((self._run_start, self.frames))
+        self._run_start = None
+
+    @property
+    def fully_silent(self) -> bool:
+        return self.frames > 0 and self.silent_frames >= self.frames
+
+    @property
+    def silent_fraction(self) -> float:
+        return self.silent_frames / self.frames if self.frames else 0.0
+
+    def save(self, wav_path: str) -> None:
+        """Close any open run and write the sidecar next to wav_path."""
+        if self._run_start is not None:
+            self._end_run()
+        data = {
+            "rate":          self.rate,
+            "frames":        self.frames,
+            "silent_frames": self.silent_frames,
+            "fully_silent":  self.fully_silent,
+            "ranges":        self.ranges,
+        }
+        try:
+            with open(_silence_sidecar_path(wav_path), "w") as f:
+                json.dump(data, f)
+        except OSError as e:
+            print(f"WARNING: could not write silence map for {wav_path}: {e}")
+
+
+class _WavWriter:
+    """
+    Background WAV writer for one audio device.
+
+    The capture thread appends PCM to an in-memory block; once the block
+    holds `flush_interval` seconds of audio it is handed to this thread as
+    one large write, sized to a multiple of both the 4 KB page and the
+    sample frame.  writeframes() patches the RIFF / data sizes in the header
+    after each block (two 4-byte writes), so a file cut short by a crash
+    reads back to its last flushed block.
+
+    flush_interval trades the crash-loss window (audio not yet on disk)
+    against the number of write calls competing with the video spill file.
+    """
+
+    _PAGE = 4096
+
+    def __init__(self, channels: int, sampwidth: int, rate: int,
+                 flush_interval: float, name: str):
+        frame_bytes       = channels * sampwidth
+        align             = math.lcm(self._PAGE, frame_bytes)
+        flush             = int(flush_interval * rate * frame_bytes)
+        self._params      = (channels, sampwidth, rate)
+        self._align       = align
+        self._flush_bytes = max(align, flush - flush % align)
+        self._block       = bytearray()
+        self._q           = _queue.SimpleQueue()
+
+        # Stats (written by the writer thread only; read lock-free).
+        self.bytes_written = 0
+        self.writes        = 0
+        self.write_time    = 0.0
+        self.max_write     = 0.0
+        self._started      = time.perf_counter()
+        self._seg_mark     = (self._started, 0, 0, 0.0)
+        self._seg_max      = 0.0
+
+        self._thread = threading.Thread(target=_pinned(self._run), daemon=True, name=name)
+        self._thread.start()
+
+    # ---- capture-thread side ------------------------------------------------
+    def open(self, path: str) -> None:
+        self._q.put(("open", path, None))
+
+    def write(self, data) -> None:
+        """Append PCM; hand off an aligned block once flush_interval is reached."""
+        block = self._block
+        block += data
+        if len(block) >= self._flush_bytes:
+            n           = len(block) - len(block) % self._align
+            self._block = block[n:]
+            del block[n:]
+            self._q.put(("data", block, None))
+
+    def close(self, remove: bool = False) -> threading.Event:
+        """Flush the tail, close the file (deleting it if `remove`); returns a done event."""
+        if self._block:
+            self._q.put(("data", self._block, None))
+            self._block = bytearray()
+        done = threading.Event()
+        self._q.put(("close", remove, done))
+        return done
+
+    def stop(self) -> None:
+        self._q.put(None)
+        self._thread.join(timeout=10)
+
+    # ---- stats --------------------------------------------------------------
+    def stats(self) -> dict:
+        """Cumulative throughput and write latency since the writer started."""
+        elapsed = max(time.perf_counter() - self._started, 1e-6)
+        return {
+            "bytes_per_s":  self.bytes_written / elapsed,
+            "writes":       self.writes,
+            "write_ms_avg": self.write_time / self.writes * 1000 if self.writes else 0.0,
+            "write_ms_max": self.max_write * 1000,
+            "queued":       self._q.qsize(),
+        }
+
+    @property
+    def held_bytes(self) -> int:
+        """PCM in memory: the open block plus queued blocks (each at most one flush)."""
+        return len(self._block) + self._q.qsize() * self._flush_bytes
+
+    def take_segment_stats(self) -> dict:
+        """Same figures as stats(), but only for the period since the last call."""
+        now = time.perf_counter()
+        t0, b0, w0, wt0 = self._seg_mark
+        writes  = self.writes - w0
+        elapsed = max(now - t0, 1e-6)
+        result  = {
+            "bytes_per_s":  (self.bytes_written - b0) / elapsed,
+            "writes_per_s": writes / elapsed,
+            "write_ms_avg": (self.write_time - wt0) / writes * 1000 if writes else 0.0,
+            "write_ms_max": self._seg_max * 1000,
+        }
+        self._seg_mark = (now, self.bytes_written, self.writes, self.write_time)
+        self._seg_max  = 0.0
+        return result
+
+    # ---- writer thread ------------------------------------------------------
+    def _run(self) -> None:
+        wf   = None
+        path = None
+        while True:
+            item = self._q.get()
+            if item is None:
+                break
+            op, arg, done = item
+
+            if op == "open":
+                path = arg
+                try:
+                    wf = wave.open(path, "wb")
+                    wf.setnchannels(self._params[0])
+                    wf.setsampwidth(self._params[1])
+                    wf.setframerate(self._params[2])
+                except (OSError, wave.Error) as e:
+                    print(f"WARNING: could not open audio file {path}: {e}")
+                    wf = None
+
+            elif op == "data":
+                if wf is None:
+                    continue
+                t = time.perf_counter()
+                try:
+                    wf.writeframes(arg)     # data block + header sizes
+                except OSError as e:
+                    print(f"WARNING: audio write failed for {path}: {e}")
+                    continue
+                dt = time.perf_counter() - t
+                self.bytes_written += len(arg)
+                self.writes        += 1
+                self.write_time    += dt
+                if dt > self.max_write:
+                    self.max_write = dt
+                if dt > self._seg_max:
+                    self._seg_max = dt
+
+            elif op == "close":
+                if wf is not None:
+                    try:
+                        wf.close()
+                    except (OSError, wave.Error):
+                        pass
+                    wf = None
+                if arg and path and os.path.exists(path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                done.set()
+
+        if wf is not None:
+            try:
+                wf.close()
+            except (OSError, wave.Error):
+                pass
+
+
+class _PcmRing:
+    """
+    Replay-mode stand-in for _WavWriter: keeps the newest `seconds` of PCM in
+    one preallocated RAM ring instead of writing a file.
+
+    Frames are counted from open(), exactly like the capture's _AudioClock
+    (gap-fill silence included), so a media-time window maps straight onto
+    ring positions.  Writes are a memcpy on the capture thread - no writer
+    thread is needed.
+    """
+
+    def __init__(self, channels: int, sampwidth: int, rate: int, seconds: float):
+        self._fb      = channels * sampwidth
+        self._cap     = max(1, int(seconds * rate)) * self._fb
+        self._buf     = bytearray(self._cap)
+        self._total   = 0                   # bytes written since open()
+        self._lock    = threading.Lock()
+        self._started = time.perf_counter()
+        self._seg_t0  = self._started
+        self._seg_b0  = 0
+        self._written = 0                   # bytes written since the ring was created
+
+    # ---- _WavWriter interface -------------------------------------------------
+    def open(self, path: str) -> None:
+        with self._lock:
+            self._total = 0
+
+    def write(self, data) -> None:
+        mv  = memoryview(data)
+        n   = len(mv)
+        cap = self._cap
+        with self._lock:
+            if n > cap:
+                self._total += n - cap
+                mv, n        = mv[n - cap:], cap
+            pos   = self._total % cap
+            first = min(n, cap - pos)
+            self._buf[pos:pos + first] = mv[:first]
+            if first < n:
+                self._buf[:n - first] = mv[first:]
+            self._total += n
+        self._written += len(data)
+
+    def close(self, remove: bool = False) -> threading.Event:
+        done = threading.Event()
+        done.set()
+        return done
+
+    def stop(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        elapsed = max(time.perf_counter() - self._started, 1e-6)
+        return {"bytes_per_s": self._written / elapsed, "writes": 0,
+                "write_ms_avg": 0.0, "write_ms_max": 0.0, "queued": 0}
+
+    @property
+    def held_bytes(self) -> int:
+        return self._cap
+
+    def take_segment_stats(self) -> dict:
+        now     = time.perf_counter()
+        elapsed = max(now - self._seg_t0, 1e-6)
+        result  = {"bytes_per_s": (self._written - self._seg_b0) / elapsed,
+                   "writes_per_s": 0.0, "write_ms_avg": 0.0, "write_ms_max": 0.0}
+        self._seg_t0, self._seg_b0 = now, self._written
+        return result
+
+    # ---- replay -----------------------------------------------------------------
+    def snapshot(self, first_frame: int, end_frame: int) -> tuple:
+        """
+        PCM for frames [first_frame, end_frame), clipped to what the ring
+        still holds.  Returns (pcm bytes, frame index the PCM starts at).
+        """
+        fb, cap = self._fb, self._cap
+        with self._lock:
+            total  = self._total // fb
+            f0     = max(first_frame, total - cap // fb, 0)
+            f1     = min(end_frame, total)
+            if f1 <= f0:
+                return b"", f0
+            a      = (f0 * fb) % cap
+            nbytes = (f1 - f0) * fb
+            if a + nbytes <= cap:
+                return bytes(self._buf[a:a + nbytes]), f0
+            return bytes(self._buf[a:]) + bytes(self._buf[:nbytes - (cap - a)]), f0
+
+
+class _AudioCapture:
+    """
+    One audio device, opened once per recording session.
+
+    The PyAudio stream stays open across segment splits.  At a split the
+    capture thread cuts the chunk that straddles the boundary by sample
+    count, closes the finished segment's WAV and carries straight on into
+    the next one, so no audio is lost and no device is re-opened on the hot
+    path.  Only the WAV file and its _AudioClock are per-segment.
+
+    Each chunk is timestamped against the grab loop's perf_counter clock;
+    device stalls are padded with silence so the file stays on the video
+    timeline.  Disk writes are batched by a _WavWriter thread, so peak
+    in-memory usage per device is one flush block (~190 KB per second of
+    flush interval at 48 kHz stereo).
+    """
+
+    def __init__(self, pa: pyaudio.PyAudio, device_info: dict, label: str,
+                 flush_interval: float = _AUDIO_FLUSH_DEFAULT,
+                 replay_seconds: float | None = None):
+        is_loopback      = device_info.get("isLoopbackDevice", False)
+        self.pa          = pa
+        self.info        = device_info
+        self.label       = label
+        self.channels    = int(device_info["maxOutputChannels"] if is_loopback
+                               else device_info["maxInputChannels"]) or (2 if is_loopback else 1)
+        self.rate        = int(device_info["defaultSampleRate"])
+        self.sampwidth   = pa.get_sample_size(AUDIO_FORMAT)
+        self.frame_bytes = self.channels * self.sampwidth
+        self.failed      = False      # stream error: device gone / changed
+        self.clock: _AudioClock | None = None
+        self.silence: _SilenceMap | None = None
+
+        # Level meter.  `levels` is replaced as a whole tuple, so readers on
+        # other threads always see a consistent snapshot without a lock:
+        #   (perf_counter, peak dBFS per channel, RMS dBFS per channel)
+        self.levels      = None
+        self._lv_peak    = np.zeros(self.channels, dtype=np.int32)
+        self._lv_sumsq   = np.zeros(self.channels, dtype=np.int64)
+        self._lv_frames  = 0
+        self._lv_since   = time.perf_counter()
+
+        self._stream     = None
+        self._thread     = None
+        self._lock       = threading.Lock()   # guards the WAV, clock and cut request
+        self._wav_path   = None
+        self._wrote_any  = False
+        self._cut_at     = None               # (perf_counter time, next wav path | None)
+        self._cut_result = None
+        self._cut_done   = threading.Event()
+        self._m_overruns = _metrics.counter(
+            "audio_overruns_total", "Audio stalls / overflows padded with silence.",
+            device=label)
+        self._m_gap_s    = _metrics.counter(
+            "audio_gap_seconds_total", "Silence inserted for audio stalls / overflows.",
+            device=label)
+        self._close_done = None               # writer's event for the last closed WAV
+        if replay_seconds:
+            self._writer = _PcmRing(self.channels, self.sampwidth, self.rate,
+                                    replay_seconds)
+        else:
+            self._writer = _WavWriter(self.channels, self.sampwidth, self.rate,
+                                      flush_interval, name=f"audio-{label}-wr")
+
+    # ---- lifecycle ----------------------------------------------------------
+    def start(self, wav_path: str) -> bool:
+        try:
+            self._stream = self.pa.open(
+                format             = AUDIO_FORMAT,
+                channels           = self.channels,
+                rate               = self.rate,
+                input              = True,
+                input_device_index = self.info["index"],
+                frames_per_buffer  = AUDIO_CHUNK,
+            )
+        except OSError as e:
+            print(f"WARNING: could not open audio stream for '{self.info['name']}': {e}")
+            self._writer.stop()
+            return False
+
+        self._open_wav(wav_path)
+        self._thread = threading.Thread(target=_pinned(self._run), daemon=True,
+                                        name=f"audio-{self.label}")
+        self._thread.start()
+        return True
+
+    @property
+    def wav_path(self) -> str | None:
+        return self._wav_path
+
+    @property
+    def active(self) -> bool:
+        """True while a WAV is open, i.e. the stream continues into the next segment."""
+        return self._wav_path is not None
+
+    @property
+    def writer(self) -> "_WavWriter | _PcmRing":
+        return self._writer
+
+    def replay_pcm(self, t0: float, t1: float) -> bytes | None:
+        """
+        Replay mode: PCM covering media time [t0, t1), placed on the video
+        clock via this segment's _AudioClock fit.  Any part the ring no
+        longer holds (or never captured) is returned as leading silence.
+        """
+        with self._lock:
+            ring, clock = self._writer, self.clock
+            if not isinstance(ring, _PcmRing) or clock is None or clock.start_ts is None:
+                return None
+            rate = clock.rate
+            f0   = int(round((t0 - clock.start_ts) * rate))
+            f1   = int(round((t1 - clock.start_ts) * rate))
+            pcm, got = ring.snapshot(max(f0, 0), f1)
+        lead = max(0, got - f0)
+        return bytes(lead * self.frame_bytes) + pcm if lead else pcm
+
+    def request_cut(self, t_cut: float, next_wav_path: str | None) -> None:
+        """
+        Ask the capture thread to end the current WAV at perf_counter time
+        t_cut and continue into next_wav_path (or stop, if None).  Returns at
+        once; collect() picks up the finished file.
+        """
+        self._cut_done.clear()
+        with self._lock:
+            self._cut_result = None
+            self._cut_at     = (_pause_clock.to_media(t_cut), next_wav_path)
+
+    def collect(self) -> tuple:
+        """
+        Wait for the cut requested by request_cut() and return the finished
+        segment's (wav_path or None if empty, _AudioClock, _SilenceMap).
+
+        A device that is not delivering audio (idle WASAPI loopback, failed
+        stream) would never reach the cut point, so after one chunk period
+        plus a margin the cut is made here instead.
+        """
+        self._cut_done.wait(timeout=AUDIO_CHUNK / self.rate + 0.5)
+        with self._lock:
+            if self._cut_at is not None:
+                _, next_path = self._cut_at
+                self._cut_result = self._close_wav()
+                if next_path is not None and not self.failed:
+                    self._open_wav(next_path)
+                self._cut_at = None
+            result = self._cut_result
+            closed = self._close_done
+        # The finished WAV is only complete once the writer has closed it.
+        if closed is not None:
+            closed.wait(timeout=10)
+        if not self.active:
+            if self._thread is not None:
+                self._thread.join(timeout=AUDIO_CHUNK / self.rate + 0.5)
+            self._writer.stop()
+        return result
+
+    # ---- WAV helpers (caller holds self._lock) --------------------------------
+    def _open_wav(self, path: str) -> None:
+        self._writer.open(path)
+        self._wav_path  = path
+        self._wrote_any = False
+        self.clock      = _AudioClock(self.rate)
+        self.silence    = _SilenceMap(self.rate)
+
+    def _close_wav(self) -> tuple:
+        path, clock      = self._wav_path, self.clock
+        empty            = not self._wrote_any
+        self._wav_path   = None
+        self._close_done = self._writer.close(remove=empty)
+        return (None if empty else path), clock, self.silence
+
+    def _write(self, data, ts: float, n: int, silent: bool = False) -> None:
+        clock = self.clock
+        gap   = clock.gap_frames_for(ts, n)
+        if gap:
+            silence = memoryview(bytes(self.rate * self.frame_bytes))   # 1 s block
+            left    = gap
+            while left > 0:
+                step  = min(left, self.rate)
+                self._writer.write(silence[:step * self.frame_bytes])
+                left -= step
+            clock.gap_frames += gap
+            clock.frames     += gap
+            if len(clock.gaps) < _AUDIO_GAP_LOG_MAX:
+                clock.gaps.append((ts, gap / self.rate))
+            self._m_overruns.value += 1
+            self._m_gap_s.value    += gap / self.rate
+            self.silence.add(gap, True)
+        self._writer.write(data)
+        clock.add(ts, n)
+        self.silence.add(n, silent)
+        self._wrote_any = True
+
+    # ---- level meter (capture thread) ----------------------------------------
+    def _meter(self, data, ts: float, n: int) -> int:
+        """
+        Accumulate per-channel peak and sum of squares for one chunk and
+        publish dBFS levels every _LEVEL_UPDATE_INTERVAL.  The chunk is viewed
+        in place (np.frombuffer) and einsum accumulates in int64 without
+        materialising a widened copy.  Returns the chunk's peak sample
+        magnitude across all channels (used for silence detection).
+        """
+        if n == 0:
+            return 0
+        a     = np.frombuffer(data, dtype=np.int16, count=n * self.channels)
+        a     = a.reshape(n, self.channels)
+        peak  = np.maximum(a.max(axis=0).astype(np.int32),
+                           -a.min(axis=0).astype(np.int32))
+        np.maximum(self._lv_peak, peak, out=self._lv_peak)
+        self._lv_sumsq  += np.einsum("ij,ij->j", a, a, dtype=np.int64)
+        self._lv_frames += n
+        chunk_peak       = int(peak.max())
+
+        if ts - self._lv_since < _LEVEL_UPDATE_INTERVAL:
+            return chunk_peak
+        with np.errstate(divide="ignore"):
+            peak_db = 20.0 * np.log10(self._lv_peak / _LEVEL_FULL_SCALE)
+            rms_db  = 10.0 * np.log10(self._lv_sumsq / self._lv_frames
+                                      / (_LEVEL_FULL_SCALE ** 2))
+        self.levels = (ts, tuple(peak_db.tolist()), tuple(rms_db.tolist()))
+        self._lv_peak[:]  = 0
+        self._lv_sumsq[:] = 0
+        self._lv_frames   = 0
+        self._lv_since    = ts
+        return chunk_peak
+
+    # ---- capture thread -----------------------------------------------------
+    def _consume(self, view, ts: float, n: int, silent: bool) -> bool:
+        """
+        Write n frames ending at media time ts, splitting them at a pending
+        cut by sample count.  Caller holds self._lock.  Returns False once
+        the stream should stop (cut with no next segment).
+        """
+        fb  = self.frame_bytes
+        cut = self._cut_at
+        if cut is None or ts < cut[0]:
+            if n:
+                self._write(view, ts, n, silent)
+            return True
+
+        # This chunk straddles the cut: split it by sample count.  A chunk
+        # with signal is re-classified per half, so a sound just before the
+        # cut does not mark the next segment's first samples as non-silent.
+        t_cut, next_path = cut
+        head = min(max(n - int(round((ts - t_cut) * self.rate)), 0), n)
+        if head:
+            part = view[:head * fb]
+            self._write(part, ts - (n - head) / self.rate, head,
+                        silent or _pcm_silent(part))
+        self._cut_result = self._close_wav()
+        self._cut_at     = None
+        if next_path is not None:
+            self._open_wav(next_path)
+            if head < n:
+                part = view[head * fb:]
+                self._write(part, ts, n - head, silent or _pcm_silent(part))
+        self._cut_done.set()
+        return next_path is not None
+
+    def _run(self) -> None:
+        fb    = self.frame_bytes
+        pause = _pause_clock
+        hist  = _telemetry.stage(f"audio_read ({self.label})")
+        perf  = time.perf_counter
+        try:
+            while True:
+                t_read = perf()
                 try:
-                    data = stream.read(AUDIO_CHUNK, exception_on_overflow=False)
-                    wf.writeframes(data)
-                    wrote_any = True
+                    data = self._stream.read(AUDIO_CHUNK, exception_on_overflow=False)
                 except OSError:
+                    # Device unplugged / default device switched: the stream is
+                    # dead.  Re-probe this device only; the others keep running.
+                    self.failed = True
+                    _audio_devices_stale.add(self.label)
                     break
-    finally:
-        stream.stop_stream()
-        stream.close()
+                ts = perf()
+                hist.span(t_read, ts)
+                n  = len(data) // fb
+
+                # Drop whatever was captured while paused; the rest is
+                # re-stamped in media time.  No pause yet -> one whole piece.
+                if pause.ever_paused:
+                    pieces = pause.live_pieces(ts, n, self.rate)
+                else:
+                    pieces = [(0, n, ts)]
+                silent = (not pieces
+                          or self._meter(data, ts, n) <= _SILENCE_PEAK_MAX)
+                whole  = len(pieces) == 1 and pieces[0][1] - pieces[0][0] == n
+
+                with self._lock:
+                    if self._wav_path is None:
+                        break
+                    view = memoryview(data)
+                    more = True
+                    for i0, i1, t_end in pieces:
+                        piece = view[i0 * fb:i1 * fb]
+                        more  = self._consume(piece, t_end, i1 - i0,
+                                              silent or (not whole and _pcm_silent(piece)))
+                        if not more:
+                            break
+                    if more and not pieces:
+                        # Fully paused chunk: still honour a cut (Stop while paused).
+                        more = self._consume(view[:0], pause.to_media(ts), 0, True)
+                    if not more:
+                        break
+        finally:
+            try:
+                self._stream.stop_stream()
+                self._stream.close()
+            except OSError:
+                pass
 
-    if not wrote_any and os.path.exists(wav_path):
-        try:
-            os.remove(wav_path)
-        except OSError:
-            pass
+
+class _AudioSession:
+    """
+    The audio side of one recording session: system loopback + microphone.
+
+    Streams are opened at the first segment and kept open across splits.
+    Device info comes from the _get_audio_devices() cache and is only
+    re-probed after a device-change notification (a stream error, or an
+    explicit notify_audio_device_change()); the affected streams are then
+    closed at the next segment boundary and re-opened on the new devices.
+    """
+
+    def __init__(self, pa: pyaudio.PyAudio, config: dict | None = None):
+        config         = config or {}
+        self._pa       = pa
+        self._flush    = float(config.get("audio_flush_interval", _AUDIO_FLUSH_DEFAULT))
+        self._replay   = (float(config.get("replay_seconds", _REPLAY_SECONDS_DEFAULT))
+                          if config.get("replay_mode") else None)
+        self._captures: dict[str, _AudioCapture] = {}
+        self._collecting = None          # Event of the collect() in progress
+
+    def begin_segment(self, segment_num: int) -> dict:
+        """Start any device not already capturing; return {label: device_info}."""
+        for label, info in _get_audio_devices().items():
+            if info is None or label in self._captures:
+                continue
+            cap = _AudioCapture(self._pa, info, label, self._flush, self._replay)
+            if cap.start(_audio_wav_path(label, segment_num)):
+                self._captures[label] = cap
+        return {label: cap.info for label, cap in self._captures.items()}
+
+    def cut(self, t_cut: float, next_segment_num: int | None) -> None:
+        """
+        Request every stream to end the current segment at t_cut.  Streams
+        continue into next_segment_num's WAV unless the session is ending or
+        the device has changed, in which case they close.
+        """
+        for label, cap in self._captures.items():
+            keep = (next_segment_num is not None and not cap.failed
+                    and label not in _audio_devices_stale)
+            cap.request_cut(t_cut,
+                            _audio_wav_path(label, next_segment_num) if keep else None)
+
+    def collect(self) -> dict:
+        """
+        Wait for the cut; return {label: (wav_path or None, _AudioClock,
+        writer stats for the segment, _SilenceMap)}.  Each finished WAV's
+        silence sidecar is written here, off the capture thread.  Devices
+        are waited on in parallel, so stop latency is the slowest device's.
+        abort() ends the wait early; devices that had not finished are then
+        left out of the result and dropped from the session (re-opened, after
+        a re-probe, at the next segment).
+        """
+        caps    = list(self._captures.items())
+        results = {}
+        left    = [len(caps)]
+        lock    = threading.Lock()
+        done    = threading.Event()
+        self._collecting = done
+        if not caps:
+            done.set()
+
+        def _collect(label, cap):
+            try:
+                results[label] = cap.collect()
+            finally:
+                with lock:
+                    left[0] -= 1
+                    if left[0] == 0:
+                        done.set()
+
+        threads = [threading.Thread(target=_pinned(_collect), args=(label, cap),
+                                    daemon=True, name=f"collect-{label}")
+                   for label, cap in caps]
+        for t in threads:
+            t.start()
+        done.wait()
+        self._collecting = None
+
+        finished = {}
+        for label, cap in caps:
+            if label not in results:
+                if left[0]:
+                    print(f"  WARNING: audio {label} did not finish its cut in time; "
+                          f"left out of this segment")
+                    cap.failed = True
+                    _audio_devices_stale.add(label)
+                    self._captures.pop(label, None)
+                continue
+            path, clock, silence = results[label]
+            if path is not None and not self._replay:
+                silence.save(path)
+            finished[label] = (path, clock, cap.writer.take_segment_stats(), silence)
+            if not cap.active:
+                del self._captures[label]
+        return finished
+
+    def abort(self) -> None:
+        """Stop-deadline kill: make a collect() in progress return now."""
+        done = self._collecting
+        if done is not None:
+            done.set()
+
+    def replay_audio(self, t0: float, t1: float) -> dict:
+        """Replay mode: {label: (pcm, channels, sampwidth, rate)} for media time [t0, t1)."""
+        out = {}
+        for label, cap in list(self._captures.items()):
+            pcm = cap.replay_pcm(t0, t1)
+            if pcm:
+                out[label] = (pcm, cap.channels, cap.sampwidth, cap.rate)
+        return out
+
+    def writer_stats(self) -> dict:
+        """{label: cumulative _WavWriter.stats()} for the open streams."""
+        return {label: cap.writer.stats() for label, cap in list(self._captures.items())}
+
+    def held_bytes(self) -> int:
+        """PCM held in memory by the open streams' writers / replay rings."""
+        return sum(cap.writer.held_bytes for cap in list(self._captures.values()))
+
+    def levels(self) -> dict:
+        """{label: latest level snapshot tuple} for streams that have published one."""
+        snap = {}
+        for label, cap in list(self._captures.items()):
+            lv = cap.levels
+            if lv is not None:
+                snap[label] = lv
+        return snap
+
+    def close(self) -> None:
+        """Stop every stream now and delete any partial WAVs."""
+        self.cut(time.perf_counter(), None)
+        for path, _clock, _stats, _silence in self.collect().values():
+            if path:
+                _remove_audio_files(path)
 
 
 # ===========================================================================
 # ffmpeg mux  —  stream-copy video, encode audio only
 # ===========================================================================
 def _mux(video_buf: "_VideoBuffer", loopback_wav, mic_wav,
-         output_path: str, config: dict):
+         output_path: str, config: dict, audio_sync: dict | None = None):
     """
     Mux pre-encoded H.264 (from _VideoBuffer) with up to two WAV audio sources.
 
@@ -551,15 +2540,25 @@ def _mux(video_buf: "_VideoBuffer", loopback_wav, mic_wav,
       - Spill path  : video is read from the spill .h264 file on disk.
     Either way, no libx264 re-encode happens here.
 
+    audio_sync maps a WAV path to its _AudioClock.sync_info(); inputs whose
+    measured drift / start offset is significant are re-timed onto the video
+    clock (see _audio_sync_filter) before mixing.
+
+    A WAV whose silence sidecar marks it silent throughout is left out of
+    the mix entirely (no decode, filter or encode work for it).  If every
+    track is silent, one is kept and encoded at _SILENT_TRACK_KBPS.
+
     Mux time: 5-60 seconds (AAC audio encode + container remux only).
-    After ffmpeg finishes reading, video_buf.discard() frees RAM / deletes the
-    spill file so the previous segment's storage is reclaimed immediately.
+    After ffmpeg exits, video_buf.discard() frees RAM / deletes the spill
+    file so the previous segment's storage is reclaimed immediately.
+    Returns True if ffmpeg exited cleanly.
     """
     import imageio_ffmpeg
 
-    ffmpeg = imageio_ffmpeg.get_ffmpeg_exe()
-    cmd    = [ffmpeg, "-y",
-              "-threads", str(_thread_cap)]
+    ffmpeg  = imageio_ffmpeg.get_ffmpeg_exe()
+    threads = _mux_thread_cap()
+    cmd     = [ffmpeg, "-y",
+               "-threads", str(threads)] + _PROGRESS_ARGS
 
     # ---- video input -------------------------------------------------------
     if video_buf.spilled:
@@ -572,28 +2571,51 @@ def _mux(video_buf: "_VideoBuffer", loopback_wav, mic_wav,
         feeder_thread = None      # created after Popen below
 
     # ---- audio inputs ------------------------------------------------------
+    wavs   = [wav for wav in (loopback_wav, mic_wav)
+              if wav and os.path.exists(wav) and os.path.getsize(wav) > 44]
+    silent = [wav for wav in wavs
+              if (_load_silence_map(wav) or {}).get("fully_silent")]
+    all_silent = bool(wavs) and len(silent) == len(wavs)
+    if all_silent:
+        silent = silent[1:]          # keep one track so the file has audio
+
     audio_src_indices = []
-    for wav in (loopback_wav, mic_wav):
-        if wav and os.path.exists(wav) and os.path.getsize(wav) > 44:
-            cmd += ["-i", wav]
-            audio_src_indices.append(len(audio_src_indices) + 1)
+    audio_filters     = []      # per-input clock correction (None = as-is)
+    audio_sync        = audio_sync or {}
+    for wav in wavs:
+        if wav in silent:
+            continue
+        cmd += ["-i", wav]
+        audio_src_indices.append(len(audio_src_indices) + 1)
+        audio_filters.append(_audio_sync_filter(audio_sync.get(wav)))
 
     # ---- stream-copy video; encode audio -----------------------------------
     cmd += ["-c:v", "copy"]
 
     if len(audio_src_indices) == 2:
-        fc = (f"[{audio_src_indices[0]}:a][{audio_src_indices[1]}:a]"
-              f"amix=inputs=2:duration=first:dropout_transition=0:normalize=0[aout]")
-        cmd += ["-filter_complex", fc,
-                "-filter_complex_threads", str(_thread_cap),
+        fc_parts = []
+        labels   = []
+        for idx, af in zip(audio_src_indices, audio_filters):
+            if af:
+                fc_parts.append(f"[{idx}:a]{af}[a{idx}]")
+                labels.append(f"[a{idx}]")
+            else:
+                labels.append(f"[{idx}:a]")
+        fc_parts.append(f"{labels[0]}{labels[1]}"
+                        f"amix=inputs=2:duration=first:dropout_transition=0:normalize=0[aout]")
+        cmd += ["-filter_complex", ";".join(fc_parts),
+                "-filter_complex_threads", str(threads),
                 "-map", "0:v", "-map", "[aout]"]
     elif len(audio_src_indices) == 1:
         cmd += ["-map", "0:v", "-map", f"{audio_src_indices[0]}:a"]
+        if audio_filters[0]:
+            cmd += ["-af", audio_filters[0]]
     else:
         cmd += ["-map", "0:v"]
 
     if audio_src_indices:
-        bitrate_kbps = configure.effective_audio_bitrate(config)
+        bitrate_kbps = (_SILENT_TRACK_KBPS if all_silent
+                        else configure.effective_audio_bitrate(config))
         cmd += ["-c:a", "aac", "-b:a", f"{bitrate_kbps}k"]
 
     cmd += [output_path]
@@ -601,27 +2623,41 @@ def _mux(video_buf: "_VideoBuffer", loopback_wav, mic_wav,
     src_desc = (f"spill:{os.path.basename(video_buf.spill_path)}"
                 if video_buf.spilled
                 else f"RAM:{video_buf.ram_size_mb:.0f} MB")
+    silent_desc = ""
+    if silent or all_silent:
+        names = [("loopback" if w == loopback_wav else "mic") for w in silent]
+        silent_desc = (f", silent: {'+'.join(names)} dropped" if names else "")
+        if all_silent:
+            silent_desc += f", silent track @ {_SILENT_TRACK_KBPS}k"
     print(f"Muxing (BG)  -> {os.path.basename(output_path)}"
           f"  [stream copy + AAC, src={src_desc}, "
-          f"threads={_thread_cap}/{os.cpu_count() or 2}]")
+          f"threads={threads}/{os.cpu_count() or 2}{silent_desc}]")
 
     stdin_pipe = subprocess.PIPE if not video_buf.spilled else None
 
-    proc = subprocess.Popen(
-        cmd,
+    proc = _popen_pinned(
+        cmd, "mux",
         stdin  = stdin_pipe,
         stdout = subprocess.DEVNULL,
         stderr = subprocess.PIPE,
     )
+    _lower_process_priority(proc.pid)
+    _mux_procs[output_path] = proc
 
     # ---- stderr drainer thread ---------------------------------------------
     # CRITICAL: ffmpeg writes progress stats to stderr continuously.
     # If stderr is piped but never read, the 64 KB OS pipe buffer fills and
     # ffmpeg blocks trying to write more output.  proc.wait() then waits for
     # ffmpeg to exit, ffmpeg never exits → deadlock.
-    # This thread drains stderr into a list so it is always available for
-    # error reporting without ever blocking ffmpeg.
-    _stderr_buf: list[bytes] = []
+    # This thread drains stderr, parsing the -progress reports (published
+    # in _mux_progress for percent-complete) and keeping the log's tail and
+    # warning / error lines in a fixed-size ring for error reporting,
+    # without ever blocking ffmpeg.
+    stderr_log = ffmpeg_log.LogRing(_STDERR_RING_BYTES)
+    progress  = ffmpeg_log.Progress()
+    frames    = video_buf.index.frame_count
+    fps       = config.get("fps") or 0
+    _mux_progress[output_path] = (progress, frames / fps if frames and fps else None)
 
     def _stderr_drainer():
         try:
@@ -629,11 +2665,12 @@ def _mux(video_buf: "_VideoBuffer", loopback_wav, mic_wav,
                 chunk = proc.stderr.read(4096)
                 if not chunk:
                     break
-                _stderr_buf.append(chunk)
+                stderr_log.write(progress.feed(chunk))
         except OSError:
             pass
+        stderr_log.write(progress.flush())
 
-    stderr_thread = threading.Thread(target=_stderr_drainer, daemon=True,
+    stderr_thread = threading.Thread(target=_pinned(_stderr_drainer), daemon=True,
                                       name="mux-stderr")
     stderr_thread.start()
 
@@ -652,11 +2689,13 @@ def _mux(video_buf: "_VideoBuffer", loopback_wav, mic_wav,
                 pass
 
     if not video_buf.spilled:
-        feeder_thread = threading.Thread(target=_feed_stdin, daemon=True,
+        feeder_thread = threading.Thread(target=_pinned(_feed_stdin), daemon=True,
                                          name="mux-feeder")
         feeder_thread.start()
 
     ret = proc.wait()
+    _mux_procs.pop(output_path, None)
+    _mux_progress.pop(output_path, None)
 
     if feeder_thread is not None:
         feeder_thread.join(timeout=30)
@@ -667,52 +2706,1066 @@ def _mux(video_buf: "_VideoBuffer", loopback_wav, mic_wav,
     # Free RAM / delete spill file now that ffmpeg has consumed the buffer.
     video_buf.discard()
 
-    if ret != 0:
-        stderr_text = b"".join(_stderr_buf).decode(errors="replace")
+    if ret != 0 and not _mux_handoff.is_set():
         print(f"WARNING: ffmpeg mux failed for {os.path.basename(output_path)}.")
-        print(stderr_text[-2000:])
+        print(stderr_log.text())
+    return ret == 0
+
+
+# ===========================================================================
+# Mux scheduler  —  RAM-first priority queue, low OS priority
+# ===========================================================================
+def _lower_process_priority(pid: int) -> None:
+    """Drop a mux ffmpeg to below-normal CPU and low I/O priority (best effort)."""
+    try:
+        import psutil
+        proc = psutil.Process(pid)
+        if os.name == "nt":
+            proc.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+            proc.ionice(psutil.IOPRIO_LOW)
+        else:
+            proc.nice(_MUX_NICE_POSIX)
+            if hasattr(psutil, "IOPRIO_CLASS_BE"):
+                proc.ionice(psutil.IOPRIO_CLASS_BE, value=7)
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"WARNING: could not lower mux priority: {e}")
+
+
+class _MuxScheduler:
+    """
+    Worker pool for segment mux jobs, ordered by the RAM each job frees.
+
+    Jobs wait in a priority queue keyed on the in-RAM size of their video
+    buffer, so when several segments are pending (several short splits,
+    or a slow output disk) the one holding the most memory is muxed first.
+    Spilled buffers hold no RAM and go last; ties run in submission order.
+    submit() returns a concurrent.futures.Future, and shutdown(wait=False)
+    lets queued jobs finish, as ThreadPoolExecutor does; cancel_queued()
+    drops them instead (exit handoff).
+
+    Per-job queue wait and run time are recorded for the monitor.
+    """
+
+    _STOP = float("inf")      # sentinel priority: sorts after every real job
+
+    def __init__(self, workers: int):
+        self.workers   = max(1, int(workers))
+        self._q        = _queue.PriorityQueue()
+        self._seq      = 0
+        self._lock     = threading.Lock()
+        self._queued   = 0
+        self._running  = 0
+        self._closed   = False
+        self._done     = 0
+        self._wait_sum = 0.0
+        self._run_sum  = 0.0
+        self._last     = (0.0, 0.0)        # (wait, run) of the latest finished job
+        self._threads  = [
+            threading.Thread(target=_pinned(self._worker), daemon=True, name=f"mux-{i}")
+            for i in range(self.workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, priority_bytes: int, fn, *args) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("mux scheduler is shut down")
+            self._seq    += 1
+            self._queued += 1
+            self._q.put((-priority_bytes, self._seq, (future, fn, args, time.perf_counter())))
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for _ in self._threads:
+                self._seq += 1
+                self._q.put((self._STOP, self._seq, None))
+        if wait:
+            for t in self._threads:
+                t.join()
+
+    def cancel_queued(self) -> int:
+        """
+        Exit handoff: stop accepting jobs and cancel every job that has not
+        started (running jobs carry on).  Returns the number cancelled.
+        """
+        with self._lock:
+            was_closed, self._closed = self._closed, True
+            keep, cancelled = [], 0
+            while True:
+                try:
+                    item = self._q.get_nowait()
+                except _queue.Empty:
+                    break
+                if item[2] is None:
+                    keep.append(item)               # a worker's stop sentinel
+                    continue
+                item[2][0].cancel()
+                self._queued -= 1
+                cancelled    += 1
+            for item in keep:
+                self._q.put(item)
+            if not was_closed:
+                for _ in self._threads:
+                    self._seq += 1
+                    self._q.put((self._STOP, self._seq, None))
+        return cancelled
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self._done
+            return {
+                "workers":    self.workers,
+                "queued":      self._queued,
+                "running":     self._running,
+                "completed":   done,
+                "wait_s_avg":  self._wait_sum / done if done else 0.0,
+                "run_s_avg":   self._run_sum / done if done else 0.0,
+                "wait_s_last": self._last[0],
+                "run_s_last":  self._last[1],
+            }
+
+    def _worker(self) -> None:
+        while True:
+            _prio, _seq, job = self._q.get()
+            if job is None:
+                break
+            future, fn, args, t_submit = job
+            with self._lock:
+                self._queued -= 1
+            if not future.set_running_or_notify_cancel():
+                continue
+            t_start = time.perf_counter()
+            with self._lock:
+                self._running += 1
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                t_end = time.perf_counter()
+                with self._lock:
+                    self._running  -= 1
+                    self._done     += 1
+                    self._wait_sum += t_start - t_submit
+                    self._run_sum  += t_end - t_start
+                    self._last      = (t_start - t_submit, t_end - t_start)
+
+
+def get_mux_stats() -> dict:
+    """
+    Mux scheduler figures for the monitor: {"workers", "queued", "running",
+    "completed", "wait_s_avg", "run_s_avg", "wait_s_last", "run_s_last"}.
+    After a session ends the last session's figures are returned.
+    """
+    sched = _mux_scheduler
+    return sched.stats() if sched is not None else {}
+
+
+def _mux_thread_cap() -> int:
+    """ffmpeg -threads for one mux job: the thread budget shared by the workers."""
+    sched  = _mux_scheduler
+    layout = get_core_layout()
+    cores  = len(layout["mux"]) if layout["enabled"] else _thread_cap
+    return max(1, cores // (sched.workers if sched is not None else 1))
 
 
 # ===========================================================================
 # Background mux-and-cleanup task
 # ===========================================================================
+class _MuxJob:
+    """
+    One journalled segment mux and how far it has got.
+
+    state moves queued -> running -> done, changed under _pending_mux_lock;
+    a job that sees the exit handoff already under way when it would start
+    does not start.  `finished` holds the parts ("video", "proxy") whose
+    output has been written.  The handoff holds `lock` while it persists a
+    job's unfinished parts (recording them in `saved`), and the worker
+    holds it while marking a part finished, so a part is either persisted
+    for the next launch or recorded as done - never both.
+    """
+
+    __slots__ = ("id", "video_buf", "proxy_buf", "final_path", "proxy_path",
+                 "state", "finished", "saved", "lock", "settled")
+
+    def __init__(self, job_id: str | None, video_buf: "_VideoBuffer", final_path: str,
+                 proxy: tuple | None):
+        self.id         = job_id
+        self.video_buf  = video_buf
+        self.proxy_buf  = proxy[0] if proxy else None
+        self.final_path = final_path
+        self.proxy_path = proxy[1] if proxy else None
+        self.state      = "queued"
+        self.finished   = set()
+        self.saved      = {}                    # part -> persisted .h264 path
+        self.lock       = threading.Lock()
+        self.settled    = threading.Event()     # worker has finished with the job
+
+    def part_done(self, part: str) -> None:
+        """A part's output is written: make sure the next launch never redoes it."""
+        with self.lock:
+            self.finished.add(part)
+            path = self.saved.pop(part, None)
+            if path is None or self.id is None or _mux_journal is None:
+                return
+            # Persisted by a handoff that raced the mux's last moments.
+            key = "video" if part == "video" else "proxy_video"
+            _mux_journal.update(self.id, **{key: None, f"{part}_done": True})
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
 def _mux_and_cleanup(video_buf: "_VideoBuffer",
                      lb_wav: str | None, mic_wav: str | None,
-                     final_path: str, config: dict):
+                     final_path: str, config: dict,
+                     audio_sync: dict | None = None,
+                     proxy: tuple | None = None,
+                     job: "_MuxJob | None" = None):
     """
-    Runs in a ThreadPoolExecutor worker.
+    Runs in a _MuxScheduler worker.
     1. Mux H.264 buffer + audio WAVs -> final_path  (stream copy, seconds).
     2. _mux() calls video_buf.discard() on completion  -> RAM freed.
-    3. Delete audio WAV temp files.
-    4. Update shared globals.
+    3. Same for the editing proxy, if any: (proxy buffer, proxy path).
+    4. Delete audio WAV temp files and their silence sidecars.
+    5. Drop the job's mux-journal entry and update shared globals.
+    If the exit handoff persisted an unfinished part of the job, 4-5 are
+    skipped so the next launch can finish it from the journal.
     """
     global last_output_file, pending_mux_count
 
+    with _pending_mux_lock:
+        if _mux_handoff.is_set():
+            # Exit handoff began first: the job was persisted, not run.
+            pending_mux_count = max(0, pending_mux_count - 1)
+            if job is not None:
+                job.settled.set()
+            return
+        if job is not None:
+            job.state = "running"
+
+    t_mux = time.perf_counter()
+    ok    = False
     try:
-        _mux(video_buf, lb_wav, mic_wav, final_path, config)
+        ok = _mux(video_buf, lb_wav, mic_wav, final_path, config, audio_sync)
+        if ok and job is not None:
+            job.part_done("video")
+        if proxy is not None and ok and not _mux_handoff.is_set():
+            if _mux(proxy[0], lb_wav, mic_wav, proxy[1], config, audio_sync):
+                if job is not None:
+                    job.part_done("proxy")
+                print(f"Proxy saved   : {proxy[1]}")
     finally:
-        for p in filter(None, (lb_wav, mic_wav)):
-            try:
-                if os.path.exists(p):
-                    os.remove(p)
-            except OSError:
-                pass
+        profiling.span("mux", t_mux, time.perf_counter())
+        if proxy is not None:
+            proxy[0].discard()
+        handed_off = False
+        if job is not None:
+            with job.lock:
+                handed_off = bool(job.saved)
+        if not handed_off:
+            for p in filter(None, (lb_wav, mic_wav)):
+                _remove_audio_files(p)
+            if job is not None and job.id is not None and _mux_journal is not None:
+                _mux_journal.remove(job.id)
 
         with _pending_mux_lock:
             pending_mux_count = max(0, pending_mux_count - 1)
-
-    if os.path.exists(final_path):
+            if job is not None:
+                job.state = "done"
+                _mux_inflight.discard(job)
+        if job is not None:
+            job.settled.set()
+
+    if handed_off:
+        print(f"  Mux handed off: {os.path.basename(final_path)} completes on next launch")
+        return
+    if ok and os.path.exists(final_path):
         last_output_file = final_path
-        print(f"Segment saved : {final_path}")
+        mux_s            = time.perf_counter() - t_mux
+        _m_mux_s.observe(mux_s)
+        print(f"Segment saved : {final_path}  (mux {mux_s:.1f} s)")
+        if config.get("fast_capture", False) and _recompressor is not None:
+            _recompressor.enqueue(final_path, config)
     else:
+        with _pending_mux_lock:          # mux workers share this counter
+            _m_mux_failed.inc()
         print(f"WARNING: expected output not found: {final_path}")
 
+# ---------------------------------------------------------------------------
+# Mux journal: submit, hand off at exit, resume at launch
+# ---------------------------------------------------------------------------
+def _submit_segment_mux(sched: "_MuxScheduler", video_buf: "_VideoBuffer",
+                        lb_wav, mic_wav, final_path: str, config: dict,
+                        audio_sync: dict | None, proxy: tuple | None,
+                        job_id: str | None = None) -> concurrent.futures.Future:
+    """
+    Journal a segment mux job (unless resuming one that already is) and
+    queue it on `sched`, prioritised by the RAM it will free.
+    """
+    global pending_mux_count
+
+    proxy_buf = proxy[0] if proxy else None
+    if job_id is None and _mux_journal is not None:
+        job_id = _mux_journal.add({
+            "final_path":  final_path,
+            "lb_wav":      lb_wav,
+            "mic_wav":     mic_wav,
+            "config":      config,
+            "audio_sync":  audio_sync,
+            "proxy_path":  proxy[1] if proxy else None,
+            # Filled in when the job is handed off (or already on disk).
+            "video":       video_buf.spill_path if video_buf.spilled else None,
+            "proxy_video": (proxy_buf.spill_path
+                            if proxy_buf is not None and proxy_buf.spilled else None),
+        })
+    job = _MuxJob(job_id, video_buf, final_path, proxy)
+    with _pending_mux_lock:
+        pending_mux_count += 1
+        _mux_inflight.add(job)
+
+    ram_mb = video_buf.ram_size_mb + (proxy_buf.ram_size_mb if proxy_buf else 0)
+    future = sched.submit(int(ram_mb * 1024 * 1024),
+                          _mux_and_cleanup, video_buf, lb_wav, mic_wav, final_path,
+                          config, audio_sync, proxy, job)
+    future.add_done_callback(_log_mux_error)
+    return future
+
+
+def _log_mux_error(future: concurrent.futures.Future) -> None:
+    """Nobody waits on segment mux futures any more; report failures here."""
+    if not future.cancelled() and future.exception() is not None:
+        print(f"  Mux error: {future.exception()}")
+
+
+def _hand_off_mux_jobs() -> int:
+    """
+    Exit path: persist every unfinished part of every mux job for the next
+    launch and stop the mux processes working on them.  Returns the number
+    of jobs handed off.
+
+    Order matters: the flag is raised (so no job starts any more) and the
+    scheduler closed before anything is persisted, and processes are
+    killed only after their input is on disk.  A part whose mux already
+    consumed its buffer cannot be persisted; it is left to finish.
+    """
+    with _pending_mux_lock:
+        _mux_handoff.set()
+        jobs = [j for j in _mux_inflight if j.state != "done"]
+    sched = _mux_scheduler
+    if sched is not None:
+        sched.cancel_queued()
+
+    tmp_dir = tempfile.gettempdir()
+    kill    = []
+    handed  = 0
+    for job in jobs:
+        if job.id is None or _mux_journal is None:
+            continue
+        entry = next(iter(_mux_journal.jobs(id=job.id)), None)
+        if entry is None:
+            continue
+        # A resumed proxy-only job muxes the proxy as its "video" part.
+        proxy_only = bool(entry.get("video_done"))
+        stem       = os.path.splitext(os.path.basename(job.final_path))[0]
+        with job.lock:
+            fields = {}
+            try:
+                for part, buf, out, key, suffix in (
+                        ("video", job.video_buf, job.final_path,
+                         "proxy_video" if proxy_only else "video", ""),
+                        ("proxy", job.proxy_buf, job.proxy_path, "proxy_video", _PROXY_SUFFIX)):
+                    if buf is None or part in job.finished:
+                        continue
+                    path = buf.persist(os.path.join(tmp_dir, f"d264_mux_{stem}{suffix}.h264"))
+                    if path is None:
+                        continue            # mux already read it all; let it finish
+                    job.saved[part] = path
+                    fields[key]     = path
+                    kill.append(out)
+            except OSError as e:
+                print(f"WARNING: could not save pending mux of {stem}: {e}")
+            if fields:
+                fields["video_done"] = proxy_only or "video" in job.finished
+                _mux_journal.update(job.id, **fields)
+                handed += 1
+
+    for out in kill:
+        proc = _mux_procs.get(out)
+        if proc is not None:
+            try:
+                proc.kill()
+            except OSError:
+                pass
+
+    # Let the killed (and any nearly finished) jobs settle their journal
+    # entries before the process exits under them.
+    deadline = time.perf_counter() + _HANDOFF_WAIT_S
+    for job in jobs:
+        if job.state == "running":
+            job.settled.wait(max(0.0, deadline - time.perf_counter()))
+    if handed:
+        print(f"  Mux handoff  : {handed} unfinished job(s) saved; "
+              f"they complete on next launch")
+    return handed
+
+
+def _resume_mux_jobs() -> int:
+    """
+    Launch path: queue the journalled mux jobs of a previous run.  A job
+    whose video was already muxed resumes as its proxy's mux only.
+    """
+    global _mux_scheduler
+
+    jobs = _mux_journal.jobs()
+    sched = None
+    for job in jobs:
+        name   = os.path.basename(job["final_path"])
+        wavs   = [w for w in (job.get("lb_wav"), job.get("mic_wav")) if w]
+        pv     = job.get("proxy_video")
+        has_pv = bool(pv and os.path.isfile(pv) and job.get("proxy_path"))
+        video  = job.get("video")
+        if job.get("video_done"):
+            if not has_pv:
+                _mux_journal.remove(job["id"])
+                for w in wavs:
+                    _remove_audio_files(w)
+                continue
+        elif not video or not os.path.isfile(video):
+            # Left in RAM by a crash (no handoff) - the video is gone.
+            print(f"WARNING: pending mux of {name} has no saved video; dropped "
+                  f"(audio left in {tempfile.gettempdir()}).")
+            _mux_journal.remove(job["id"])
+            continue
+        if sched is None:
+            sched          = _MuxScheduler(_MUX_WORKERS_DEFAULT)
+            _mux_scheduler = sched
+        for wav in wavs:
+            if os.path.isfile(wav):
+                _repair_wav_header(wav)     # may be from a crashed run
+        if job.get("video_done"):
+            # Only the proxy is left; it is muxed as a job of its own.
+            _submit_segment_mux(sched, _VideoBuffer.from_file(pv),
+                                job.get("lb_wav"), job.get("mic_wav"), job["proxy_path"],
+                                dict(job["config"], fast_capture=False),
+                                job.get("audio_sync"), None, job["id"])
+            print(f"  Mux resumed  : {os.path.basename(job['proxy_path'])} (proxy)")
+            continue
+        proxy = (_VideoBuffer.from_file(pv), job["proxy_path"]) if has_pv else None
+        _submit_segment_mux(sched, _VideoBuffer.from_file(video),
+                            job.get("lb_wav"), job.get("mic_wav"), job["final_path"],
+                            job["config"], job.get("audio_sync"), proxy, job["id"])
+        print(f"  Mux resumed  : {name}")
+    if sched is None:
+        return 0
+    sched.shutdown(wait=False)     # queued jobs still run
+    return len(_mux_journal)
+
+
+# ===========================================================================
+# Idle-time recompression of fast-capture segments
+# ===========================================================================
+_DURATION_RE = re.compile(rb"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+
+
+def _probe_duration(ffmpeg: str, path: str) -> float | None:
+    """Container duration in seconds from ffmpeg's input banner, or None."""
+    try:
+        out = subprocess.run([ffmpeg, "-hide_banner", "-i", path],
+                             capture_output=True, timeout=60).stderr
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    m = _DURATION_RE.search(out)
+    if m is None:
+        return None
+    hh, mm, ss = m.groups()
+    return int(hh) * 3600 + int(mm) * 60 + float(ss)
+
+
+class _Recompressor:
+    """
+    Background thread that re-encodes fast-capture segments to their profile.
+
+    Jobs live in a scripts.journal.Journal, so segments queued before an
+    exit or crash are picked up on the next start.  A job is
+    {"path", "profile", "tries"}.  The encode writes a hidden temp file next
+    to the original (same volume, so the final os.replace is atomic), video
+    re-encoded with the profile's settings, audio stream-copied.
+    """
+
+    def __init__(self, journal_path: str):
+        self.journal     = journal.Journal(journal_path)
+        self._stop       = threading.Event()
+        self._proc       = None
+        self._active     = None
+        self._idle_since = None
+        self._thread     = threading.Thread(target=_pinned(self._run), daemon=True,
+                                            name="recompress")
+
+    def start(self) -> None:
+        if len(self.journal):
+            print(f"  Recompress   : {len(self.journal)} fast-capture segment(s) queued")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+        self._thread.join(timeout=10)
+
+    def enqueue(self, path: str, config: dict) -> None:
+        self.journal.add({
+            "path":    os.path.abspath(path),
+            "profile": config.get("video_compression", "Optimal Performance"),
+            "tries":   0,
+        })
+        print(f"  Recompress   : queued {os.path.basename(path)} "
+              f"({len(self.journal)} pending; runs when idle)")
+
+    def status(self) -> dict:
+        """{"pending": jobs in the journal, "active": file being encoded or None}."""
+        return {"pending": len(self.journal), "active": self._active}
+
+    # ---- idle detection --------------------------------------------------------
+    def _idle(self) -> bool:
+        """True once nothing is recorded / muxed and CPU stayed low for _RECOMPRESS_IDLE_S."""
+        busy = is_capturing or pending_mux_count > 0
+        if not busy:
+            try:
+                import psutil
+                busy = psutil.cpu_percent(interval=None) >= _RECOMPRESS_IDLE_CPU
+            except ImportError:
+                pass
+        now = time.monotonic()
+        if busy:
+            self._idle_since = None
+            return False
+        if self._idle_since is None:
+            self._idle_since = now
+        return now - self._idle_since >= _RECOMPRESS_IDLE_S
+
+    # ---- worker ------------------------------------------------------------------
+    def _run(self) -> None:
+        while not self._stop.wait(_RECOMPRESS_POLL_S):
+            jobs = self.journal.jobs()
+            if jobs and self._idle():
+                self._process(jobs[0])
+
+    def _process(self, job: dict) -> None:
+        import imageio_ffmpeg
+
+        src = job["path"]
+        if not os.path.isfile(src):
+            print(f"  Recompress   : {os.path.basename(src)} no longer exists; dropped")
+            self.journal.remove(job["id"])
+            return
+
+        ffmpeg = imageio_ffmpeg.get_ffmpeg_exe()
+        tmp    = os.path.join(os.path.dirname(src),
+                              _RECOMPRESS_TMP_PREFIX + os.path.basename(src))
+        cmd    = [ffmpeg, "-y", "-nostats", "-loglevel", "error",
+                  "-i", src, "-map", "0",
+                  "-c:v", "libx264", "-threads", str(_thread_cap)]
+        cmd   += configure.get_video_params({"video_compression": job["profile"]})
+        cmd   += ["-c:a", "copy", tmp]
+
+        self._active = os.path.basename(src)
+        t0 = time.perf_counter()
+        print(f"Recompress   -> {self._active}  [{job['profile']}, "
+              f"attempt {job['tries'] + 1}/{_RECOMPRESS_MAX_TRIES}]")
+        try:
+            # Idle-time only (killed when a capture starts): the whole budget.
+            self._proc = _popen_pinned(cmd, "recorder", stdin=subprocess.DEVNULL,
+                                       stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.PIPE)
+            _lower_process_priority(self._proc.pid)
+            # stderr is "-loglevel error" only, so reading it at the end is safe.
+            while self._proc.poll() is None:
+                if is_capturing or self._stop.is_set():
+                    self._proc.kill()
+                    self._proc.wait()
+                    print(f"  Recompress   : {self._active} interrupted "
+                          f"(recording started / exit); will restart when idle")
+                    _remove_quietly(tmp)
+                    return
+                time.sleep(0.5)
+            err = self._proc.stderr.read().decode(errors="replace")
+            ok  = self._proc.returncode == 0 and self._verify(ffmpeg, src, tmp)
+        except OSError as e:
+            err, ok = str(e), False
+        finally:
+            self._proc       = None
+            self._active     = None
+            self._idle_since = None
+
+        if ok:
+            old_size = os.path.getsize(src)
+            try:
+                os.replace(tmp, src)
+            except OSError as e:
+                err, ok = str(e), False
+        if ok:
+            self.journal.remove(job["id"])
+            print(f"Recompressed : {os.path.basename(src)}  "
+                  f"({old_size / (1024**2):.0f} MB -> {os.path.getsize(src) / (1024**2):.0f} MB, "
+                  f"{time.perf_counter() - t0:.0f} s)")
+            return
+
+        _remove_quietly(tmp)
+        tries = job["tries"] + 1
+        if tries >= _RECOMPRESS_MAX_TRIES:
+            self.journal.remove(job["id"])
+            print(f"WARNING: recompress of {os.path.basename(src)} failed {tries} times; "
+                  f"original kept.")
+        else:
+            self.journal.update(job["id"], tries=tries)
+            print(f"WARNING: recompress of {os.path.basename(src)} failed; will retry.")
+        if err:
+            print(err[-2000:])
+
+    @staticmethod
+    def _verify(ffmpeg: str, src: str, out: str) -> bool:
+        """Re-encode is complete: non-empty and its duration matches the original."""
+        if not os.path.isfile(out) or os.path.getsize(out) == 0:
+            return False
+        d_src = _probe_duration(ffmpeg, src)
+        d_out = _probe_duration(ffmpeg, out)
+        return (d_src is not None and d_out is not None
+                and abs(d_src - d_out) <= _RECOMPRESS_DURATION_TOL)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def get_recompress_status() -> dict:
+    """Idle-time recompression queue: {"pending", "active"} ({} before init)."""
+    rc = _recompressor
+    return rc.status() if rc is not None else {}
+
+
+# ===========================================================================
+# Editing proxy  —  second low-res encoder fed from the same frames
+# ===========================================================================
+def _proxy_size(w: int, h: int, height: int) -> tuple | None:
+    """Even (width, height) of the proxy, or None if it would not be smaller."""
+    ph = height - height % 2
+    if not ph or ph >= h:
+        return None
+    pw = int(round(w * ph / h / 2)) * 2
+    return pw, ph
+
+
+def _proxy_path(final_path: str) -> str:
+    """Name.mkv -> Name_proxy.mkv, next to the master."""
+    base, ext = os.path.splitext(final_path)
+    return f"{base}{_PROXY_SUFFIX}{ext}"
+
+
+class _ProxyEncoder:
+    """
+    Low-resolution libx264 encoder running beside the master encoder.
+
+    The grab loop hands each full-size BGR frame to put(), which never
+    blocks: if the proxy falls behind, the frame is not queued (never the
+    master's) and counted in `repeated` instead.  The writer thread scales
+    each queued frame once (cv2.resize, INTER_AREA), writes it to the proxy
+    ffmpeg and then writes the last scaled frame again for every frame not
+    queued since, so the frame-counted proxy stream keeps the master's
+    frame count and stays in sync with the shared audio.  Its output is
+    buffered in its own _VideoBuffer (RAM with disk spill, like the master)
+    and is muxed later with the same audio and sync data.
+
+    The process is pinned to the capture cores and dropped to below-normal
+    priority, so under contention the live master encoder wins.
+    """
+
+    def __init__(self, ffmpeg_exe: str, src_w: int, src_h: int, size: tuple,
+                 fps: int, threads: int, max_bytes: int, spill_path: str,
+                 segment_num: int):
+        self.size       = size
+        self.threads    = threads
+        self.video_buf  = _VideoBuffer(max_bytes=max_bytes, spill_path=spill_path)
+        self.frames     = 0             # frames written, repeats included
+        self.repeated   = 0             # frames not queued (grab loop only)
+        self._repaid    = 0             # repeats written so far (writer only)
+        self._src       = (src_w, src_h)
+        self._seg       = segment_num
+        self._q         = _queue.Queue(maxsize=_PROXY_QUEUE_DEPTH)
+        self._stderr    = ffmpeg_log.LogRing(_STDERR_RING_BYTES)
+        self._threads   = []
+        self._ps        = None          # psutil.Process for the CPU readout
+        pw, ph          = size
+        self._cmd = [
+            ffmpeg_exe, "-y", "-nostats",
+            "-f",          "rawvideo",
+            "-vcodec",     "rawvideo",
+            "-s",          f"{pw}x{ph}",
+            "-pix_fmt",    "bgr24",
+            "-r",          str(fps),
+            "-i",          "pipe:0",
+            "-c:v",        "libx264",
+            "-threads",    str(threads),
+            "-preset",     _PROXY_PRESET,
+            "-tune",       "fastdecode",
+            "-crf",        _PROXY_CRF,
+            "-g",          str(max(1, int(fps * _PROXY_GOP_S))),
+            "-bf",         "0",
+            "-pix_fmt",    "yuv420p",
+            "-an",
+            "-f", "h264",
+            "pipe:1",
+        ]
+        self._proc      = None
+        self.returncode = None
+
+    def start(self) -> bool:
+        try:
+            self._proc = _popen_pinned(
+                self._cmd, "capture",
+                stdin  = subprocess.PIPE,
+                stdout = subprocess.PIPE,
+                stderr = subprocess.PIPE,
+            )
+        except OSError as e:
+            print(f"WARNING: could not launch proxy encoder: {e}")
+            self.video_buf.discard()
+            return False
+        _lower_process_priority(self._proc.pid)
+        for fn, name in ((self._drain_stderr, "proxy-stderr"),
+                         (self._read_stdout, "proxy-stdout"),
+                         (self._write_frames, "proxy-pipe")):
+            t = threading.Thread(target=_pinned(fn), daemon=True,
+                                 name=f"{name}-s{self._seg}")
+            t.start()
+            self._threads.append(t)
+        return True
+
+    # ---- grab loop side ------------------------------------------------------
+    @property
+    def queued_bytes(self) -> int:
+        """Full-size frames waiting in the proxy queue."""
+        return self._q.qsize() * self._src[0] * self._src[1] * 3
+
+    def put(self, bgr) -> None:
+        """Queue a full-size frame (the array is not modified); if full, owe a repeat."""
+        try:
+            self._q.put_nowait(bgr)
+        except _queue.Full:
+            self.repeated += 1
+
+    def finish(self) -> int:
+        """
+        Flush the encoder and wait for it; returns ffmpeg's exit code (also
+        kept in .returncode).  Unbounded: the caller's stop deadline ends
+        it with kill().
+        """
+        while True:
+            try:
+                self._q.put(None, timeout=0.5)
+                break
+            except _queue.Full:
+                if not self._threads[2].is_alive():   # writer gone (broken pipe)
+                    break
+        self._threads[2].join()
+        try:
+            self._proc.stdin.close()
+        except OSError:
+            pass
+        ret = self._proc.wait()
+        for t in self._threads[:2]:
+            t.join()
+        self.returncode = ret
+        if ret != 0:
+            print(f"  WARNING: proxy encoder exited with code {ret} for segment {self._seg}.")
+            print(self._stderr.text())
+        return ret
+
+    def kill(self) -> None:
+        try:
+            self._proc.kill()
+        except OSError:
+            pass
+
+    def stats(self) -> dict:
+        """{"size", "threads", "frames", "repeated", "cpu_pct"}; cpu_pct is
+        % of one core since the previous call (-1 when psutil is missing)."""
+        cpu = -1.0
+        try:
+            import psutil
+            if self._ps is None:
+                self._ps = psutil.Process(self._proc.pid)
+            cpu = self._ps.cpu_percent(None)
+        except ImportError:
+            pass
+        except Exception:
+            cpu = 0.0
+        return {"size": self.size, "threads": self.threads,
+                "frames": self.frames, "repeated": self.repeated, "cpu_pct": cpu}
+
+    # ---- threads ---------------------------------------------------------------
+    def _write_frames(self) -> None:
+        pw, ph  = self.size
+        stdin   = self._proc.stdin
+        last    = None
+        while True:
+            bgr = self._q.get()
+            if bgr is not None:
+                last = cv2.resize(bgr, (pw, ph), interpolation=cv2.INTER_AREA).tobytes()
+            # Repeats owed for frames put() could not queue (read once: the
+            # grab loop may add more meanwhile; they are paid next time).
+            owed = self.repeated - self._repaid if last is not None else 0
+            try:
+                if bgr is not None:
+                    stdin.write(last)
+                    self.frames += 1
+                for _ in range(owed):
+                    stdin.write(last)
+                self.frames  += owed
+                self._repaid += owed
+            except (BrokenPipeError, OSError):
+                break
+            if bgr is None:
+                break
+
+    def _read_stdout(self) -> None:
+        try:
+            _SlabReader(self._proc.stdout, self.video_buf,
+                        slab_size=_STDOUT_SLAB_SIZE // 4).run()
+        finally:
+            self.video_buf.close()
+
+    def _drain_stderr(self) -> None:
+        try:
+            while True:
+                chunk = self._proc.stderr.read(4096)
+                if not chunk:
+                    break
+                self._stderr.write(chunk)
+        except OSError:
+            pass
+
+
+def get_proxy_stats() -> dict:
+    """Live proxy encoder figures for the monitor (see _ProxyEncoder.stats), or {}."""
+    proxy = _current_proxy
+    return proxy.stats() if proxy is not None else {}
+
+
+# ===========================================================================
+# Segment stop coordinator  —  parallel, deadline-bounded shutdown
+# ===========================================================================
+class _StopCoordinator:
+    """
+    Brings a segment's pipeline stages to a halt concurrently.
+
+    add(name, wait_fn, kill_fn, deadline_s) registers a stage: wait_fn()
+    blocks until the stage has finished (stages that must happen in order
+    belong in one wait_fn), kill_fn() forces it (e.g. kills the ffmpeg
+    process it waits on, or stops waiting for a device).  run() starts
+    every wait_fn at once on its own thread, so the stop latency is that of
+    the slowest stage rather than the sum of per-stage timeouts.  Each
+    stage has its own deadline measured from that start (run()'s default
+    unless given); one still running at its deadline is killed, and killed
+    stages are given _STOP_GRACE_S.
+    """
+
+    def __init__(self, label: str):
+        self.label   = label
+        self._stages = []            # (name, wait_fn, kill_fn, deadline_s or None)
+
+    def add(self, name: str, wait_fn, kill_fn=None, deadline_s: float | None = None) -> None:
+        self._stages.append((name, wait_fn, kill_fn, deadline_s))
+
+    def run(self, deadline_s: float) -> dict:
+        """
+        Returns {"total_s", "slowest", "stages": {name: seconds}, "killed":
+        [names], "errors": {name: message}}; a stage that never finished
+        has seconds None.  deadline_s applies to stages added without one.
+        """
+        t0      = time.perf_counter()
+        times   = {name: None for name, _, _, _ in self._stages}
+        limits  = {name: dl if dl is not None else deadline_s
+                   for name, _, _, dl in self._stages}
+        errors  = {}
+        threads = {}
+
+        def _stage(name, wait_fn):
+            try:
+                wait_fn()
+            except Exception as e:
+                errors[name] = str(e)
+            times[name] = time.perf_counter() - t0
+
+        for name, wait_fn, _kill, _dl in self._stages:
+            t = threading.Thread(target=_pinned(_stage), args=(name, wait_fn),
+                                 daemon=True, name=f"stop-{name}")
+            t.start()
+            threads[name] = t
+
+        # Earliest deadline first; a stage is killed as soon as its own passes.
+        killed = []
+        for name, _, kill, _dl in sorted(self._stages, key=lambda st: limits[st[0]]):
+            t = threads[name]
+            t.join(timeout=max(0.0, t0 + limits[name] - time.perf_counter()))
+            if not t.is_alive():
+                continue
+            killed.append(name)
+            if kill is not None:
+                try:
+                    kill()
+                except Exception:
+                    pass
+        end = time.perf_counter() + _STOP_GRACE_S
+        for name in killed:
+            threads[name].join(timeout=max(0.0, end - time.perf_counter()))
+
+        done    = {n: v for n, v in times.items() if v is not None}
+        slowest = max(done, key=done.get) if done else None
+        report  = {
+            "total_s": time.perf_counter() - t0,
+            "slowest": slowest,
+            "stages":  times,
+            "killed":  killed,
+            "errors":  errors,
+        }
+        parts = ", ".join(f"{n} {v:.2f} s" if v is not None else f"{n} --"
+                          for n, v in sorted(times.items(),
+                                             key=lambda kv: -(kv[1] or limits[kv[0]])))
+        print(f"  Stop latency : {report['total_s']:.2f} s for {self.label}  [{parts}]")
+        if killed:
+            print(f"  WARNING: stop deadline reached; killed: "
+                  f"{', '.join(f'{n} ({limits[n]:.0f} s)' for n in killed)}")
+        for name, msg in errors.items():
+            print(f"  WARNING: stop stage {name} failed: {msg}")
+        return report
+
+
+def get_last_stop_report() -> dict | None:
+    """The last segment's stop timing (see _StopCoordinator.run), or None."""
+    return _last_stop_report
+
+
+# ===========================================================================
+# Per-segment performance timeline  —  <output>.perf.json sidecar
+# ===========================================================================
+def _perf_sidecar_path(final_path: str) -> str:
+    return final_path + configure.PERF_SIDECAR_SUFFIX
+
+
+class _PerfTimeline:
+    """
+    Performance timeline of one segment, saved next to its output file.
+
+    Times are seconds of media time from video frame 0 (pauses excluded,
+    like the recording).  The grab loop calls frame() once per grab and
+    drop() for each frame the queue refused; each time a second completes,
+    the per-second columns get one entry: frames grabbed, peak frame-queue
+    depth, pacing lateness of the grabs against their ticks (mean / max ms)
+    and encoder output bitrate.  Columns are array.array, so an hour-long
+    segment costs a few tens of KB.
+    """
+
+    def __init__(self, fps: int):
+        self.fps         = fps
+        self.drops       = array("d")     # media time of each dropped frame
+        self.dropped     = 0
+        self.frames      = 0
+        self.spill_t     = None           # media time the buffer spilled to disk
+        self.grabs       = array("H")
+        self.queue_max   = array("H")
+        self.late_avg_ms = array("f")
+        self.late_max_ms = array("f")
+        self.kbps        = array("f")
+        self._sec        = 0
+        self._n          = 0
+        self._late_sum   = 0.0
+        self._late_max   = 0.0
+        self._q_max      = 0
+        self._bytes0     = 0
+
+    def frame(self, t: float, late_s: float, depth: int, out_bytes: int,
+              spilled: bool) -> None:
+        if t >= self._sec + 1:
+            self._roll(int(t), out_bytes)
+        late = late_s * 1000.0
+        self.frames    += 1
+        self._n        += 1
+        self._late_sum += late
+        if late > self._late_max:
+            self._late_max = late
+        if depth > self._q_max:
+            self._q_max = depth
+        if spilled and self.spill_t is None:
+            self.spill_t = t
+
+    def drop(self, t: float) -> None:
+        self.dropped += 1
+        if len(self.drops) < _PERF_MAX_DROPS:
+            self.drops.append(t)
+
+    def _roll(self, sec: int, out_bytes: int) -> None:
+        """Close the current second (and any skipped ones) up to `sec`."""
+        while self._sec < sec:
+            n = self._n
+            self.grabs.append(min(n, 0xFFFF))
+            self.queue_max.append(self._q_max)
+            self.late_avg_ms.append(self._late_sum / n if n else 0.0)
+            self.late_max_ms.append(self._late_max)
+            self.kbps.append((out_bytes - self._bytes0) * 8 / 1000.0)
+            self._bytes0 = out_bytes
+            self._n = self._q_max = 0
+            self._late_sum = self._late_max = 0.0
+            self._sec += 1
+
+    def save(self, path: str, t_end: float, out_bytes: int, meta: dict) -> None:
+        """Close the last (partial) second and write the sidecar JSON."""
+        if self._n:
+            self._roll(self._sec + 1, out_bytes)
+        data = dict(meta)
+        data.update({
+            "version":    1,
+            "fps":        self.fps,
+            "duration_s": round(t_end, 3),
+            "frames":     self.frames,
+            "dropped":    self.dropped,
+            "drops":      [round(t, 3) for t in self.drops],
+            "spill_t":    None if self.spill_t is None else round(self.spill_t, 3),
+            "per_second": {
+                "grabs":       list(self.grabs),
+                "queue_max":   list(self.queue_max),
+                "late_avg_ms": [round(v, 2) for v in self.late_avg_ms],
+                "late_max_ms": [round(v, 2) for v in self.late_max_ms],
+                "kbps":        [round(v) for v in self.kbps],
+            },
+        })
+        try:
+            with open(path, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+        except OSError as e:
+            print(f"WARNING: could not write performance sidecar {path}: {e}")
+
+
 # ===========================================================================
 # Segment capture  (inner)
 # ===========================================================================
 def _capture_segment(config: dict, segment_num: int,
                      split_limit: float | None,
-                     sct: mss.base.MSSBase
+                     sct: mss.base.MSSBase,
+                     audio: "_AudioSession",
                      ) -> tuple | None:
     """
     Capture one segment of frames and encode them in real-time via an ffmpeg
@@ -728,15 +3781,27 @@ def _capture_segment(config: dict, segment_num: int,
     The pipe_writer and stdout_reader threads run concurrently so neither the
     grab loop nor the encoder ever blocks waiting for the other.
 
+    With config "proxy_height" set, each grabbed frame is also handed to a
+    _ProxyEncoder, which scales it and encodes a low-res editing rendition
+    into its own buffer; it is muxed next to the master as *_proxy.
+
+    Audio streams belong to the session (`audio`) and keep running across
+    the split; this segment's WAVs are cut from them at the moment the grab
+    loop ends.
+
     Returns:
-        (outcome, video_buf, lb_wav_or_None, mic_wav_or_None, final_path)
+        (outcome, video_buf, lb_wav_or_None, mic_wav_or_None, final_path,
+         audio_sync, proxy)
         outcome: "split" | "done"
+        audio_sync: {wav_path: _AudioClock.sync_info()} for the mux step
+        proxy: (proxy _VideoBuffer, proxy output path) or None
     Returns None on a fatal ffmpeg startup error.
     """
     import imageio_ffmpeg
 
     global current_temp_video, _segment_start_time, current_segment_num
-    global _current_video_buf
+    global _current_video_buf, _replay_ring, _current_proxy, _last_stop_report
+    global _current_reader, _current_progress, _ram_budget, _frame_bytes
 
     current_segment_num = segment_num
 
@@ -746,11 +3811,10 @@ def _capture_segment(config: dict, segment_num: int,
     out_dir = config["output_path"]
     os.makedirs(out_dir, exist_ok=True)
 
-    # Audio WAV paths still go to temp dir (audio is tiny: ~100 MB / hr).
+    # Audio WAVs go to the temp dir (audio is tiny: ~100 MB / hr); their
+    # paths are chosen by the session's audio streams (_audio_wav_path).
     stamp   = int(time.time())
     tmp_dir = tempfile.gettempdir()
-    lb_wav  = os.path.join(tmp_dir, f"d264_loopback_{stamp}_s{segment_num:03d}.wav")
-    mic_wav = os.path.join(tmp_dir, f"d264_mic_{stamp}_s{segment_num:03d}.wav")
 
     # Spill path is only used if the RAM buffer overflows.
     spill_path = os.path.join(tmp_dir, f"d264_spill_{stamp}_s{segment_num:03d}.h264")
@@ -769,50 +3833,51 @@ def _capture_segment(config: dict, segment_num: int,
         final = f"{base}_{ctr:03d}.{container}"
         ctr  += 1
 
-    # Adaptive RAM buffer limit for this segment.
-    buf_limit  = _calc_buffer_limit(config)
-    video_buf  = _VideoBuffer(max_bytes=buf_limit, spill_path=spill_path)
+    # Adaptive RAM buffer limit for this segment; in replay mode a fixed
+    # ring sized from the duration and the capped encoder bitrate instead.
+    replay     = bool(config.get("replay_mode", False))
+    replay_args: list = []
+    if replay:
+        seconds    = float(config.get("replay_seconds", _REPLAY_SECONDS_DEFAULT))
+        gop_frames = max(1, int(fps * _REPLAY_GOP_S))
+        maxrate    = int(w * h * fps * _REPLAY_BITS_PER_PIXEL)       # bits / s
+        # VBV allows a one-second burst above maxrate, plus one open GOP.
+        buf_limit  = int((seconds + 2 * _REPLAY_GOP_S + 1) * maxrate / 8)
+        video_buf  = _ReplayRing(seconds, fps, buf_limit)
+        replay_args = ["-g", str(gop_frames), "-keyint_min", str(gop_frames),
+                       "-sc_threshold", "0",
+                       "-maxrate", f"{maxrate // 1000}k", "-bufsize", f"{maxrate // 1000}k"]
+    else:
+        buf_limit  = _calc_buffer_limit(config)
+        video_buf  = _VideoBuffer(max_bytes=buf_limit, spill_path=spill_path)
     _current_video_buf = video_buf  # Make accessible for RAM monitoring in displays.py
+    _ram_budget        = buf_limit
+    _frame_bytes       = w * h * 3
+    if replay:
+        _replay_ring = video_buf
+
+    # Editing proxy: its encoder threads are taken out of the thread budget.
+    proxy_size    = None if replay else _proxy_size(
+        w, h, int(config.get("proxy_height", 0) or 0))
+    proxy_threads = max(1, _thread_cap // _PROXY_THREAD_SHARE) if proxy_size else 0
+    enc_threads   = max(1, _thread_cap - proxy_threads)
 
     # current_temp_video shows "RAM" in the monitor display; if spilled the
     # display will still show "RAM" (the spill is an implementation detail).
     current_temp_video = "(RAM buffer)"
 
-    # ---- Identify audio devices ----
-    loopback_info = _get_loopback_device(_pa)
-    mic_info      = _get_default_mic(_pa)
-
-    if segment_num == 1:
+    if replay:
+        print(f"  Replay ring  : {seconds:.0f} s, {buf_limit / (1024**2):.0f} MB cap "
+              f"(maxrate {maxrate // 1000} kbps, {_REPLAY_GOP_S} s GOPs)")
+    elif segment_num == 1:
         ram_frac_pct = config.get("max_ram_usage", 50)
         print(f"  Video buffer : {buf_limit / (1024**3):.1f} GB cap "
               f"({ram_frac_pct}% of {_get_available_ram_gb():.1f} GB free RAM, "
               f"max {_RAM_BUFFER_HARD_CAP_GB:.0f} GB)")
-        if loopback_info:
-            print(f"  System audio : {loopback_info['name']}")
-        else:
-            print("  System audio : unavailable")
-        if mic_info:
-            print(f"  Microphone   : {mic_info['name']}")
-        else:
-            print("  Microphone   : unavailable")
-
-    # ---- Start audio threads ----
-    stop_audio    = threading.Event()
-    audio_threads = []
-
-    if loopback_info:
-        t = threading.Thread(target=_audio_capture_thread,
-                             args=(_pa, loopback_info, lb_wav, stop_audio),
-                             daemon=True, name=f"audio-lb-s{segment_num}")
-        t.start()
-        audio_threads.append(t)
-
-    if mic_info:
-        t = threading.Thread(target=_audio_capture_thread,
-                             args=(_pa, mic_info, mic_wav, stop_audio),
-                             daemon=True, name=f"audio-mic-s{segment_num}")
-        t.start()
-        audio_threads.append(t)
+
+    # ---- Audio: streams persist from the previous segment; (re)open any
+    #      device that is not yet capturing (first segment, device change).
+    audio.begin_segment(segment_num)
 
     # ---- Launch ffmpeg: rawvideo -> libx264 -> raw H.264 on stdout --------
     #
@@ -826,11 +3891,15 @@ def _capture_segment(config: dict, segment_num: int,
     # -thread_queue_size 512 : ffmpeg input demuxer read-ahead buffer;
     #                          decouples I/O from the encoder thread pool.
     # -an                    : no audio here; audio is added at mux time.
+    # -progress pipe:2       : key=value progress reports on stderr for the
+    #                          live encoder metrics (see _PROGRESS_ARGS).
     ffmpeg_exe   = imageio_ffmpeg.get_ffmpeg_exe()
-    video_params = configure.get_video_params(config)
+    video_params = (configure.get_video_params(config) if replay
+                    else configure.get_capture_video_params(config))
 
     ffmpeg_cmd = [
         ffmpeg_exe, "-y",
+    ] + _PROGRESS_ARGS + [
         "-f",                "rawvideo",
         "-vcodec",           "rawvideo",
         "-s",                f"{w}x{h}",
@@ -839,16 +3908,18 @@ def _capture_segment(config: dict, segment_num: int,
         "-thread_queue_size", "512",
         "-i",                "pipe:0",
         "-c:v",              "libx264",
-        "-threads",          str(_thread_cap),
-    ] + video_params + [
+        "-threads",          str(enc_threads),
+    ] + video_params + replay_args + [
         "-an",
         "-f", "h264",
         "pipe:1",           # encoded H.264 -> Python's stdout read loop
     ]
 
     try:
-        ffmpeg_proc = subprocess.Popen(
-            ffmpeg_cmd,
+        # Pinned at spawn: libx264's worker / lookahead threads stay off the
+        # reserved and mux cores.
+        ffmpeg_proc = _popen_pinned(
+            ffmpeg_cmd, "capture",
             stdin  = subprocess.PIPE,
             stdout = subprocess.PIPE,
             stderr = subprocess.PIPE,
@@ -857,9 +3928,7 @@ def _capture_segment(config: dict, segment_num: int,
         print(f"ERROR: could not launch ffmpeg for segment {segment_num}: {e}")
         video_buf.discard()
         _current_video_buf = None  # Clear reference on error
-        stop_audio.set()
-        for t in audio_threads:
-            t.join(timeout=5)
+        audio.close()
         current_temp_video = None
         return None
 
@@ -868,9 +3937,13 @@ def _capture_segment(config: dict, segment_num: int,
     # If stderr is piped but never read, the 64 KB OS pipe buffer fills and
     # ffmpeg blocks trying to write more output.  wait() then waits for ffmpeg
     # to exit, ffmpeg never exits → deadlock → 120 s timeout → killed process.
-    # This thread drains stderr into a list so it is always available for
-    # error reporting without ever blocking ffmpeg.
-    _stderr_buf: list[bytes] = []
+    # This thread drains stderr, parsing the -progress reports into
+    # `progress` (live encoder fps / speed / bitrate) and keeping the log's
+    # tail and warning / error lines in a fixed-size ring for error
+    # reporting, without ever blocking ffmpeg.
+    stderr_log        = ffmpeg_log.LogRing(_STDERR_RING_BYTES)
+    progress          = ffmpeg_log.Progress()
+    _current_progress = progress
 
     def _stderr_drainer():
         try:
@@ -878,47 +3951,58 @@ def _capture_segment(config: dict, segment_num: int,
                 chunk = ffmpeg_proc.stderr.read(4096)
                 if not chunk:
                     break
-                _stderr_buf.append(chunk)
+                stderr_log.write(progress.feed(chunk))
         except OSError:
             pass
+        stderr_log.write(progress.flush())
 
-    stderr_thread = threading.Thread(target=_stderr_drainer, daemon=True,
+    stderr_thread = threading.Thread(target=_pinned(_stderr_drainer), daemon=True,
                                      name=f"stderr-s{segment_num}")
     stderr_thread.start()
 
     # ---- stdout reader thread ---------------------------------------------
-    # Reads encoded H.264 bytes from ffmpeg's stdout into the video_buf.
+    # Reads encoded H.264 bytes from ffmpeg's stdout into the video_buf
+    # (readinto1 into reusable slabs, see _SlabReader).
     # Must run concurrently with the grab loop; if this thread stalls,
     # the stdout pipe fills and ffmpeg blocks, which would starve the encoder.
-    _STDOUT_READ_SIZE = 256 * 1024   # 256 KB per read – balances latency/overhead
+    reader          = _SlabReader(ffmpeg_proc.stdout, video_buf,
+                                  read_hist=_telemetry.stage("encoder_read"),
+                                  write_hist=_telemetry.stage("buffer_write"))
+    _current_reader = reader
 
     def _stdout_reader():
         try:
-            while True:
-                chunk = ffmpeg_proc.stdout.read(_STDOUT_READ_SIZE)
-                if not chunk:
-                    break
-                video_buf.write(chunk)
-        except OSError:
-            pass
+            reader.run()
         finally:
             video_buf.close()
 
-    stdout_thread = threading.Thread(target=_stdout_reader, daemon=True,
+    stdout_thread = threading.Thread(target=_pinned(_stdout_reader), daemon=True,
                                      name=f"stdout-s{segment_num}")
     stdout_thread.start()
 
     # ---- pipe writer thread -----------------------------------------------
     # Writes raw BGR frames from the bounded queue to ffmpeg's stdin.
+    # Items are (perf_counter at enqueue, frame bytes, media time of the
+    # grab) so queue wait is timed and the replay ring can stamp its GOPs.
     frame_q = _queue.Queue(maxsize=_PIPE_QUEUE_DEPTH)
+    h_wait  = _telemetry.stage("queue_wait")
+    h_write = _telemetry.stage("pipe_write")
+    note    = video_buf.note_frame if replay else None
 
     def _pipe_writer():
+        perf = time.perf_counter
         while True:
             item = frame_q.get()
             if item is None:
                 break
+            t_put, data, t_frame = item
+            t = perf()
+            h_wait.span(t_put, t)
+            if note is not None:
+                note(t_frame)           # before the encoder can see the frame
             try:
-                ffmpeg_proc.stdin.write(item)
+                ffmpeg_proc.stdin.write(data)
+                h_write.span(t, perf())
             except (BrokenPipeError, OSError):
                 while True:
                     try:
@@ -927,24 +4011,60 @@ def _capture_segment(config: dict, segment_num: int,
                         break
                 break
 
-    pipe_thread = threading.Thread(target=_pipe_writer, daemon=True,
+    pipe_thread = threading.Thread(target=_pinned(_pipe_writer), daemon=True,
                                    name=f"pipe-s{segment_num}")
     pipe_thread.start()
 
+    # ---- editing proxy encoder (optional) --------------------------------
+    proxy = None
+    if proxy_size:
+        proxy = _ProxyEncoder(
+            ffmpeg_exe, w, h, proxy_size, fps, proxy_threads,
+            max(1, buf_limit // _PROXY_RAM_SHARE),
+            os.path.join(tmp_dir, f"d264_spill_{stamp}_s{segment_num:03d}{_PROXY_SUFFIX}.h264"),
+            segment_num)
+        if proxy.start():
+            print(f"  Proxy        : {proxy_size[0]}x{proxy_size[1]}, "
+                  f"{proxy_threads} of {_thread_cap} budget thread(s) "
+                  f"(master encoder {enc_threads})")
+        else:
+            proxy = None
+    _current_proxy = proxy
+
     seg_label = f"S{segment_num:03d}" if split_limit else "recording"
-    print(f"Capturing {seg_label} -> {final}")
+    if replay:
+        print("Capturing replay buffer (Save Replay writes the current window)")
+    else:
+        print(f"Capturing {seg_label} -> {final}")
 
+    pause                = _pause_clock
     frame_dur            = 1.0 / fps
     next_tick            = time.perf_counter()
-    _segment_start_time  = time.time()
+    video_t0             = pause.to_media(next_tick)   # media time of video frame 0
+    _segment_start_time  = video_t0
+    if replay:
+        video_buf.video_t0 = video_t0
     result               = "done"
     frames_dropped       = 0
     monitor              = sct.monitors[1]   # re-queried each segment
+    h_grab               = _telemetry.stage("grab")
+    h_convert            = _telemetry.stage("convert")
+    perf                 = time.perf_counter
+    timeline             = _PerfTimeline(fps)
+    m_frames, m_dropped  = _m_frames, _m_dropped
+    wall_t0              = time.time()
 
     # ---- Frame grab loop --------------------------------------------------
     while is_capturing:
+        if pause.paused:
+            # Idle until resumed (or stopped).  Nothing is grabbed or encoded,
+            # so the frames either side of the pause are adjacent in the stream.
+            if pause.wait(0.25):
+                next_tick = time.perf_counter()
+            continue
+
         if split_limit is not None:
-            if (time.time() - _segment_start_time) >= split_limit:
+            if (pause.to_media(time.perf_counter()) - _segment_start_time) >= split_limit:
                 result = "split"
                 break
 
@@ -953,71 +4073,189 @@ def _capture_segment(config: dict, segment_num: int,
             time.sleep(max(0.0, next_tick - now - 0.001))
             continue
 
+        t0    = perf()
         raw   = sct.grab(monitor)
+        t1    = perf()
         frame = np.asarray(raw, dtype=np.uint8)
         bgr   = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
 
         if bgr.shape[1] != w or bgr.shape[0] != h:
             bgr = cv2.resize(bgr, (w, h), interpolation=cv2.INTER_LINEAR)
+        t2    = perf()
+        h_grab.span(t0, t1)
+        h_convert.span(t1, t2)
 
         # tobytes() produces a safe copy (mss may reuse its internal buffer).
         # Non-blocking put: drop frame rather than stall the grab timer.
+        t_grab  = pause.to_media(t0)
+        t_media = t_grab - video_t0
         try:
-            frame_q.put_nowait(bgr.tobytes())
+            frame_q.put_nowait((t2, bgr.tobytes(), t_grab))
+            m_frames.value += 1
         except _queue.Full:
             frames_dropped += 1
+            m_dropped.value += 1
+            timeline.drop(t_media)
+        depth = frame_q.qsize()
+        _m_queue_depth.value = depth
+        timeline.frame(t_media, t0 - next_tick, depth, reader.bytes,
+                       video_buf.spilled)
+        if proxy is not None:
+            proxy.put(bgr)
 
         next_tick += frame_dur
 
-    # ---- Flush and close stdin -------------------------------------------
-    frame_q.put(None)           # sentinel: tells pipe_writer to exit
-    pipe_thread.join(timeout=60)
-
-    try:
-        ffmpeg_proc.stdin.close()
-    except OSError:
-        pass
-
-    # Wait for ffmpeg to flush encoder buffers.  With zerolatency tune the
-    # flush is near-instant; 120 s is a generous safety margin.
-    try:
-        ret = ffmpeg_proc.wait(timeout=120)
-    except subprocess.TimeoutExpired:
-        ffmpeg_proc.kill()
-        ret = ffmpeg_proc.wait()
-        print(f"  WARNING: ffmpeg timed out flushing segment {segment_num}; process killed.")
+    # ---- Cut audio at the video end ----------------------------------------
+    # Requested now so the boundary is sample-accurate; the streams carry on
+    # into the next segment's WAVs while the encoder flushes below.
+    t_cut = time.perf_counter()
+    audio.cut(t_cut, segment_num + 1 if result == "split" else None)
+
+    # ---- Stop every stage at once, under one deadline ------------------------
+    # The pipe writer drains its queue and closes stdin; ffmpeg flushes and
+    # exits (near-instant with zerolatency); the stdout / stderr readers end
+    # at EOF.  These are awaited in parallel with the proxy encoder and the
+    # audio cut.  Killing the encoder unblocks every stage that depends on it.
+    def _finish_pipe():
+        while pipe_thread.is_alive():
+            try:
+                frame_q.put(None, timeout=0.5)   # sentinel: tells pipe_writer to exit
+                break
+            except _queue.Full:
+                pass
+        pipe_thread.join()
+        try:
+            ffmpeg_proc.stdin.close()
+        except OSError:
+            pass
 
-    # stdout_reader exits when stdout closes (which happens after ffmpeg exits)
-    stdout_thread.join(timeout=30)
+    def _kill_encoder():
+        try:
+            ffmpeg_proc.kill()
+        except OSError:
+            pass
 
-    # stderr_drainer should already be done since ffmpeg has exited; short join.
-    stderr_thread.join(timeout=10)
+    finished = {}
+    stop = _StopCoordinator(f"segment {segment_num}")
+    enc_dl   = _STOP_ENCODER_DEADLINE_S
+    stop.add("pipe_writer",    _finish_pipe,        _kill_encoder, enc_dl)
+    stop.add("encoder",        ffmpeg_proc.wait,    _kill_encoder, enc_dl)
+    stop.add("stdout_reader",  stdout_thread.join,  _kill_encoder, enc_dl)
+    stop.add("stderr_drainer", stderr_thread.join,  _kill_encoder, enc_dl)
+    if proxy is not None:
+        stop.add("proxy",      proxy.finish,        proxy.kill,    enc_dl)
+    stop.add("audio",          lambda: finished.update(audio.collect()), audio.abort)
+    _last_stop_report = stop.run(_STOP_DEADLINE_S)
+
+    ret = ffmpeg_proc.poll()
+    if ret is None:
+        ret = -1
+        print(f"  WARNING: ffmpeg did not exit for segment {segment_num}.")
+
+    proxy_out = None
+    if proxy is not None:
+        proxy_ret = proxy.returncode
+        if proxy.repeated:
+            print(f"  Warning: proxy repeated {proxy.repeated} frame(s) "
+                  f"(proxy encoder behind - master unaffected)")
+        if proxy_ret == 0 and (proxy.video_buf.spilled or proxy.video_buf.ram_size_mb > 0):
+            proxy_out = (proxy.video_buf, _proxy_path(final))
+        else:
+            proxy.video_buf.discard()
 
+    _m_segments.inc()
+    _m_queue_depth.value = 0
     if frames_dropped:
         print(f"  Warning: {frames_dropped} frame(s) dropped "
               f"(pipe queue full – encoder may need faster preset or lower thread cap)")
     if ret != 0:
-        stderr_text = b"".join(_stderr_buf).decode(errors="replace")
         print(f"  WARNING: ffmpeg exited with code {ret} for segment {segment_num}.")
-        print(stderr_text[-2000:])
+        print(stderr_log.text())
 
     if video_buf.spilled:
         print(f"  Note: segment {segment_num} spilled to disk "
               f"({video_buf.spill_path}) – RAM cap was reached.")
-
-    # ---- Stop audio -------------------------------------------------------
-    stop_audio.set()
-    for t in audio_threads:
-        t.join(timeout=10)
-
-    actual_lb_wav  = lb_wav  if (loopback_info and os.path.exists(lb_wav))  else None
-    actual_mic_wav = mic_wav if (mic_info      and os.path.exists(mic_wav)) else None
+    rs = reader.stats()
+    if rs:
+        print(f"  Encoder read : {rs['bytes_per_s'] * 8 / 1e6:.2f} Mbps, "
+              f"{rs['reads']} reads, {rs['chunk_kb']} KB chunks, "
+              f"{rs['slabs']} slab(s), blocked {rs['blocked_pct']:.0f}% "
+              f"(waiting on the encoder)")
+    ep = progress.latest
+    if ep and ep["fps"] is not None:
+        print(f"  Encoder      : {ep['fps']:.1f} fps, speed {ep['speed'] or 0:.2f}x, "
+              f"{ep['dup_frames'] or 0} dup / {ep['drop_frames'] or 0} drop "
+              f"({progress.reports} progress reports)")
+    mb       = 1024 * 1024
+    mem_peak = rss_peak = 0
+    if _mem_watch is not None:
+        mem_peak, rss_peak = _mem_watch.take_peaks()
+        print(f"  Memory       : peak {mem_peak / mb:.0f} MB in recorder buffers "
+              f"(budget {buf_limit / mb:.0f} MB), process RSS peak {rss_peak / mb:.0f} MB")
+        if mem_peak > buf_limit:
+            print(f"  WARNING: recorder buffers peaked at {mem_peak / mb:.0f} MB, above the "
+                  f"max_ram_usage budget of {buf_limit / mb:.0f} MB for segment {segment_num}.")
+
+    # ---- This segment's audio (collected by the stop coordinator) -----------
+    actual_lb_wav  = finished.get("lb",  (None,))[0]
+    actual_mic_wav = finished.get("mic", (None,))[0]
+
+    # ---- Audio clock / writer report (segment log) --------------------------
+    audio_sync = {}
+    audio_perf = {}
+    for label, key in (("loopback", "lb"), ("mic", "mic")):
+        wav, clock, wstats, silence = finished.get(key, (None, None, None, None))
+        if clock is not None:
+            audio_perf[label] = {
+                "gap_s": round(clock.gap_frames / clock.nominal_rate, 3),
+                "gaps":  [[round(ts - video_t0, 3), round(d, 3)] for ts, d in clock.gaps],
+            }
+        if wstats is not None:
+            print(f"  Audio writer : {label} {wstats['bytes_per_s'] / 1024:.0f} KB/s, "
+                  f"{wstats['writes_per_s']:.2f} writes/s, "
+                  f"latency avg {wstats['write_ms_avg']:.1f} ms / "
+                  f"max {wstats['write_ms_max']:.1f} ms")
+        if wav is None:
+            continue
+        info  = clock.sync_info(video_t0)
+        audio_sync[wav] = info
+        gap_note = (f", {clock.gap_frames / clock.nominal_rate:.1f} s gap-filled"
+                    if clock.gap_frames else "")
+        print(f"  Audio sync   : {label} {info['nominal_rate']} Hz nominal, "
+              f"{info['rate']:.2f} Hz measured ({info['drift_ppm']:+.1f} ppm), "
+              f"start {info['offset'] * 1000:+.0f} ms{gap_note}")
+        if silence.silent_frames:
+            print(f"  Audio silence: {label} {silence.silent_fraction * 100:.0f}% silent, "
+                  f"{len(silence.ranges)} range(s)"
+                  f"{' (silent throughout)' if silence.fully_silent else ''}")
+
+    # ---- Performance sidecar (drop timeline etc., see _PerfTimeline) ---------
+    if not replay:
+        ep = progress.latest or {}
+        timeline.save(_perf_sidecar_path(final), pause.to_media(t_cut) - video_t0,
+                      reader.bytes, {
+                          "file":       os.path.basename(final),
+                          "segment":    segment_num,
+                          "resolution": [w, h],
+                          "started":    round(wall_t0, 3),
+                          "encoder":    {k: ep.get(k) for k in
+                                         ("fps", "speed", "bitrate_kbps",
+                                          "dup_frames", "drop_frames")},
+                          "stop":       _last_stop_report,
+                          "audio":      audio_perf,
+                          "memory":     {"peak_mb":     round(mem_peak / mb, 1),
+                                         "rss_peak_mb": round(rss_peak / mb, 1),
+                                         "budget_mb":   round(buf_limit / mb, 1)},
+                      })
 
     current_temp_video  = None
     _segment_start_time = None
     _current_video_buf  = None  # Clear reference when segment completes
+    _current_proxy      = None
+    _current_reader     = None
+    _current_progress   = None
 
-    return result, video_buf, actual_lb_wav, actual_mic_wav, final
+    return result, video_buf, actual_lb_wav, actual_mic_wav, final, audio_sync, proxy_out
 
 # ===========================================================================
 # Main capture loop  (outer – manages segment pipeline)
@@ -1036,37 +4274,48 @@ def _capture_loop(config: dict):
          segment's worth of encoded video occupies RAM at any given moment.
     """
     global is_capturing, last_segment_count, current_segment_num
-    global pending_mux_count, _mux_executor, _mux_futures
+    global _mux_executor, _mux_futures, _audio_session
+    global _mux_scheduler, _replay_ring, _replay_config, _replay_saving, _mem_watch
 
-    splits_enabled = config.get("video_splits", False)
+    replay         = bool(config.get("replay_mode", False))
+    splits_enabled = config.get("video_splits", False) and not replay
     split_limit    = SPLIT_DURATION if splits_enabled else None
 
-    executor       = concurrent.futures.ThreadPoolExecutor(max_workers=1,
-                                                           thread_name_prefix="mux")
+    executor       = _MuxScheduler(config.get("mux_workers", _MUX_WORKERS_DEFAULT))
     _mux_executor  = executor
+    _mux_scheduler = executor
     futures: list[concurrent.futures.Future] = []
     _mux_futures   = futures
 
     segment_num        = 1
     last_segment_count = 0
 
+    # Audio streams are opened once here and persist across segment splits.
+    audio          = _AudioSession(_pa, config)
+    _audio_session = audio
+
+    _replay_config = config if replay else None
+    _replay_saving = False
+    _mem_watch     = _MemoryWatch()
+
     # Reuse a single mss context to avoid DXGI re-init overhead.
     with mss.mss() as sct:
         while is_capturing:
-            result = _capture_segment(config, segment_num, split_limit, sct)
+            result = _capture_segment(config, segment_num, split_limit, sct, audio)
 
             if result is None:
                 break
 
-            outcome, video_buf, lb_wav, mic_wav, final_path = result
+            outcome, video_buf, lb_wav, mic_wav, final_path, audio_sync, proxy = result
+            if replay:
+                # Stop in replay mode keeps nothing; windows are written by
+                # save_replay() while capturing.
+                video_buf.discard()
+                break
             last_segment_count += 1
 
-            with _pending_mux_lock:
-                pending_mux_count += 1
-
-            future = executor.submit(
-                _mux_and_cleanup, video_buf, lb_wav, mic_wav, final_path, config
-            )
+            future = _submit_segment_mux(executor, video_buf, lb_wav, mic_wav,
+                                         final_path, config, audio_sync, proxy)
             futures.append(future)
 
             if outcome == "split" and is_capturing:
@@ -1082,6 +4331,14 @@ def _capture_loop(config: dict):
             else:
                 break
 
+    # Streams still open here were rotated into a segment that never ran
+    # (Stop pressed right at a split); close them and drop the stub WAVs.
+    audio.close()
+    _audio_session = None
+    _replay_ring   = None
+    _mem_watch.stop()
+    _mem_watch     = None
+
     # _capture_loop owns the executor it created; shut it down here so that
     # stop_capture() cannot race executor.submit() by shutting the executor
     # down from a different thread while this loop might still be submitting.
@@ -1100,13 +4357,14 @@ def start_capture(config: dict):
     global is_capturing, capture_thread, capture_start_time
     global last_output_file, current_temp_video
     global last_segment_count, current_segment_num, _segment_start_time
-    global pending_mux_count, _mux_futures
+    global _mux_futures
+    global _pause_clock, _capture_media_t0
+    global _thread_cap, _core_layout
 
     if is_capturing:
         print("Already capturing.")
         return
 
-    global _thread_cap
     budget_pct  = config.get("thread_budget", _THREAD_BUDGET_DEFAULT)
     logical     = os.cpu_count() or 2
     _thread_cap = max(1, int(logical * budget_pct / 100))
@@ -1115,24 +4373,33 @@ def start_capture(config: dict):
     print(f"  Thread budget : {budget_pct}%  ->  {_thread_cap} / {logical} core(s) "
           f"({reserved} reserved for OS / game)")
 
+    _core_layout = _compute_core_layout(_thread_cap, config.get("cpu_affinity", True))
+    print(f"  CPU affinity  : {_core_layout['text']}")
+
     last_output_file    = None
     current_temp_video  = None
     last_segment_count  = 0
     current_segment_num = 1
     _segment_start_time = None
-    pending_mux_count   = 0
     _mux_futures        = []
+    _pause_clock        = _PauseClock()
+    _telemetry.trace    = profiling.trace_log()
+    _telemetry.reset(_TELEMETRY_STAGES)
     capture_start_time  = time.time()
+    _capture_media_t0   = time.perf_counter()
     is_capturing        = True
 
-    capture_thread = threading.Thread(target=_capture_loop, args=(config,),
+    # Probe audio devices once per session, off the hot path.
+    _audio_devices_stale.update(_AUDIO_FILE_PREFIX)
+
+    capture_thread = threading.Thread(target=_pinned(_capture_loop), args=(config,),
                                       daemon=True, name="capture-loop")
     capture_thread.start()
 
 
 def stop_capture():
     """
-    Signal the capture loop to stop, then wait for all work to complete.
+    Signal the capture loop to stop and wait for the encoder to flush.
 
     Sequence:
       1. Set is_capturing = False  -> grab loop exits on next iteration.
@@ -1140,8 +4407,9 @@ def stop_capture():
          ffmpeg flush is near-instant; 60 s is a generous safety margin.
          The executor is shut down by _capture_loop itself when it exits,
          so there is no race between this join and executor.submit().
-      3. Wait for any already-submitted mux futures.  These are fast
-         (stream copy + AAC); they may already be done by the time we get here.
+      3. Return.  Submitted mux jobs are journalled and keep running on the
+         scheduler's workers (pending_mux_count tracks them); on exit,
+         cleanup() hands any still unfinished to the next launch.
     """
     global is_capturing, capture_thread, _mux_executor
 
@@ -1150,6 +4418,7 @@ def stop_capture():
         return
 
     is_capturing = False
+    _pause_clock.resume(time.perf_counter())    # wake a paused grab loop
 
     # Wait for the capture thread to finish.  It exits once the grab loop
     # stops, ffmpeg flushes (fast with stderr drainer), and _capture_loop
@@ -1159,18 +4428,9 @@ def stop_capture():
 
     capture_thread = None
 
-    # Wait for any in-flight mux futures.  The executor is already shut down
-    # (or being shut down) by _capture_loop; we just need the results.
-    futures_to_wait = list(_mux_futures)
-    if futures_to_wait:
-        remaining = sum(1 for f in futures_to_wait if not f.done())
-        if remaining:
-            print(f"  Waiting for {remaining} segment mux job(s) to complete ...")
-        for future in futures_to_wait:
-            try:
-                future.result()
-            except Exception as e:
-                print(f"  Mux error: {e}")
+    remaining = sum(1 for f in _mux_futures if not f.done())
+    if remaining:
+        print(f"  {remaining} segment mux job(s) continue in the background")
 
     # Executor is owned and shut down by _capture_loop.  If for any reason
     # it was not cleaned up there (e.g. fatal exception in the loop), do it now.
@@ -1178,12 +4438,138 @@ def stop_capture():
         _mux_executor.shutdown(wait=False)
         _mux_executor = None
 
+    trace = profiling.write_trace(background=True)
+    if trace:
+        print(f"  Profile      : {os.path.dirname(trace)}  (trace.json + per-thread .txt / .folded)")
+
+
+def get_replay_status() -> dict | None:
+    """{"window_s", "seconds", "ram_mb"} for the live replay ring, else None."""
+    ring = _replay_ring
+    if ring is None:
+        return None
+    return {"window_s": min(ring.window_s, ring.seconds),
+            "seconds":  ring.seconds,
+            "ram_mb":   ring.ram_size_mb}
+
+
+def _save_replay_job(video_buf: "_VideoBuffer", audio: dict,
+                     final_path: str, config: dict) -> None:
+    """Mux worker: write the replay window's PCM to temp WAVs, then mux as a segment."""
+    wavs = {}
+    for label, (pcm, channels, sampwidth, rate) in audio.items():
+        path = os.path.join(tempfile.gettempdir(),
+                            f"d264_replay_{_AUDIO_FILE_PREFIX.get(label, label)}"
+                            f"_{int(time.time() * 1000)}.wav")
+        try:
+            with wave.open(path, "wb") as wf:
+                wf.setnchannels(channels)
+                wf.setsampwidth(sampwidth)
+                wf.setframerate(rate)
+                wf.writeframesraw(pcm)
+            wavs[label] = path
+        except (OSError, wave.Error) as e:
+            print(f"WARNING: could not write replay audio {path}: {e}")
+    global _replay_saving
+    try:
+        _mux_and_cleanup(video_buf, wavs.get("lb"), wavs.get("mic"), final_path, config)
+    finally:
+        _replay_saving = False
+
+
+def replay_save_pending() -> bool:
+    """True while an earlier save_replay() is still queued or muxing."""
+    return _replay_saving
+
+
+def save_replay() -> str | None:
+    """
+    Replay mode: mux the current ring window (video + matching audio) to a
+    new file without interrupting capture.  The window is taken from the
+    rings here (video shared, audio copied); the WAV write and mux run on
+    the mux scheduler.  Returns the output path, or None if there is
+    nothing to save yet or a previous save is still running.
+    """
+    global pending_mux_count, _replay_saving
+
+    ring, session, sched, config = _replay_ring, _audio_session, _mux_executor, _replay_config
+    if not is_capturing or ring is None or sched is None or config is None:
+        return None
+    if _replay_saving:
+        print("Replay save  : previous save still running; skipped")
+        return None
+    snap = ring.snapshot()
+    if snap is None:
+        return None
+    video_buf, t0 = snap
+    t1    = _pause_clock.to_media(time.perf_counter())
+    audio = session.replay_audio(t0, t1) if session is not None else {}
+
+    out_dir   = config["output_path"]
+    container = config.get("container_format", "MKV").lower()
+    os.makedirs(out_dir, exist_ok=True)
+    base  = os.path.join(out_dir, f"Desktop_Video_{time.strftime('%Y_%m_%d')}"
+                                  f"_Replay_{time.strftime('%H%M%S')}")
+    final = f"{base}.{container}"
+    ctr   = 1
+    while os.path.exists(final):
+        final = f"{base}_{ctr:03d}.{container}"
+        ctr  += 1
+
+    print(f"Saving replay : {t1 - t0:.0f} s window "
+          f"({video_buf.ram_size_mb:.0f} MB video) -> {final}")
+    with _pending_mux_lock:
+        pending_mux_count += 1
+    _replay_saving = True
+    try:
+        future = sched.submit(int(video_buf.ram_size_mb * 1024 * 1024),
+                              _save_replay_job, video_buf, audio, final, config)
+    except RuntimeError:
+        with _pending_mux_lock:
+            pending_mux_count = max(0, pending_mux_count - 1)
+        _replay_saving = False
+        return None
+    _mux_futures.append(future)
+    return final
+
+
+def pause_capture() -> bool:
+    """
+    Pause the running capture.  The grab loop sleeps on an event and audio
+    read while paused is discarded, so the encoder, WAV writers and mux
+    see nothing from the paused interval.  Returns False if not capturing
+    or already paused.
+    """
+    if not is_capturing:
+        return False
+    if not _pause_clock.pause(time.perf_counter()):
+        return False
+    print(f"Paused at {capture_elapsed():.1f} s.")
+    return True
+
+
+def resume_capture() -> float | None:
+    """Resume a paused capture; returns the pause length in seconds (None if not paused)."""
+    paused_for = _pause_clock.resume(time.perf_counter())
+    if paused_for is not None:
+        print(f"Resumed after {paused_for:.1f} s paused.")
+    return paused_for
+
 
 def cleanup():
-    """Called on application exit – releases PyAudio."""
+    """
+    Called on application exit – hands unfinished mux jobs to the next
+    launch, stops the recompressor and releases PyAudio.
+    """
     if is_capturing:
         stop_capture()
-    global _pa
+    global _pa, _recompressor
+    if pending_mux_count:
+        _hand_off_mux_jobs()
+    if _recompressor is not None:
+        _recompressor.stop()        # an interrupted job stays queued for next run
+        _recompressor = None
     if _pa:
         _pa.terminate()
-        _pa = None
\ No newline at end of file
+        _pa = None
+    profiling.write_trace()       # again: appends mux jobs finished since Stop
\ No newline at end of file
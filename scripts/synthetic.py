@@ -0,0 +1,344 @@
+# scripts/synthetic.py
+# Synthetic capture sources + a one-shot measured pipeline run.
+#
+# SyntheticScreen stands in for mss (same monitors / grab() surface) and
+# SyntheticAudioHost for the pyaudiowpatch PyAudio object, so the real
+# recorder code - _capture_segment(), the audio capture threads and _mux() -
+# runs unchanged with no desktop, game or sound device involved.
+# run_pipeline() records a few seconds that way and reports what this
+# machine sustained.  Used by benchmarks/bench_pipeline.py and
+# scripts/calibrate.py (which is why it lives in the package).  The recorder
+# session state it has to set up is restored when the run ends.
+
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import mss
+import numpy as np
+
+import scripts.configure as configure
+import scripts.recorder as recorder
+
+_TONE_HZ        = (440.0, 220.0)     # loopback, mic
+_TONE_DBFS      = (-12.0, -30.0)     # both well above the silence threshold
+_SAMPLE_RATE    = 48000
+_SAMPLE_INTERVAL = 0.1               # run_pipeline() resource sampling (s)
+
+# recorder globals run_pipeline() sets up the way init_capture_system /
+# start_capture would; saved before the run and put back after it.
+_SESSION_STATE = ("_thread_cap", "_core_layout", "AUDIO_CHUNK", "_pause_clock",
+                  "_telemetry", "_audio_devices", "_audio_devices_stale",
+                  "_last_stop_report", "is_capturing")
+
+
+# ===========================================================================
+# Screen source
+# ===========================================================================
+class SyntheticScreen:
+    """
+    mss stand-in producing a desktop-like BGRA frame: a static gradient with
+    a box sweeping across it and a small noise patch that changes every
+    frame, so the encoder always has some motion and detail to code.  One
+    frame buffer is reused (as mss does) and only the changed areas are
+    redrawn, so grab() costs far less than a real screen grab.
+
+    With real_grab=True every grab() is a real mss grab of the primary
+    monitor at its native size (so the capture loop also pays the resize to
+    the configured resolution), with the box and noise patch drawn over the
+    actual desktop: the cost and content calibration should be measured on.
+    """
+
+    def __init__(self, width: int, height: int, real_grab: bool = False):
+        self._sct = mss.mss() if real_grab else None
+        if self._sct is not None:
+            mon           = self._sct.monitors[1]
+            width, height = mon["width"], mon["height"]
+            self.monitors = self._sct.monitors
+        else:
+            self.monitors = [{"left": 0, "top": 0, "width": width, "height": height}] * 2
+        self.width    = width
+        self.height   = height
+        self.frames   = 0
+        self.started  = threading.Event()    # set at the first grab()
+
+        x = np.linspace(0, 255, width,  dtype=np.float32)[None, :]
+        y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+        base = np.empty((height, width, 4), dtype=np.uint8)
+        base[..., 0] = x
+        base[..., 1] = y
+        base[..., 2] = (x + y) / 2
+        base[..., 3] = 255
+        self._base   = base
+        self._frame  = base.copy()
+        self._box    = (max(16, height // 8), max(16, width // 8))
+        self._patch  = (min(height, 128), min(width, 256))
+        self._rng    = np.random.default_rng(264)
+        self._prev   = None
+
+    def grab(self, monitor) -> np.ndarray:
+        bh, bw = self._box
+        if self._sct is not None:
+            f = np.asarray(self._sct.grab(monitor), dtype=np.uint8)   # fresh frame
+        else:
+            f = self._frame
+            if self._prev is not None:
+                py, px = self._prev
+                f[py:py + bh, px:px + bw] = self._base[py:py + bh, px:px + bw]
+        n  = self.frames
+        px = (n * 8) % (self.width - bw)
+        py = int((self.height - bh) * (0.5 + 0.4 * math.sin(n / 20.0)))
+        f[py:py + bh, px:px + bw] = (40, 160, 240, 255)
+        self._prev = (py, px)
+
+        ph, pw = self._patch
+        f[:ph, -pw:, :3] = self._rng.integers(0, 256, (ph, pw, 3), dtype=np.uint8)
+
+        self.frames += 1
+        if n == 0:
+            self.started.set()
+        return f
+
+    def close(self) -> None:
+        if self._sct is not None:
+            self._sct.close()
+
+
+# ===========================================================================
+# Audio source
+# ===========================================================================
+class _SyntheticStream:
+    """PyAudio input stream stand-in: a tone, paced to the sample clock."""
+
+    def __init__(self, channels: int, rate: int, hz: float, dbfs: float):
+        self.channels = channels
+        self.rate     = rate
+        amp   = 32767 * 10 ** (dbfs / 20)
+        t     = np.arange(rate, dtype=np.float64) / rate      # one second, loops
+        tone  = (amp * np.sin(2 * math.pi * hz * t)).astype("<i2")
+        self._pcm    = np.repeat(tone[:, None], channels, axis=1).tobytes()
+        self._fb     = channels * 2
+        self._pos    = 0
+        self._t0     = None
+        self._closed = False
+
+    def read(self, n: int, exception_on_overflow: bool = True) -> bytes:
+        if self._closed:
+            raise OSError("stream closed")
+        if self._t0 is None:
+            self._t0 = time.perf_counter()
+        delay = self._t0 + (self._pos + n) / self.rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        start     = (self._pos % self.rate) * self._fb
+        need      = n * self._fb
+        buf       = self._pcm[start:start + need]
+        while len(buf) < need:
+            buf += self._pcm[:need - len(buf)]
+        self._pos += n
+        return buf
+
+    def stop_stream(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._closed = True
+
+
+class SyntheticAudioHost:
+    """
+    PyAudio stand-in with one loopback and one microphone device; devices()
+    gives the {"lb", "mic"} map recorder._get_audio_devices() would return.
+    """
+
+    def __init__(self, rate: int = _SAMPLE_RATE):
+        self.rate = rate
+
+    def devices(self) -> dict:
+        return {
+            "lb":  {"index": 0, "name": "Synthetic loopback", "isLoopbackDevice": True,
+                    "maxInputChannels": 2, "maxOutputChannels": 2,
+                    "defaultSampleRate": float(self.rate)},
+            "mic": {"index": 1, "name": "Synthetic microphone",
+                    "maxInputChannels": 1, "maxOutputChannels": 0,
+                    "defaultSampleRate": float(self.rate)},
+        }
+
+    def get_sample_size(self, fmt) -> int:
+        return 2
+
+    def open(self, channels: int, rate: int, input_device_index: int = 0, **_kw):
+        return _SyntheticStream(channels, rate, _TONE_HZ[input_device_index],
+                                _TONE_DBFS[input_device_index])
+
+    def terminate(self) -> None:
+        pass
+
+
+# ===========================================================================
+# One measured run
+# ===========================================================================
+class _Sampler:
+    """Polls the live video buffer size and the capture encoder's CPU time."""
+
+    def __init__(self):
+        self.peak_buffer_mb = 0.0
+        self.encoder_cpu_s  = 0.0
+        self._stop          = threading.Event()
+        self._thread        = threading.Thread(target=self._run, daemon=True,
+                                               name="bench-sampler")
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            import psutil
+            me = psutil.Process()
+        except ImportError:
+            me = None
+        encoder = None
+        while not self._stop.wait(_SAMPLE_INTERVAL):
+            buf = recorder._current_video_buf
+            if buf is not None:
+                self.peak_buffer_mb = max(self.peak_buffer_mb, buf.ram_size_mb)
+            if me is None:
+                continue
+            try:
+                if encoder is None:
+                    for child in me.children():
+                        if "libx264" in child.cmdline():
+                            encoder = child
+                            break
+                if encoder is not None:
+                    ct = encoder.cpu_times()
+                    self.encoder_cpu_s = ct.user + ct.system
+            except Exception:
+                pass      # encoder exited between polls: keep the last reading
+
+
+def run_pipeline(config: dict, seconds: float, mux: bool = True,
+                 real_grab: bool = False) -> dict | None:
+    """
+    Record `seconds` of synthetic screen + audio through the real capture
+    pipeline with `config` (merged over DEFAULT_CONFIG), then mux it.
+    real_grab: see SyntheticScreen.
+
+    Returns {"target_fps", "achieved_fps", "frames", "dropped", "drop_rate",
+    "encoder_cpu_pct" (% of one core, -1 without psutil), "peak_buffer_mb",
+    "spilled", "mux_s", "mux_ok", "output_mb", "stop_s", "telemetry"},
+    or None when the encoder could not be started.  Refuses to run during a
+    real capture session; the recorder state it replaces is restored on
+    return.
+    """
+    if recorder.is_capturing:
+        raise RuntimeError("run_pipeline: a capture session is running")
+    saved = {name: getattr(recorder, name) for name in _SESSION_STATE}
+    saved["_audio_devices_stale"] = set(saved["_audio_devices_stale"])
+    cv2_threads = recorder.cv2.getNumThreads()
+    try:
+        return _run_pipeline(config, seconds, mux, real_grab)
+    finally:
+        for name, value in saved.items():
+            setattr(recorder, name, value)
+        recorder.cv2.setNumThreads(cv2_threads)
+
+
+def _run_pipeline(config: dict, seconds: float, mux: bool, real_grab: bool) -> dict | None:
+    """run_pipeline() body; the caller restores the recorder state."""
+    cfg = dict(configure.DEFAULT_CONFIG)
+    cfg.update(config)
+    cfg.update({"video_splits": False, "replay_mode": False, "fast_capture": False})
+    out_dir = tempfile.mkdtemp(prefix=".d264_bench_")
+    cfg["output_path"] = out_dir
+    w, h, fps = cfg["resolution"]["width"], cfg["resolution"]["height"], cfg["fps"]
+
+    # Session state normally set up by init_capture_system / start_capture.
+    logical = os.cpu_count() or 2
+    recorder._thread_cap  = max(1, int(logical * cfg["thread_budget"] / 100))
+    recorder._core_layout = recorder._compute_core_layout(
+        recorder._thread_cap, cfg.get("cpu_affinity", True))
+    recorder.cv2.setNumThreads(recorder._thread_cap)
+    recorder.AUDIO_CHUNK  = recorder._detect_audio_chunk()
+    recorder._pause_clock = recorder._PauseClock()
+    recorder._telemetry   = recorder.telemetry.Telemetry()
+    recorder._telemetry.reset(recorder._TELEMETRY_STAGES)
+
+    host   = SyntheticAudioHost()
+    recorder._audio_devices       = host.devices()
+    recorder._audio_devices_stale = set()
+    audio  = recorder._AudioSession(host, cfg)
+    screen = SyntheticScreen(w, h, real_grab)
+
+    def _stop_after():
+        # Time the window from the first grab, not from encoder start-up.
+        while not screen.started.wait(0.1):
+            if not recorder.is_capturing:
+                return
+        time.sleep(seconds)
+        recorder.is_capturing = False
+
+    sampler = _Sampler()
+    sampler.start()
+    recorder.is_capturing = True
+    stopper = threading.Thread(target=_stop_after, daemon=True, name="bench-stop")
+    stopper.start()
+    try:
+        res = recorder._capture_segment(cfg, 1, None, screen, audio)
+    finally:
+        recorder.is_capturing = False
+        stopper.join()
+        sampler.stop()
+        screen.close()
+
+    if res is None:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        return None
+    _outcome, video_buf, lb_wav, mic_wav, final, audio_sync, proxy_out = res
+    if proxy_out is not None:
+        proxy_out[0].discard()
+
+    expected = max(1, int(round(seconds * fps)))
+    frames   = video_buf.index.frame_count
+    dropped  = max(0, expected - frames)
+    peak_mb  = max(sampler.peak_buffer_mb, video_buf.ram_size_mb)
+    spilled  = video_buf.spilled
+    stop     = recorder.get_last_stop_report() or {}
+
+    mux_s, mux_ok, out_mb = 0.0, False, 0.0
+    if mux:
+        t0 = time.perf_counter()
+        recorder._mux(video_buf, lb_wav, mic_wav, final, cfg, audio_sync)
+        mux_s  = time.perf_counter() - t0
+        mux_ok = os.path.exists(final) and os.path.getsize(final) > 0
+        out_mb = os.path.getsize(final) / (1024 * 1024) if mux_ok else 0.0
+    else:
+        video_buf.discard()
+    for wav in (lb_wav, mic_wav):
+        if wav:
+            recorder._remove_audio_files(wav)
+    shutil.rmtree(out_dir, ignore_errors=True)
+
+    have_cpu = sampler.encoder_cpu_s > 0
+    return {
+        "target_fps":      fps,
+        "achieved_fps":    round(frames / seconds, 2),
+        "frames":          frames,
+        "dropped":         dropped,
+        "drop_rate":       round(dropped / expected, 4),
+        "encoder_cpu_pct": round(sampler.encoder_cpu_s / seconds * 100, 1) if have_cpu else -1,
+        "peak_buffer_mb":  round(peak_mb, 2),
+        "spilled":         spilled,
+        "mux_s":           round(mux_s, 3),
+        "mux_ok":          mux_ok,
+        "output_mb":       round(out_mb, 2),
+        "stop_s":          round(stop.get("total_s", 0.0), 3),
+        "telemetry":       recorder.get_pipeline_telemetry(),
+    }
@@ -0,0 +1,119 @@
+# scripts/telemetry.py
+# Low-overhead per-stage latency histograms for the capture pipeline.
+#
+# Each stage owns a fixed-bucket histogram held in one preallocated
+# array.array; recording a sample is a frexp() and an array increment, with
+# no allocation, so it is cheap enough for every frame / chunk / read.
+# Under --profile each stage also feeds a profiling.TraceLog channel, so
+# span() samples land on the Chrome trace timeline as well.
+# Stdlib only.
+
+import math
+import threading
+from array import array
+
+# Buckets are in microseconds: each power of two is split into _SUB linear
+# sub-buckets (the frexp() mantissa), covering 1 us .. 2**_OCTAVES us
+# (~67 s).  A bucket is 1/_SUB of its octave's start wide, i.e. 14-25 % of
+# its own lower edge, which is plenty to tell a 2 ms stage from a 20 ms one.
+_SUB      = 4
+_OCTAVES  = 26
+_BUCKETS  = _OCTAVES * _SUB + 1        # + overflow bucket
+
+
+def _bucket_upper_us(i: int) -> float:
+    """Upper edge (us) of bucket i."""
+    octave, sub = divmod(i, _SUB)
+    return 2.0 ** octave * (1.0 + (sub + 1) / _SUB)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (seconds in, milliseconds out)."""
+
+    __slots__ = ("counts", "n", "total", "max", "trace")
+
+    def __init__(self, trace=None):
+        self.counts = array("Q", bytes(8 * _BUCKETS))
+        self.n      = 0
+        self.total  = 0.0
+        self.max    = 0.0
+        self.trace  = trace                # timeline channel (add(t0, t1)) or None
+
+    def record(self, seconds: float) -> None:
+        us = seconds * 1e6
+        if us < 1.0:
+            i = 0
+        else:
+            m, e = math.frexp(us)              # us = m * 2**e, 0.5 <= m < 1
+            i = (e - 1) * _SUB + int((m - 0.5) * 2 * _SUB)
+            if i >= _BUCKETS:
+                i = _BUCKETS - 1
+        self.counts[i] += 1
+        self.n         += 1
+        self.total     += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def span(self, t0: float, t1: float) -> None:
+        """Record the interval t0 .. t1 (perf_counter seconds)."""
+        self.record(t1 - t0)
+        if self.trace is not None:
+            self.trace.add(t0, t1)
+
+    def percentile(self, p: float) -> float:
+        """Upper bucket edge (ms) under which p % of the samples fall."""
+        if not self.n:
+            return 0.0
+        rank = max(1, math.ceil(self.n * p / 100.0))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(_bucket_upper_us(i) / 1000.0, self.max * 1000.0)
+        return self.max * 1000.0
+
+    def summary(self) -> dict:
+        return {
+            "count":   self.n,
+            "mean_ms": self.total / self.n * 1000.0 if self.n else 0.0,
+            "p50_ms":  self.percentile(50),
+            "p95_ms":  self.percentile(95),
+            "p99_ms":  self.percentile(99),
+            "max_ms":  self.max * 1000.0,
+        }
+
+
+class Telemetry:
+    """
+    Named stage histograms.  stage(name) returns the stage's Histogram
+    (created on first use; hold on to it in hot loops); snapshot() gives
+    {stage: Histogram.summary()} in registration order.  Each stage should
+    be recorded from one thread; snapshots may be taken from any.
+    With a `trace` (profiling.TraceLog), each stage's span() samples also
+    go to the trace channel of the same name.
+    """
+
+    def __init__(self, trace=None):
+        self._lock   = threading.Lock()
+        self._stages = {}
+        self.trace   = trace
+
+    def stage(self, name: str) -> Histogram:
+        h = self._stages.get(name)
+        if h is None:
+            with self._lock:
+                h = self._stages.setdefault(name, self._new(name))
+        return h
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = list(self._stages.items())
+        return {name: h.summary() for name, h in stages}
+
+    def reset(self, stages=()) -> None:
+        """Drop every histogram; pre-register `stages` to fix display order."""
+        with self._lock:
+            self._stages = {name: self._new(name) for name in stages}
+
+    def _new(self, name: str) -> Histogram:
+        return Histogram(self.trace.channel(name) if self.trace is not None else None)
@@ -3,6 +3,7 @@
 # purge operations, and system info gathering.
 
 import glob
+import json
 import os
 import sys
 import time
@@ -77,19 +78,21 @@ def display_path(out_path: str) -> str:
 def list_videos(output_path: str) -> list:
     """
     Return a list of dicts for Desktop_Video_* files in output_path,
-    sorted newest-first by modification time.
+    sorted newest-first by modification time.  Performance sidecars are
+    not listed; a video's sidecar path (or None) is in its "perf" key.
     Each dict: {"name": str, "size": int, "size_str": str, "mtime": float,
-                "path": str, "date": str}
+                "path": str, "date": str, "perf": str | None}
     """
     if not os.path.isdir(output_path):
         return []
 
     pattern = os.path.join(output_path, f"{VIDEO_PREFIX}*")
     files   = glob.glob(pattern)
+    suffix  = configure.PERF_SIDECAR_SUFFIX
 
     entries = []
     for fp in files:
-        if os.path.isfile(fp):
+        if os.path.isfile(fp) and not fp.endswith(suffix):
             stat = os.stat(fp)
             entries.append({
                 "name":     os.path.basename(fp),
@@ -100,6 +103,7 @@ def list_videos(output_path: str) -> list:
                 "date":     time.strftime(
                     "%Y-%m-%d  %H:%M", time.localtime(stat.st_mtime)
                 ),
+                "perf":     fp + suffix if os.path.isfile(fp + suffix) else None,
             })
 
     entries.sort(key=lambda e: e["mtime"], reverse=True)
@@ -111,11 +115,13 @@ def list_videos(output_path: str) -> list:
 # ---------------------------------------------------------------------------
 def purge_recordings(output_path: str) -> tuple:
     """
-    Delete all Desktop_Video_* files in output_path.
-    Returns (deleted_count, total_count, error_messages).
+    Delete all Desktop_Video_* files in output_path, with their
+    performance sidecars (including any whose video was never written).
+    Returns (deleted_count, total_count, error_messages); counts are videos.
     """
     videos = list_videos(output_path)
-    if not videos:
+    perfs  = list_perf_sidecars(output_path)
+    if not videos and not perfs:
         return 0, 0, []
 
     deleted = 0
@@ -126,10 +132,43 @@ def purge_recordings(output_path: str) -> tuple:
             deleted += 1
         except OSError as e:
             errors.append(f"Could not delete {v['name']}: {e}")
+    for p in perfs:
+        try:
+            os.remove(p["path"])
+        except OSError as e:
+            errors.append(f"Could not delete {p['name']}: {e}")
 
     return deleted, len(videos), errors
 
 
+# ---------------------------------------------------------------------------
+# Performance sidecars  (<video>.perf.json, written per segment)
+# ---------------------------------------------------------------------------
+def list_perf_sidecars(output_path: str) -> list:
+    """
+    Return [{"name": video file name, "path": sidecar path, "mtime": float}]
+    for the performance sidecars in output_path, newest first.
+    """
+    if not os.path.isdir(output_path):
+        return []
+    suffix  = configure.PERF_SIDECAR_SUFFIX
+    pattern = os.path.join(output_path, f"{VIDEO_PREFIX}*{suffix}")
+    entries = [{"name": os.path.basename(fp)[:-len(suffix)], "path": fp,
+                "mtime": os.path.getmtime(fp)}
+               for fp in glob.glob(pattern) if os.path.isfile(fp)]
+    entries.sort(key=lambda e: e["mtime"], reverse=True)
+    return entries
+
+
+def load_perf_sidecar(path: str) -> dict | None:
+    """Parsed sidecar, or None if it is missing or unreadable."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
 # ---------------------------------------------------------------------------
 # System information
 # ---------------------------------------------------------------------------
@@ -142,6 +181,7 @@ def get_system_info() -> dict:
         "simd_flags":     "none detected",
         "thread_cap":     0,
         "reserved":       0,
+        "core_layout":    "unknown",
         "opencv":         "not installed",
         "mss":            "not installed",
     }
@@ -151,8 +191,9 @@ def get_system_info() -> dict:
         ci = recorder.get_cpu_info()
         info["cpu_name"]     = ci.get("name", "Unknown")
         info["logical_cores"] = ci.get("logical_cores", os.cpu_count() or 1)
-        info["thread_cap"]    = ci.get("thread_cap", recorder._thread_cap)
+        info["thread_cap"]    = recorder._thread_cap     # current, not the cached launch value
         info["reserved"]      = info["logical_cores"] - info["thread_cap"]
+        info["core_layout"]   = recorder.get_core_layout()["text"]
 
         simd_parts = []
         if ci.get("sse2"):    simd_parts.append("SSE2")
@@ -202,39 +243,40 @@ def get_cpu_usage_percent() -> float:
 
 def get_ram_assignment_info(config: dict) -> tuple:
     """
-    Return (assigned_mb, used_mb, free_assigned_mb, percent_used).
-    assigned_mb = Free RAM * (max_ram_usage% / 100)
-    used_mb = Current segment buffer size (from recorder)
+    Return (assigned_mb, used_mb, free_assigned_mb, percent_used, rss_peak_mb).
+    assigned_mb = RAM budget of the current segment while recording
+                  (Free RAM * max_ram_usage% at segment start), otherwise
+                  Free RAM * (max_ram_usage% / 100)
+    used_mb = every large recorder buffer (recorder.get_memory_accounting):
+              queued raw frames, live + pending-mux video buffers, audio
     free_assigned_mb = assigned_mb - used_mb
     percent_used = (used_mb / assigned_mb) * 100
+    rss_peak_mb = process RSS high-water mark of the current segment
     """
     try:
         import psutil
         from scripts import recorder
-        
-        # Get free RAM in MB
-        mem = psutil.virtual_memory()
-        free_ram_mb = mem.available / (1024 * 1024)
-        
-        # Get max RAM usage percentage from config
-        max_ram_pct = config.get("max_ram_usage", 50)
-        
-        # Calculate assigned RAM buffer
-        assigned_mb = (free_ram_mb * max_ram_pct) / 100
-        
-        # Get current segment buffer usage from recorder
-        used_mb = 0.0
-        if hasattr(recorder, '_current_video_buf') and recorder._current_video_buf:
-            used_mb = recorder._current_video_buf.ram_size_mb
-        
+
+        mb  = 1024 * 1024
+        acc = recorder.get_memory_accounting()
+
+        # Budget: the live segment's, else what the next segment would get.
+        if acc["budget"] > 0:
+            assigned_mb = acc["budget"] / mb
+        else:
+            free_ram_mb = psutil.virtual_memory().available / mb
+            assigned_mb = free_ram_mb * config.get("max_ram_usage", 50) / 100
+
+        used_mb = acc["total"] / mb
+
         # Calculate free portion of assigned RAM
         free_assigned_mb = max(0, assigned_mb - used_mb)
-        
+
         # Calculate percentage used
         percent_used = (used_mb / assigned_mb * 100) if assigned_mb > 0 else 0
-        
-        return (assigned_mb, used_mb, free_assigned_mb, percent_used)
+
+        return (assigned_mb, used_mb, free_assigned_mb, percent_used, acc["rss_peak"] / mb)
     except ImportError:
-        return (-1.0, -1.0, -1.0, -1.0)
+        return (-1.0, -1.0, -1.0, -1.0, -1.0)
     except Exception:
-        return (-1.0, -1.0, -1.0, -1.0)
\ No newline at end of file
+        return (-1.0, -1.0, -1.0, -1.0, -1.0)
\ No newline at end of file